@@ -37,6 +37,20 @@ app.conf.beat_schedule = {
             'expires': 60 * 60 * 24,
         },
     },
+    'urlshortener-flush-access-counts': {
+        'task': 'urlshortener.tasks.flush_access_counts',
+        'schedule': 60.0,
+        'options': {
+            'expires': 60,
+        },
+    },
+    'contest-prune-changes': {
+        'task': 'judge.tasks.contest.prune_contest_changes',
+        'schedule': crontab(minute=30, hour=0),
+        'options': {
+            'expires': 60 * 60 * 24,
+        },
+    },
     'organization-monthly-reset': {
         'task': 'judge.tasks.organization.organization_monthly_reset',
         'schedule': crontab(minute=0, hour=0, day_of_month=1),
@@ -57,6 +57,10 @@ VNOJ_ORG_PP_SCALE = 1
 VNOJ_ENABLE_API = False
 VNOJ_ENABLE_SYNC_API = True  # need to make this true for testing :sad:
 GLOBAL_API_KEY = 'test-api-key-123'
+# Changes younger than this are held back from the feed until concurrent inserts have surely committed
+VNOJ_CONTEST_SYNC_SETTLE_TIME = 1
+# How long entries of the contest sync change feed are kept before being pruned
+VNOJ_CONTEST_SYNC_CHANGE_RETENTION = datetime.timedelta(days=7)
 
 VNOJ_OFFICIAL_CONTEST_MODE = False
 
@@ -94,6 +98,16 @@ TICKET_AUTOFILL_REPLIES = [
 ]
 
 VNOJ_HOMEPAGE_TOP_USERS_COUNT = 5
+# Widgets shown to every visitor of the home page are cached for this many seconds,
+# unless something they show changes first.
+VNOJ_HOMEPAGE_CACHE_TIMEOUT = 300
+
+# Display rank and rating of users referenced in user-written text ([user:...] and [ruser:...])
+# are cached for this many seconds, unless they change first.
+VNOJ_USER_REFERENCE_CACHE_TIMEOUT = 300
+
+# Maximum number of rendered user links kept in each process for listings such as rankings.
+VNOJ_USER_LINK_STORE_SIZE = 100000
 
 VNOJ_DISPLAY_RANKS = (
     ('user', _('Normal User')),
@@ -264,6 +278,8 @@ VNOJ_PROBLEM_DELETION_GRACE_PERIOD = datetime.timedelta(days=7)
 # Maximum time the garbage collection task is allowed to run per invocation
 VNOJ_PROBLEM_GARBAGE_COLLECTOR_TIME_LIMIT = datetime.timedelta(hours=1)
 VNOJ_PROBLEM_GARBAGE_COLLECTOR_CRONTAB_KWARGS = {'minute': 0, 'hour': 0}
+# Number of submissions the garbage collector deletes per transaction
+VNOJ_PROBLEM_GARBAGE_COLLECTOR_CHUNK_SIZE = 500
 
 DMOJ_PROBLEM_STATEMENT_DISALLOWED_CHARACTERS = {'“', '”', '‘', '’', '−', 'ﬀ', 'ﬁ', 'ﬂ', 'ﬃ', 'ﬄ'}
 DMOJ_RATING_COLORS = True
@@ -312,6 +328,15 @@ DMOJ_STATS_SUBMISSION_RESULT_COLORS = {
 }
 DMOJ_API_PAGE_SIZE = 1000
 
+# Celery task progress is written to the result backend at most this often, in seconds, unless it has moved by at
+# least VNOJ_TASK_PROGRESS_STEP percent
+VNOJ_TASK_PROGRESS_INTERVAL = 1
+VNOJ_TASK_PROGRESS_STEP = 5
+
+# Streaming API exports (?export=ndjson or ?export=csv) allowed per user within the window, in seconds
+VNOJ_API_EXPORT_LIMIT_WINDOW = 3600
+VNOJ_API_EXPORT_LIMIT_COUNT = 10
+
 DMOJ_PASSWORD_RESET_LIMIT_WINDOW = 3600
 DMOJ_PASSWORD_RESET_LIMIT_COUNT = 10
 
@@ -499,6 +524,7 @@ MIDDLEWARE = (
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'judge.middleware.MiscConfigMiddleware',
+    'judge.middleware.UserReferenceMiddleware',
     'judge.middleware.DMOJLoginMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
@@ -742,12 +768,29 @@ ENABLE_FTS = False
 
 # Balancer configuration
 BALANCER_JUDGE_ADDRESS = [('localhost', 8888)]
+# Address to serve judge load estimates and queue statistics as JSON on, e.g. ('localhost', 8889).
+BALANCER_STATUS_ADDRESS = None
 
 # Bridged configuration
 BRIDGED_JUDGE_ADDRESS = [('localhost', 9999)]
 BRIDGED_JUDGE_PROXIES = None
 BRIDGED_DJANGO_ADDRESS = [('localhost', 9998)]
 BRIDGED_DJANGO_CONNECT = None
+# Judges report their ping and load every 10 seconds. The bridge publishes the latest values to the cache, where they
+# expire after BRIDGED_JUDGE_STATUS_TIMEOUT seconds, and saves them to the database at most once per
+# BRIDGED_JUDGE_PING_SAVE_INTERVAL seconds.
+BRIDGED_JUDGE_STATUS_TIMEOUT = 60
+BRIDGED_JUDGE_PING_SAVE_INTERVAL = 300
+# The bridge invalidates the cached judge runtimes whenever they change, but that only reaches other processes
+# through a shared cache. With a per-process cache such as locmem, this bounds how stale they can be, in seconds.
+VNOJ_JUDGE_RUNTIME_CACHE_TIMEOUT = 30
+# The problem monitor only rechecks the directories that filesystem events point to, and rescans all problem
+# globs this often to catch anything the events missed.
+BRIDGED_MONITOR_FULL_SCAN_INTERVAL = 3600
+
+# JSON codec for bridge, balancer and event server traffic: 'orjson', 'ujson' or 'json'.
+# None picks the fastest one installed.
+JSON_CODEC = None
 
 # Event Server configuration
 EVENT_DAEMON_USE = False
@@ -493,6 +493,11 @@ if settings.VNOJ_ENABLE_SYNC_API:
                 api.api_v2.APIContestSyncSubmissions.as_view(),
                 name='api_contest_sync_submissions',
             ),
+            path(
+                'contest/<str:contest_code>/changes',
+                api.api_v2.APIContestSyncChanges.as_view(),
+                name='api_contest_sync_changes',
+            ),
         ])),
     )
 
@@ -6,7 +6,8 @@ from django.utils.html import format_html
 from django.utils.translation import gettext_lazy as _, ngettext
 from reversion.admin import VersionAdmin
 
-from judge.models import Comment
+from judge.models import BlogPost, Comment
+from judge.utils.home import invalidate_home
 from judge.widgets import AdminHeavySelect2Widget, AdminMartorWidget
 
 
@@ -39,7 +40,10 @@ class CommentAdmin(VersionAdmin):
 
     @admin.display(description=_('Hide comments'))
     def hide_comment(self, request, queryset):
+        pages = set(queryset.values_list('page', flat=True))
         count = queryset.update(hidden=True)
+        BlogPost.update_comment_counts(pages)
+        invalidate_home('comments')
         queryset.author.calculate_contribution_points()
         self.message_user(request, ngettext('%d comment successfully hidden.',
                                             '%d comments successfully hidden.',
@@ -47,7 +51,10 @@ class CommentAdmin(VersionAdmin):
 
     @admin.display(description=_('Unhide comments'))
     def unhide_comment(self, request, queryset):
+        pages = set(queryset.values_list('page', flat=True))
         count = queryset.update(hidden=False)
+        BlogPost.update_comment_counts(pages)
+        invalidate_home('comments')
         queryset.author.calculate_contribution_points()
         self.message_user(request, ngettext('%d comment successfully unhidden.',
                                             '%d comments successfully unhidden.',
@@ -66,3 +73,6 @@ class CommentAdmin(VersionAdmin):
         super().save_model(request, obj, form, change)
         if obj.hidden:
             obj.get_descendants().update(hidden=obj.hidden)
+            # The post_save recount ran before the replies were hidden.
+            BlogPost.update_comment_counts([obj.page])
+            invalidate_home('comments')
@@ -11,6 +11,7 @@ from django.utils.translation import gettext, gettext_lazy as _, ngettext
 from reversion.admin import VersionAdmin
 
 from judge.models import LanguageLimit, Problem, ProblemClarification, ProblemTranslation, Profile, Solution
+from judge.utils.problems import invalidate_visible_problems
 from judge.utils.views import NoBatchDeleteMixin
 from judge.widgets import AdminHeavySelect2MultipleWidget, AdminHeavySelect2Widget, AdminMartorWidget, \
     AdminSelect2MultipleWidget, AdminSelect2Widget, CheckboxSelectMultipleWithSelectAll
@@ -186,6 +187,7 @@ class ProblemAdmin(NoBatchDeleteMixin, VersionAdmin):
     @admin.display(description=_('Mark problems as public and set publish date to now'))
     def make_public_and_update_publish_date(self, request, queryset):
         count = queryset.update(is_public=True, date=timezone.now())
+        invalidate_visible_problems()
         for problem_id in queryset.values_list('id', flat=True):
             self._rescore(request, problem_id, True)
 
@@ -196,6 +198,7 @@ class ProblemAdmin(NoBatchDeleteMixin, VersionAdmin):
     @admin.display(description=_('Mark problems as private'))
     def make_private(self, request, queryset):
         count = queryset.update(is_public=False)
+        invalidate_visible_problems()
         for problem_id in queryset.values_list('id', flat=True):
             self._rescore(request, problem_id, True)
         self.message_user(request, ngettext('%d problem successfully marked as private.',
@@ -7,7 +7,7 @@ from django.utils.translation import gettext, gettext_lazy as _, ngettext
 from reversion.admin import VersionAdmin
 
 from judge.models import Profile, WebAuthnCredential
-from judge.utils.views import NoBatchDeleteMixin
+from judge.utils.views import BulkDeletionMixin, NoBatchDeleteMixin
 from judge.widgets import AdminAceWidget, AdminMartorWidget, AdminSelect2MultipleWidget, AdminSelect2Widget
 
 
@@ -57,7 +57,7 @@ class WebAuthnInline(admin.TabularInline):
         return False
 
 
-class ProfileAdmin(NoBatchDeleteMixin, VersionAdmin):
+class ProfileAdmin(BulkDeletionMixin, NoBatchDeleteMixin, VersionAdmin):
     fields = ('user', 'display_rank', 'badges', 'display_badge', 'about', 'organizations', 'vnoj_points', 'timezone',
               'language', 'ace_theme', 'math_engine', 'last_access', 'ip', 'mute', 'is_unlisted', 'allow_tagging',
               'notes', 'username_display_override', 'ban_reason', 'is_totp_enabled', 'ip_auth', 'user_script',
@@ -160,7 +160,7 @@ class ProfileAdmin(NoBatchDeleteMixin, VersionAdmin):
             obj.save()
 
 
-class UserAdmin(OldUserAdmin):
+class UserAdmin(BulkDeletionMixin, OldUserAdmin):
     def save_model(self, request, obj, form, change):
         super().save_model(request, obj, form, change)
         if not change:
@@ -1,14 +1,16 @@
 import hmac
 import logging
 import threading
-from collections import deque
 from functools import partial
+from random import random
 from threading import RLock
 
 from django.conf import settings
 
 from judge.balancer.bridge_handler import BridgeHandler
+from judge.balancer.fair_queue import FairQueue
 from judge.balancer.judge_handler import JudgeHandler
+from judge.balancer.status import StatusServer
 from judge.bridge.server import Server
 
 
@@ -20,7 +22,6 @@ class JudgeBalancer:
         self.executors = {}
         self.config = config
         self.judges = set()
-        self.queue = deque()
         self.lock = RLock()
         self.judge_to_bridge = {}
         self.bridge_to_judge = {}
@@ -29,6 +30,18 @@ class JudgeBalancer:
             settings.BALANCER_JUDGE_ADDRESS,
             partial(JudgeHandler, balancer=self),
         )
+        self.status_server = None
+        if settings.BALANCER_STATUS_ADDRESS:
+            self.status_server = StatusServer(settings.BALANCER_STATUS_ADDRESS, self)
+
+        # Bridges to the same site share a fair-share queue unless configured otherwise.
+        self.bridge_shares = []
+        weights = {}
+        for bridge in config['bridges']:
+            share = bridge.get('share') or '%s:%s' % (bridge['host'], bridge['port'])
+            self.bridge_shares.append(share)
+            weights[share] = max(weights.get(share, 0), bridge.get('weight', 1))
+        self.queue = FairQueue(weights)
 
         self.bridges = []
         for bridge in config['bridges']:
@@ -37,11 +50,15 @@ class JudgeBalancer:
 
     def run(self):
         threading.Thread(target=self.judge_server.serve_forever).start()
+        if self.status_server is not None:
+            threading.Thread(target=self.status_server.serve_forever).start()
         for bridge in self.bridges:
             bridge.listen()
 
     def shutdown(self):
         self.judge_server.shutdown()
+        if self.status_server is not None:
+            self.status_server.shutdown()
         for bridge in self.bridges:
             bridge.shutdown()
 
@@ -55,12 +72,19 @@ class JudgeBalancer:
                 del self.judge_to_bridge[judge.name]
                 del self.bridge_to_judge[bridge_id]
 
+    def _default_duration(self):
+        durations = [judge.mean_duration for judge in self.judges if judge.mean_duration is not None]
+        return sum(durations) / len(durations) if durations else 1.0
+
     def _try_judge(self):
         with self.lock:
             available = [judge for judge in self.judges if not judge.working]
+            default_duration = self._default_duration()
             while available and self.queue:
-                judge = available.pop()
-                bridge_id, packet = self.queue.popleft()
+                _, (bridge_id, packet) = self.queue.pop()
+                # Pick the judge expected to finish this submission first.
+                judge = min(available, key=lambda judge: (judge.expected_duration(default_duration), random()))
+                available.remove(judge)
                 self.judge_to_bridge[judge.name] = bridge_id
                 self.bridge_to_judge[bridge_id] = judge
 
@@ -117,9 +141,25 @@ class JudgeBalancer:
 
     def queue_submission(self, bridge_id: int, packet: dict):
         with self.lock:
-            self.queue.append((bridge_id, packet))
+            self.queue.push(self.bridge_shares[bridge_id], (bridge_id, packet), packet.get('priority'))
         self._try_judge()
 
+    def get_queue_stats(self):
+        with self.lock:
+            return self.queue.get_stats()
+
+    def get_status(self):
+        with self.lock:
+            default_duration = self._default_duration()
+            return {
+                'judges': [judge.get_status(default_duration) for judge in self.judges],
+                'bridges': [
+                    {'name': bridge.name, 'share': share, 'judge': getattr(self.bridge_to_judge.get(id), 'name', None)}
+                    for id, (bridge, share) in enumerate(zip(self.bridges, self.bridge_shares))
+                ],
+                'queue': self.queue.get_stats(),
+            }
+
     def abort_submission(self, bridge_id):
         try:
             judge = self.bridge_to_judge[bridge_id]
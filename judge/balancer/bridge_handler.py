@@ -1,5 +1,4 @@
 import errno
-import json
 import logging
 import socket
 import ssl
@@ -10,6 +9,7 @@ import zlib
 from typing import Optional
 
 from judge.balancer import sysinfo
+from judge.utils import json_codec
 
 
 log = logging.getLogger(__name__)
@@ -160,7 +160,7 @@ class BridgeHandler:
             self._reconnect()
             return self._read_single()
         else:
-            return json.loads(packet.decode('utf-8', 'strict'))
+            return json_codec.loads(packet)
 
     def listen(self):
         threading.Thread(target=self._read_forever).start()
@@ -190,7 +190,7 @@ class BridgeHandler:
                 # We cannot use utf8text because it may not be text.
                 packet[k] = v.decode('utf-8', 'replace')
 
-        raw = zlib.compress(json.dumps(packet).encode('utf-8'))
+        raw = zlib.compress(json_codec.dumpb(packet))
         with self._lock:
             try:
                 assert self.conn is not None
@@ -222,7 +222,7 @@ class BridgeHandler:
             data = self.input.read(BridgeHandler.SIZE_PACK.size)
             size = BridgeHandler.SIZE_PACK.unpack(data)[0]
             packet = zlib.decompress(self.input.read(size)).decode('utf-8', 'strict')
-            resp = json.loads(packet)
+            resp = json_codec.loads(packet)
         except Exception:
             log.exception('Cannot understand handshake response: [%s]:%s', self.host, self.port)
             raise JudgeAuthenticationFailed()
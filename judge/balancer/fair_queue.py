@@ -0,0 +1,97 @@
+import heapq
+import time
+from collections import deque
+from itertools import count
+
+from judge.judge_priority import DEFAULT_PRIORITY
+
+
+class ShareStats:
+    def __init__(self, share, weight):
+        self.share = share
+        self.weight = weight
+        self.depth = 0
+        self.dispatched = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.recent_waits = deque(maxlen=100)
+
+    def as_dict(self):
+        return {
+            'weight': self.weight,
+            'depth': self.depth,
+            'dispatched': self.dispatched,
+            'mean_wait': self.total_wait / self.dispatched if self.dispatched else 0.0,
+            'recent_mean_wait': sum(self.recent_waits) / len(self.recent_waits) if self.recent_waits else 0.0,
+            'max_wait': self.max_wait,
+        }
+
+
+class FairQueue:
+    """
+    Weighted fair queue of submission packets across bridges.
+
+    Packets are served strictly by priority first. Within a priority, each share (usually a site, which
+    may be connected through several bridge entries) is served in proportion to its weight using start-time
+    fair queueing, so one site running a mass rejudge cannot starve the others. Each priority keeps its own virtual
+    time, since tags from different priorities are not comparable.
+    """
+
+    def __init__(self, weights=None, default_weight=1):
+        self.weights = dict(weights or {})
+        self.default_weight = default_weight
+        self.queues = {}
+        self.finish_tags = {}
+        self.virtual_times = {}
+        self.stats = {}
+        self._sequence = count()
+
+    def _get_stats(self, share):
+        try:
+            return self.stats[share]
+        except KeyError:
+            stats = self.stats[share] = ShareStats(share, self.weights.get(share, self.default_weight))
+            return stats
+
+    def __len__(self):
+        return sum(len(queue) for queue in self.queues.values())
+
+    def __bool__(self):
+        return any(self.queues.values())
+
+    def push(self, share, item, priority=None):
+        if priority is None:
+            priority = DEFAULT_PRIORITY
+        stats = self._get_stats(share)
+        virtual_time = self.virtual_times.get(priority, 0.0)
+        tag = max(virtual_time, self.finish_tags.get((priority, share), 0.0)) + 1 / stats.weight
+        self.finish_tags[(priority, share)] = tag
+        heapq.heappush(self.queues.setdefault(priority, []), (tag, next(self._sequence), share, time.monotonic(), item))
+        stats.depth += 1
+
+    def pop(self):
+        priority = min(priority for priority, queue in self.queues.items() if queue)
+        tag, _, share, queued_at, item = heapq.heappop(self.queues[priority])
+        self.virtual_times[priority] = max(self.virtual_times.get(priority, 0.0), tag)
+
+        wait = time.monotonic() - queued_at
+        stats = self.stats[share]
+        stats.depth -= 1
+        stats.dispatched += 1
+        stats.total_wait += wait
+        stats.max_wait = max(stats.max_wait, wait)
+        stats.recent_waits.append(wait)
+        return share, item
+
+    def get_stats(self):
+        now = time.monotonic()
+        oldest = {}
+        for queue in self.queues.values():
+            for _, _, share, queued_at, _ in queue:
+                oldest[share] = max(oldest.get(share, 0.0), now - queued_at)
+
+        result = {}
+        for share, stats in self.stats.items():
+            result[share] = stats.as_dict()
+            result[share]['oldest_wait'] = oldest.get(share, 0.0)
+        return result
@@ -1,14 +1,18 @@
-import json
 import logging
 import threading
 import time
+from collections import deque
 
 from django.conf import settings
 
 from judge.bridge.base_handler import ZlibPacketHandler, proxy_list
+from judge.utils import json_codec
 
 logger = logging.getLogger('judge.balancer')
 
+# Window over which judge throughput is measured, in seconds.
+THROUGHPUT_WINDOW = 600
+
 
 class JudgeHandler(ZlibPacketHandler):
     proxies = proxy_list(settings.BRIDGED_JUDGE_PROXIES or [])
@@ -28,7 +32,7 @@ class JudgeHandler(ZlibPacketHandler):
             'internal-error': self.forward_packet_and_free_self,
             'submission-terminated': self.forward_packet_and_free_self,
             'submission-acknowledged': self.on_submission_acknowledged,
-            'ping-response': self.ignore_packet,
+            'ping-response': self.on_ping_response,
             'supported-problems': self.ignore_packet,
             'handshake': self.on_handshake,
         }
@@ -37,6 +41,17 @@ class JudgeHandler(ZlibPacketHandler):
         self.name = None
         self._stop_ping = threading.Event()
 
+        # Reported by the judge on every ping.
+        self.latency = None
+        self.load = None
+        self.cpu_count = None
+
+        # Measured by the balancer.
+        self.connected_at = time.monotonic()
+        self._grading_start = None
+        self._durations = deque(maxlen=20)
+        self._completions = deque()
+
     def on_connect(self):
         self.timeout = 15
         logger.info('Judge connected from: %s', self.client_address)
@@ -53,7 +68,7 @@ class JudgeHandler(ZlibPacketHandler):
         logger.info('Judge disconnected from: %s with name %s', self.client_address, self.name)
 
     def send(self, data):
-        super().send(json.dumps(data, separators=(',', ':')))
+        self.send_bytes(json_codec.dumpb(data))
 
     def on_handshake(self, packet):
         if 'id' not in packet or 'key' not in packet:
@@ -87,6 +102,7 @@ class JudgeHandler(ZlibPacketHandler):
 
     def submit(self, packet):
         self.current_submission_id = packet['submission-id']
+        self._grading_start = time.monotonic()
         self._no_response_job = threading.Timer(20, self._kill_if_no_response)
         self.send(packet)
 
@@ -118,7 +134,7 @@ class JudgeHandler(ZlibPacketHandler):
     def on_packet(self, data):
         try:
             try:
-                data = json.loads(data)
+                data = json_codec.loads(data)
                 if 'name' not in data:
                     raise ValueError
             except ValueError:
@@ -137,9 +153,57 @@ class JudgeHandler(ZlibPacketHandler):
 
     def forward_packet_and_free_self(self, packet):
         self.balancer.forward_packet_to_bridge(self.name, packet)
+        self._record_completion()
         self.current_submission_id = None
         self.balancer.free_judge(self)
 
+    def on_ping_response(self, packet):
+        self.latency = time.time() - packet['when']
+        self.load = packet.get('load')
+        self.cpu_count = packet.get('cpu-count')
+
+    def _record_completion(self):
+        now = time.monotonic()
+        if self._grading_start is not None:
+            self._durations.append(now - self._grading_start)
+            self._grading_start = None
+        self._completions.append(now)
+        while self._completions and self._completions[0] < now - THROUGHPUT_WINDOW:
+            self._completions.popleft()
+
+    @property
+    def mean_duration(self):
+        return sum(self._durations) / len(self._durations) if self._durations else None
+
+    @property
+    def throughput(self):
+        """Submissions completed per minute over the last THROUGHPUT_WINDOW seconds."""
+        now = time.monotonic()
+        while self._completions and self._completions[0] < now - THROUGHPUT_WINDOW:
+            self._completions.popleft()
+        window = min(THROUGHPUT_WINDOW, now - self.connected_at)
+        return len(self._completions) / window * 60 if window > 0 else 0.0
+
+    def expected_duration(self, default):
+        """Estimate how long this judge would take to grade a submission, given the mean over all judges."""
+        duration = self.mean_duration or default
+        if self.load is not None and self.load > 0:
+            duration *= 1 + self.load
+        return duration
+
+    def get_status(self, default_duration):
+        return {
+            'name': self.name,
+            'address': self.client_address[0],
+            'submission': self.current_submission_id,
+            'latency': self.latency,
+            'load': self.load,
+            'cpu-count': self.cpu_count,
+            'throughput': self.throughput,
+            'mean-duration': self.mean_duration,
+            'expected-duration': self.expected_duration(default_duration),
+        }
+
     def ignore_packet(self, packet):
         pass
 
@@ -0,0 +1,31 @@
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from judge.utils import json_codec
+
+logger = logging.getLogger('judge.balancer')
+
+
+class StatusRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0].rstrip('/') not in ('', '/status'):
+            self.send_error(404)
+            return
+
+        body = json_codec.dumpb(self.server.balancer.get_status())
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug('Status request from %s: %s', self.client_address[0], format % args)
+
+
+class StatusServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, balancer):
+        super().__init__(address, StatusRequestHandler)
+        self.balancer = balancer
@@ -194,7 +194,10 @@ class ZlibPacketHandler(metaclass=RequestHandlerMeta):
             self.on_cleanup()
 
     def send(self, data):
-        compressed = zlib.compress(data.encode('utf-8'))
+        self.send_bytes(data.encode('utf-8'))
+
+    def send_bytes(self, data):
+        compressed = zlib.compress(data)
         self.request.sendall(size_pack.pack(len(compressed)) + compressed)
 
     def close(self):
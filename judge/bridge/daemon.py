@@ -10,12 +10,14 @@ from judge.bridge.judge_handler import JudgeHandler
 from judge.bridge.judge_list import JudgeList
 from judge.bridge.server import Server
 from judge.models import Judge, Submission
+from judge.utils.judge_status import invalidate_runtimes
 
 logger = logging.getLogger('judge.bridge')
 
 
 def reset_judges():
     Judge.objects.update(online=False, ping=None, load=None)
+    invalidate_runtimes()
 
 
 def judge_daemon(run_monitor=False, problem_storage_globs=None):
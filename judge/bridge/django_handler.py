@@ -1,10 +1,10 @@
-import json
 import logging
 import struct
 
 from django import db
 
 from judge.bridge.base_handler import Disconnect, ZlibPacketHandler
+from judge.utils import json_codec
 
 logger = logging.getLogger('judge.bridge')
 size_pack = struct.Struct('!I')
@@ -23,10 +23,10 @@ class DjangoHandler(ZlibPacketHandler):
         self.judges = judges
 
     def send(self, data):
-        super().send(json.dumps(data, separators=(',', ':')))
+        self.send_bytes(json_codec.dumpb(data))
 
     def on_packet(self, packet):
-        packet = json.loads(packet)
+        packet = json_codec.loads(packet)
         try:
             result = self.handlers.get(packet.get('name', None), self.on_malformed)(packet)
         except Exception:
@@ -1,5 +1,4 @@
 import hmac
-import json
 import logging
 import threading
 import time
@@ -12,10 +11,14 @@ from django.utils import timezone
 
 from judge import event_poster as event
 from judge.bridge.base_handler import ZlibPacketHandler, proxy_list
+from judge.bridge.judge_list import JudgeAffinity
 from judge.caching import finished_submission
-from judge.models import Judge, Language, LanguageLimit, Problem, Profile, \
+from judge.models import ContestChange, ContestResultCount, Judge, Language, LanguageLimit, Problem, Profile, \
     RuntimeVersion, Submission, SubmissionTestCase
 from judge.models.problem import ProblemTestcaseResultAccess
+from judge.utils import json_codec
+from judge.utils.iterator import chunk
+from judge.utils.judge_status import clear_judge_status, invalidate_runtimes, publish_judge_status
 from judge.utils.url import get_absolute_submission_file_url
 
 logger = logging.getLogger('judge.bridge')
@@ -23,6 +26,7 @@ json_log = logging.getLogger('judge.json.bridge')
 
 UPDATE_RATE_LIMIT = 5
 UPDATE_RATE_TIME = 0.5
+SYNC_BATCH_SIZE = 1000
 SubmissionData = namedtuple(
     'SubmissionData',
     'time memory short_circuit pretests_only contest_no attempt_no user_id file_only file_size_limit',
@@ -68,9 +72,11 @@ class JudgeHandler(ZlibPacketHandler):
         self.tier = None
         self.batch_id = None
         self.in_batch = False
+        self.affinity = JudgeAffinity()
         self._stop_ping = threading.Event()
         self._ping_average = deque(maxlen=6)  # 1 minute average, just like load
         self._time_delta = deque(maxlen=6)
+        self._ping_saved = None
 
         # each value is (updates, last reset)
         self.update_counter = {}
@@ -97,7 +103,8 @@ class JudgeHandler(ZlibPacketHandler):
 
         json_log.info(self._make_json_log(action='disconnect', info='judge disconnected'))
         if self._working:
-            Submission.objects.filter(id=self._working).update(status='IE', result='IE', error='')
+            if Submission.objects.filter(id=self._working).update(status='IE', result='IE', error=''):
+                ContestResultCount.record_submission(self._working)
             json_log.error(self._make_json_log(sub=self._working, action='close', info='IE due to shutdown on grading'))
 
     def _authenticate(self, id, key):
@@ -129,24 +136,37 @@ class JudgeHandler(ZlibPacketHandler):
 
         if self.ignore_problems_packet:
             self.problems = self.judges.problems
-            judge.problems.set(self.judges.problem_ids)
+            self._sync_problem_ids(self.judges.problem_ids)
         else:
-            judge.problems.set(Problem.objects.filter(code__in=list(self.problems)).values_list('id', flat=True))
+            self._sync_problem_ids(Problem.objects.filter(code__in=list(self.problems)).values_list('id', flat=True))
 
         # Cache is_disabled for faster access
         self.is_disabled = judge.is_disabled
 
         judge.last_ip = self.client_address[0]
         judge.save()
+        invalidate_runtimes()
         self.judge_address = '[%s]:%s' % (self.client_address[0], self.client_address[1])
         json_log.info(self._make_json_log(action='auth', info='judge successfully authenticated',
                                           executors=list(self.executors.keys())))
 
     def _disconnected(self):
-        Judge.objects.filter(id=self.judge.id).update(online=False)
+        Judge.objects.filter(id=self.judge.id).update(online=False, ping=self.latency, load=self.load)
         RuntimeVersion.objects.filter(judge=self.judge).delete()
+        invalidate_runtimes()
+        clear_judge_status(self.name)
 
     def _update_ping(self):
+        try:
+            publish_judge_status(self.name, self.latency, self.load)
+        except Exception:
+            logger.exception('Failed to publish status of judge %s', self.name)
+
+        # The status pages read the published values, the database only needs an occasional snapshot.
+        now = time.monotonic()
+        if self._ping_saved is not None and now - self._ping_saved < settings.BRIDGED_JUDGE_PING_SAVE_INTERVAL:
+            return
+        self._ping_saved = now
         try:
             Judge.objects.filter(name=self.name).update(ping=self.latency, load=self.load)
         except Exception as e:
@@ -155,7 +175,7 @@ class JudgeHandler(ZlibPacketHandler):
                 db.connection.close()
 
     def send(self, data):
-        super().send(json.dumps(data, separators=(',', ':')))
+        self.send_bytes(json_codec.dumpb(data))
 
     def on_handshake(self, packet):
         if 'id' not in packet or 'key' not in packet:
@@ -168,7 +188,7 @@ class JudgeHandler(ZlibPacketHandler):
             return
 
         self.timeout = 60
-        self.problems = set(p[0] for p in packet['problems'])
+        self.problems = self.judges.share_problems(frozenset(p[0] for p in packet['problems']))
         self.executors = packet['executors']
         self.name = packet['id']
 
@@ -233,9 +253,10 @@ class JudgeHandler(ZlibPacketHandler):
         else:
             self.send({'name': 'disconnect'})
 
-    def submit(self, id, problem, language, source):
+    def submit(self, id, problem, language, source, priority):
         data = self.get_related_submission_data(id)
         self._working = id
+        self.affinity.record(problem, language)
         self._no_response_job = threading.Timer(20, self._kill_if_no_response)
         self.send({
             'name': 'submission-request',
@@ -246,6 +267,7 @@ class JudgeHandler(ZlibPacketHandler):
             'time-limit': data.time,
             'memory-limit': data.memory,
             'short-circuit': data.short_circuit,
+            'priority': priority,
             'meta': {
                 'pretests-only': data.pretests_only,
                 'in-contest': data.contest_no,
@@ -305,7 +327,7 @@ class JudgeHandler(ZlibPacketHandler):
     def on_packet(self, data):
         try:
             try:
-                data = json.loads(data)
+                data = json_codec.loads(data)
                 if 'name' not in data:
                     raise ValueError
             except ValueError:
@@ -326,26 +348,32 @@ class JudgeHandler(ZlibPacketHandler):
         if not Submission.objects.filter(id=id).update(batch=True):
             logger.warning('Unknown submission: %s', id)
 
+    def _sync_problem_ids(self, problem_ids):
+        through = Judge.problems.through
+        stored = set(through.objects.filter(judge_id=self.judge.id).values_list('problem_id', flat=True))
+        problem_ids = set(problem_ids)
+        self._change_problem_ids(problem_ids - stored, stored - problem_ids)
+
+    def _change_problem_ids(self, added, removed):
+        # Only the rows that differ are written, in batches, instead of every problem of every judge.
+        through = Judge.problems.through
+        for ids in chunk(removed, SYNC_BATCH_SIZE):
+            through.objects.filter(judge_id=self.judge.id, problem_id__in=ids).delete()
+        through.objects.bulk_create([through(judge_id=self.judge.id, problem_id=id) for id in added],
+                                    batch_size=SYNC_BATCH_SIZE, ignore_conflicts=True)
+        logger.info('%s: Stored %d new problems, removed %d', self.name, len(added), len(removed))
+
     def replace_problems(self, problems, problem_ids):
         logger.info('%s: Replacing problem list', self.name)
         self.problems = problems
-        self.judge.problems.set(problem_ids)
+        self._sync_problem_ids(problem_ids)
         logger.info('%s: Replaced %d problems', self.name, len(self.problems))
         json_log.info(self._make_json_log(action='update-problems', count=len(self.problems)))
 
-    def update_problems(
-        self,
-        new_problems,
-        new_problem_ids,
-        deleted_problems,
-        deleted_problem_ids,
-    ):
+    def update_problems(self, problems, new_problem_ids, deleted_problem_ids):
         logger.info('%s: Updating problem list', self.name)
-        self.problems = (new_problems | self.problems) - deleted_problems
-        if new_problem_ids:
-            self.judge.problems.add(*new_problem_ids)
-        if deleted_problem_ids:
-            self.judge.problems.remove(*deleted_problem_ids)
+        self.problems = problems
+        self._change_problem_ids(new_problem_ids, deleted_problem_ids)
         logger.info('%s: Updated %d problems', self.name, len(self.problems))
         json_log.info(self._make_json_log(action='update-problems', count=len(self.problems)))
 
@@ -353,24 +381,38 @@ class JudgeHandler(ZlibPacketHandler):
         if self.ignore_problems_packet:
             return
 
-        problems = set(p[0] for p in packet['problems'])
+        problems = frozenset(p[0] for p in packet['problems'])
         problem_ids = list(Problem.objects.filter(code__in=list(problems)).values_list('id', flat=True))
         self.judges.update_problems(self, problems, problem_ids)
 
     def update_runtimes(self):
-        self.judge.runtimes.set(
-            Language.objects.filter(key__in=list(self.executors.keys())).values_list('id', flat=True),
-        )
+        languages = list(Language.objects.filter(key__in=list(self.executors.keys())).only('id', 'key'))
+        self.judge.runtimes.set(languages)
 
-        RuntimeVersion.objects.filter(judge=self.judge).delete()
-        versions = []
-        for lang in self.judge.runtimes.all():
-            versions += [
-                RuntimeVersion(language=lang, name=name, version='.'.join(map(str, version)),
-                               priority=idx, judge=self.judge)
-                for idx, (name, version) in enumerate(self.executors[lang.key])
-            ]
-        RuntimeVersion.objects.bulk_create(versions)
+        versions = {
+            (lang.id, name, '.'.join(map(str, version)), idx)
+            for lang in languages
+            for idx, (name, version) in enumerate(self.executors[lang.key])
+        }
+        stored = set()
+        removed = []
+        for id, *version in RuntimeVersion.objects.filter(judge=self.judge) \
+                .values_list('id', 'language_id', 'name', 'version', 'priority'):
+            version = tuple(version)
+            if version in versions and version not in stored:
+                stored.add(version)
+            else:
+                removed.append(id)
+
+        added = [RuntimeVersion(language_id=language_id, name=name, version=version, priority=priority,
+                                judge=self.judge)
+                 for language_id, name, version, priority in versions - stored]
+        if removed:
+            RuntimeVersion.objects.filter(id__in=removed).delete()
+        if added:
+            RuntimeVersion.objects.bulk_create(added, batch_size=SYNC_BATCH_SIZE)
+        if removed or added:
+            invalidate_runtimes()
 
     def on_executors(self, packet):
         logger.info('%s: Updating runtimes', self.name)
@@ -474,6 +516,7 @@ class JudgeHandler(ZlibPacketHandler):
         event.post('sub_%s' % submission.id_secret, {'type': 'grading-end'})
         if hasattr(submission, 'contest'):
             participation = submission.contest.participation
+            ContestChange.record(participation.contest_id, ContestChange.PARTICIPATION, participation.id)
             event.post('contest_%d' % participation.contest_id, {'type': 'update'})
         self._post_update_submission(submission.id, 'grading-end', done=True)
 
@@ -652,16 +695,21 @@ class JudgeHandler(ZlibPacketHandler):
             raise
 
     def _make_json_log(self, packet=None, sub=None, **kwargs):
+        # The log line is only built and serialized if a handler actually formats it.
+        return json_codec.LazyJSON(self._build_json_log, self.name, self.judge_address, packet, sub, kwargs)
+
+    @staticmethod
+    def _build_json_log(name, address, packet, sub, kwargs):
         data = {
-            'judge': self.name,
-            'address': self.judge_address,
+            'judge': name,
+            'address': address,
         }
         if sub is None and packet is not None:
             sub = packet.get('submission-id')
         if sub is not None:
             data['submission'] = sub
         data.update(kwargs)
-        return json.dumps(data)
+        return data
 
     def _get_submission_cache(self, id):
         if self._submission_cache_id != id:
@@ -675,6 +723,11 @@ class JudgeHandler(ZlibPacketHandler):
 
     def _post_update_submission(self, id, state, done=False):
         data = self._get_submission_cache(id)
+        if data['contest_object_id'] is not None and (done or state == 'grading-begin'):
+            # Progress packets within a grading run are not logged; sync clients only need the transitions.
+            ContestChange.record(data['contest_object_id'], ContestChange.SUBMISSION, id)
+            if done:
+                ContestResultCount.record_submission(id)
         if data['problem__is_public']:
             event.post('submissions', {
                 'type': 'done-submission' if done else 'update-submission',
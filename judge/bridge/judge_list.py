@@ -1,5 +1,5 @@
 import logging
-from collections import namedtuple
+from collections import OrderedDict, namedtuple
 from random import random
 from threading import RLock
 
@@ -18,8 +18,51 @@ logger = logging.getLogger('judge.bridge')
 PriorityMarker = namedtuple('PriorityMarker', 'priority')
 
 
+class JudgeAffinity(object):
+    """
+    Bounded LRU of the problems and languages a judge graded recently. A judge that
+    recently graded a problem likely still has its test data and checker warm.
+    """
+    problem_cache_size = 16
+    language_cache_size = 8
+
+    def __init__(self):
+        self.problems = OrderedDict()
+        self.languages = OrderedDict()
+
+    @staticmethod
+    def _touch(lru, key, size):
+        lru[key] = None
+        lru.move_to_end(key)
+        while len(lru) > size:
+            lru.popitem(last=False)
+
+    def record(self, problem, language):
+        self._touch(self.problems, problem, self.problem_cache_size)
+        self._touch(self.languages, language, self.language_cache_size)
+
+    def score(self, problem, language):
+        if problem in self.problems:
+            return 2
+        if language in self.languages:
+            return 1
+        return 0
+
+    def is_warm(self, problem):
+        return problem in self.problems
+
+    def clear(self):
+        self.problems.clear()
+        self.languages.clear()
+
+
 class JudgeList(object):
     priorities = 4
+    # When a judge frees up, look this many queued submissions past the first one it can grade for a
+    # submission to a problem it has warm...
+    affinity_lookahead = 8
+    # ...but never pass over the same submission more than this many times.
+    affinity_max_skips = 4
 
     def __init__(self):
         self.queue = dllist()
@@ -29,8 +72,31 @@ class JudgeList(object):
         self.submission_map = {}
         self.lock = RLock()
         self.min_tier = None
-        self.problems = set()
-        self.problem_ids = set()
+        self.problems = frozenset()
+        self.problem_ids = frozenset()
+        self.affinity_skips = {}
+
+    @staticmethod
+    def _can_take(judge, item):
+        id, problem, language, source, judge_id, banned_judges = item
+        return judge.name not in banned_judges and judge.can_judge(problem, language, judge_id)
+
+    def _prefer_warm_node(self, judge, node):
+        # node is the first queued submission judge can grade. If judge does not have its problem warm, a
+        # submission slightly further back in the same priority might be graded faster by this judge.
+        id, problem = node.value[:2]
+        if judge.affinity.is_warm(problem) or self.affinity_skips.get(id, 0) >= self.affinity_max_skips:
+            return node
+
+        candidate = node.next
+        for _ in range(self.affinity_lookahead):
+            if candidate is None or isinstance(candidate.value, PriorityMarker):
+                break
+            if judge.affinity.is_warm(candidate.value[1]) and self._can_take(judge, candidate.value):
+                self.affinity_skips[id] = self.affinity_skips.get(id, 0) + 1
+                return candidate
+            candidate = candidate.next
+        return node
 
     def _handle_free_judge(self, judge):
         with self.lock:
@@ -44,20 +110,21 @@ class JudgeList(object):
                     priority = node.value.priority + 1
                 elif priority >= REJUDGE_PRIORITY and self.should_reserve_judge():
                     return
-                else:
-                    id, problem, language, source, judge_id, banned_judges = node.value
-                    if judge.name not in banned_judges and judge.can_judge(problem, language, judge_id):
-                        self.submission_map[id] = judge
-                        try:
-                            judge.submit(id, problem, language, source)
-                        except Exception:
-                            logger.exception('Failed to dispatch %d (%s, %s) to %s', id, problem, language, judge.name)
-                            self.judges.remove(judge)
-                            return
-                        logger.info('Dispatched queued submission %d: %s', id, judge.name)
-                        self.queue.remove(node)
-                        del self.node_map[id]
-                        break
+                elif self._can_take(judge, node.value):
+                    node = self._prefer_warm_node(judge, node)
+                    id, problem, language, source = node.value[:4]
+                    self.submission_map[id] = judge
+                    try:
+                        judge.submit(id, problem, language, source, priority)
+                    except Exception:
+                        logger.exception('Failed to dispatch %d (%s, %s) to %s', id, problem, language, judge.name)
+                        self.judges.remove(judge)
+                        return
+                    logger.info('Dispatched queued submission %d: %s', id, judge.name)
+                    self.queue.remove(node)
+                    del self.node_map[id]
+                    self.affinity_skips.pop(id, None)
+                    break
                 node = node.next
 
     def _update_min_tier(self):
@@ -122,15 +189,25 @@ class JudgeList(object):
                 self.problem_ids | new_problem_ids
             ) - deleted_problem_ids
             for judge in self.judges:
-                judge.update_problems(
-                    new_problems, new_problem_ids, deleted_problems, deleted_problem_ids,
-                )
+                # Every judge shares the one problem set.
+                judge.update_problems(self.problems, new_problem_ids, deleted_problem_ids)
                 if not judge.working:
                     self._handle_free_judge(judge)
 
+    def share_problems(self, problems):
+        """
+        Returns the problem set of a connected judge that supports exactly the same problems, if there is one,
+        so that judges with identical problem lists keep a single copy of it in memory.
+        """
+        with self.lock:
+            for judge in self.judges:
+                if judge.problems == problems:
+                    return judge.problems
+        return problems
+
     def update_problems(self, judge, problems, problem_ids):
         with self.lock:
-            judge.replace_problems(problems, problem_ids)
+            judge.replace_problems(self.share_problems(problems), problem_ids)
             if not judge.working:
                 self._handle_free_judge(judge)
 
@@ -184,6 +261,7 @@ class JudgeList(object):
                 else:
                     self.queue.remove(node)
                     del self.node_map[submission]
+                    self.affinity_skips.pop(submission, None)
                 return False
 
     def check_priority(self, priority):
@@ -211,12 +289,14 @@ class JudgeList(object):
                 available = []
 
             if available:
-                # Schedule the submission on the judge reporting least load.
-                judge = min(available, key=lambda judge: (judge.load, random()))
+                # Prefer judges that recently graded this problem, then this language, since they likely have
+                # test data and checkers warm. Break ties by the judge reporting least load.
+                judge = min(available, key=lambda judge: (-judge.affinity.score(problem, language),
+                                                          judge.load, random()))
                 logger.info('Dispatched submission %d to: %s', id, judge.name)
                 self.submission_map[id] = judge
                 try:
-                    judge.submit(id, problem, language, source)
+                    judge.submit(id, problem, language, source, priority)
                 except Exception:
                     logger.exception('Failed to dispatch %d (%s, %s) to %s', id, problem, language, judge.name)
                     self.judges.discard(judge)
@@ -228,4 +308,7 @@ class JudgeList(object):
                 )
                 logger.info('Queued submission: %d', id)
                 if self.queue.size == settings.VNOJ_LONG_QUEUE_ALERT_THRESHOLD + self.priorities:
-                    on_long_queue.delay()
+                    self.on_long_queue()
+
+    def on_long_queue(self):
+        on_long_queue.delay()
@@ -3,9 +3,13 @@ import logging
 import os
 import threading
 import time
+from bisect import bisect_left
+from collections import Counter
+from fnmatch import fnmatchcase
 from pathlib import Path
 
 from django import db
+from django.conf import settings
 
 from judge.models import Problem
 
@@ -41,6 +45,30 @@ def find_glob_root(g: str) -> Path:
     return root
 
 
+def _has_magic(part):
+    return glob.escape(part) != part
+
+
+def _match_parts(parts, pattern):
+    """
+    Whether the path components in parts match the glob components in pattern, the way a recursive glob would.
+    """
+    if not pattern:
+        return not parts
+    if pattern[0] == '**':
+        return any(_match_parts(parts[i:], pattern[1:]) for i in range(len(parts) + 1)
+                   if not any(part.startswith('.') for part in parts[:i]))
+    if not parts:
+        return False
+    part, head = parts[0], pattern[0]
+    if not _has_magic(head):
+        matched = part == head
+    else:
+        # Like glob, wildcards do not match hidden names.
+        matched = not (part.startswith('.') and not head.startswith('.')) and fnmatchcase(part, head)
+    return matched and _match_parts(parts[1:], pattern[1:])
+
+
 class SendProblemsHandler(FileSystemEventHandler):
     ALLOWED_EVENT_TYPES = (
         EVENT_TYPE_MOVED,
@@ -51,12 +79,26 @@ class SendProblemsHandler(FileSystemEventHandler):
 
     def __init__(self, signal):
         self.signal = signal
+        self.lock = threading.Lock()
+        self.paths = set()
 
     def on_any_event(self, event):
         if event.event_type not in self.ALLOWED_EVENT_TYPES:
             return
+        # Every change inside a directory also modifies it, the change itself is reported separately.
+        if event.is_directory and event.event_type == EVENT_TYPE_MODIFIED:
+            return
+        with self.lock:
+            self.paths.add(os.fsdecode(event.src_path))
+            if event.event_type == EVENT_TYPE_MOVED:
+                self.paths.add(os.fsdecode(event.dest_path))
         self.signal.set()
 
+    def take_paths(self):
+        with self.lock:
+            paths, self.paths = self.paths, set()
+        return paths
+
 
 class Monitor:
     def __init__(self, judges, problem_globs):
@@ -65,7 +107,11 @@ class Monitor:
 
         self.judges = judges
         self.problem_globs = problem_globs
-        self.problems = set()
+        self._patterns = [Path(os.path.abspath(os.path.join(dir_glob, 'init.yml'))).parts
+                          for dir_glob in problem_globs]
+        # Problem directories found so far, and the number of them for each problem code.
+        self.problem_dirs = set()
+        self.problems = Counter()
 
         self.updater_exit = False
         self.updater_signal = threading.Event()
@@ -78,46 +124,104 @@ class Monitor:
             self._observer.schedule(self._handler, root, recursive=True)
             logger.info('Scheduled for monitoring: %s', root)
 
-    def update_supported_problems(self):
-        problems = []
-        for dir_glob in self.problem_globs:
-            for problem_config in glob.iglob(os.path.join(dir_glob, 'init.yml'), recursive=True):
-                if os.access(problem_config, os.R_OK):
-                    problem_dir = os.path.dirname(problem_config)
-                    problem = os.path.basename(problem_dir)
-                    problems.append(problem)
-        problems = set(problems)
+    def is_problem_dir(self, problem_dir):
+        problem_config = os.path.join(problem_dir, 'init.yml')
+        parts = Path(problem_config).parts
+        return any(_match_parts(parts, pattern) for pattern in self._patterns) and os.access(problem_config, os.R_OK)
 
-        new_problems = problems - self.problems
-        deleted_problems = self.problems - problems
+    def _set_problem_dir(self, problem_dir, supported, touched):
+        if supported == (problem_dir in self.problem_dirs):
+            return
+        problem = os.path.basename(problem_dir)
+        touched.setdefault(problem, problem in self.problems)
+        if supported:
+            self.problem_dirs.add(problem_dir)
+            self.problems[problem] += 1
+        else:
+            self.problem_dirs.discard(problem_dir)
+            self.problems[problem] -= 1
+            if not self.problems[problem]:
+                del self.problems[problem]
+
+    def _send_changes(self, touched):
+        new_problems = {problem for problem, existed in touched.items() if not existed and problem in self.problems}
+        deleted_problems = {problem for problem, existed in touched.items() if existed and problem not in self.problems}
+        if not new_problems and not deleted_problems:
+            return
 
         _ensure_connection()
 
-        if new_problems or deleted_problems:
-            new_problem_ids = set(
-                Problem.objects.filter(code__in=new_problems).values_list('id', flat=True),
-            ) if new_problems else set()
-            deleted_problem_ids = set(
-                Problem.objects.filter(code__in=deleted_problems).values_list('id', flat=True),
-            ) if deleted_problems else set()
-            self.judges.update_problems_all(
-                new_problems=new_problems,
-                new_problem_ids=new_problem_ids,
-                deleted_problems=deleted_problems,
-                deleted_problem_ids=deleted_problem_ids,
-            )
-
-        self.problems = problems
+        new_problem_ids = set(
+            Problem.objects.filter(code__in=new_problems).values_list('id', flat=True),
+        ) if new_problems else set()
+        deleted_problem_ids = set(
+            Problem.objects.filter(code__in=deleted_problems).values_list('id', flat=True),
+        ) if deleted_problems else set()
+        self.judges.update_problems_all(
+            new_problems=new_problems,
+            new_problem_ids=new_problem_ids,
+            deleted_problems=deleted_problems,
+            deleted_problem_ids=deleted_problem_ids,
+        )
+
+    def update_supported_problems(self):
+        """Rescans every problem glob. Events only trigger update_problem_paths, this is the consistency check."""
+        problem_dirs = set()
+        for dir_glob in self.problem_globs:
+            for problem_config in glob.iglob(os.path.join(dir_glob, 'init.yml'), recursive=True):
+                if os.access(problem_config, os.R_OK):
+                    problem_dirs.add(os.path.abspath(os.path.dirname(problem_config)))
+
+        touched = {}
+        for problem_dir in self.problem_dirs - problem_dirs:
+            self._set_problem_dir(problem_dir, False, touched)
+        for problem_dir in problem_dirs - self.problem_dirs:
+            self._set_problem_dir(problem_dir, True, touched)
+        self._send_changes(touched)
+
+    def update_problem_paths(self, paths):
+        """Rechecks only the problem directories that the changed paths could have affected."""
+        candidates = set()
+        known_dirs = None
+        for path in map(os.path.abspath, paths):
+            # A changed init.yml or problem directory itself...
+            candidates.update((path, os.path.dirname(path)))
+            if os.path.isdir(path):
+                # ...every problem below a directory that was created or moved in...
+                for root, _, files in os.walk(path):
+                    if 'init.yml' in files:
+                        candidates.add(root)
+            elif not os.path.exists(path):
+                # ...and every known problem below a directory that was removed or moved away.
+                if known_dirs is None:
+                    known_dirs = sorted(self.problem_dirs)
+                prefix = os.path.join(path, '')
+                for problem_dir in known_dirs[bisect_left(known_dirs, prefix):]:
+                    if not problem_dir.startswith(prefix):
+                        break
+                    candidates.add(problem_dir)
+
+        touched = {}
+        for problem_dir in candidates:
+            self._set_problem_dir(problem_dir, self.is_problem_dir(problem_dir), touched)
+        self._send_changes(touched)
 
     def updater_thread(self) -> None:
+        next_full_scan = 0
         while True:
-            self.updater_signal.wait()
+            self.updater_signal.wait(max(next_full_scan - time.monotonic(), 0))
             self.updater_signal.clear()
             if self.updater_exit:
                 return
 
             try:
-                self.update_supported_problems()
+                if time.monotonic() >= next_full_scan:
+                    next_full_scan = time.monotonic() + settings.BRIDGED_MONITOR_FULL_SCAN_INTERVAL
+                    # The full scan covers everything that changed so far.
+                    self._handler.take_paths()
+                    self.update_supported_problems()
+                else:
+                    self.update_problem_paths(self._handler.take_paths())
                 time.sleep(3)
             except Exception:
                 logger.exception('Failed to update problems.')
@@ -20,6 +20,7 @@ from reversion.models import Revision, Version
 
 from judge.dblock import LockModel
 from judge.models import Comment, CommentLock
+from judge.utils.user_reference import collect_user_references
 from judge.widgets import MartorWidget
 
 
@@ -158,7 +159,8 @@ class CommentedDetailView(TemplateResponseMixin, SingleObjectMixin, View):
             context['interact_min_problem_count_msg'] = \
                 _('You need to have solved at least %d problems before your voice can be heard.') \
                 % settings.VNOJ_INTERACT_MIN_PROBLEM_COUNT
-        context['comment_list'] = queryset
+        context['comment_list'] = comments = list(queryset)
+        collect_user_references(comment.body for comment in comments)
         context['vote_hide_threshold'] = settings.DMOJ_COMMENT_VOTE_HIDE_THRESHOLD
         context['reply_cutoff'] = timezone.now() - settings.DMOJ_COMMENT_REPLY_TIMEFRAME
 
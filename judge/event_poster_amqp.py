@@ -1,4 +1,3 @@
-import json
 import threading
 from time import time
 
@@ -6,6 +5,8 @@ import pika
 from django.conf import settings
 from pika.exceptions import AMQPError
 
+from judge.utils import json_codec
+
 __all__ = ['EventPoster', 'post', 'last']
 
 
@@ -22,7 +23,7 @@ class EventPoster(object):
         try:
             id = int(time() * 1000000)
             self._chan.basic_publish(self._exchange, '',
-                                     json.dumps({'id': id, 'channel': channel, 'message': message}))
+                                     json_codec.dumps({'id': id, 'channel': channel, 'message': message}))
             return id
         except AMQPError:
             if tries > 10:
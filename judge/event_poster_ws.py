@@ -1,10 +1,11 @@
-import json
 import socket
 import threading
 
 from django.conf import settings
 from websocket import WebSocketException, create_connection
 
+from judge.utils import json_codec
+
 __all__ = ['EventPostingError', 'EventPoster', 'post', 'last']
 _local = threading.local()
 
@@ -20,15 +21,15 @@ class EventPoster(object):
     def _connect(self):
         self._conn = create_connection(settings.EVENT_DAEMON_POST)
         if settings.EVENT_DAEMON_KEY is not None:
-            self._conn.send(json.dumps({'command': 'auth', 'key': settings.EVENT_DAEMON_KEY}))
-            resp = json.loads(self._conn.recv())
+            self._conn.send(json_codec.dumps({'command': 'auth', 'key': settings.EVENT_DAEMON_KEY}))
+            resp = json_codec.loads(self._conn.recv())
             if resp['status'] == 'error':
                 raise EventPostingError(resp['code'])
 
     def post(self, channel, message, tries=0):
         try:
-            self._conn.send(json.dumps({'command': 'post', 'channel': channel, 'message': message}))
-            resp = json.loads(self._conn.recv())
+            self._conn.send(json_codec.dumps({'command': 'post', 'channel': channel, 'message': message}))
+            resp = json_codec.loads(self._conn.recv())
             if resp['status'] == 'error':
                 raise EventPostingError(resp['code'])
             else:
@@ -42,7 +43,7 @@ class EventPoster(object):
     def last(self, tries=0):
         try:
             self._conn.send('{"command": "last-msg"}')
-            resp = json.loads(self._conn.recv())
+            resp = json_codec.loads(self._conn.recv())
             if resp['status'] == 'error':
                 raise EventPostingError(resp['code'])
             else:
@@ -1,8 +1,8 @@
-import re
 from collections import defaultdict
 from urllib.parse import urljoin
 
 from ansi2html import Ansi2HTMLConverter
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.urls import reverse
 from django.utils.html import escape
@@ -12,10 +12,10 @@ from lxml.html import Element
 from judge import lxml_tree
 from judge.models import Contest, GeneralIssue, Problem, Profile
 from judge.ratings import rating_class, rating_progress
+from judge.utils.user_links import user_link_version
+from judge.utils.user_reference import get_user_info, rereference
 from . import registry
 
-rereference = re.compile(r'\[(r?user):(\w+)\]')
-
 
 def get_user(username, data):
     if not data:
@@ -51,12 +51,6 @@ def get_user_rating(username, data):
     return element
 
 
-def get_user_info(usernames):
-    return {name: (rank, rating) for name, rank, rating in
-            Profile.objects.filter(user__username__in=usernames)
-                   .values_list('user__username', 'display_rank', 'rating')}
-
-
 reference_map = {
     'user': (get_user, get_user_info),
     'ruser': (get_user_rating, get_user_info),
@@ -166,6 +160,49 @@ def link_user(user):
                      f'{escape(profile.display_name)}</a>{display_badge_img}</span>')
 
 
+class UserLinkStore:
+    """
+    Renders user links through fragments kept in this process across requests, so that listings with thousands of
+    users do not rebuild the same links on every render. Fragments are tied to the version stamp read when the store
+    is created, which changes whenever a profile is updated.
+    """
+
+    fragments = {}
+
+    def __init__(self):
+        self.version = user_link_version()
+
+    def __call__(self, user):
+        if isinstance(user, Profile):
+            key = user.id
+        elif isinstance(user, AbstractUser):
+            key = user.profile.id
+        else:
+            # Ranking rows are rendered without badges, so they get fragments of their own.
+            key = (type(user).__name__, user.id)
+
+        fragment = self.fragments.get(key)
+        if fragment is None or fragment[0] != self.version:
+            if len(self.fragments) >= settings.VNOJ_USER_LINK_STORE_SIZE:
+                self.fragments.clear()
+            fragment = self.fragments[key] = (self.version, link_user(user))
+        return fragment[1]
+
+    def bulk(self, users):
+        return {user.id: self(user) for user in users}
+
+
+@registry.function
+def user_links(users=None):
+    """
+    Returns a callable rendering user links from the fragment store, or the links of users keyed by id if given.
+    """
+    store = UserLinkStore()
+    if users is not None:
+        return store.bulk(users)
+    return store
+
+
 @registry.function
 @registry.render_with('user/link-list.html')
 def link_users(users):
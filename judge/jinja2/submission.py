@@ -1,6 +1,9 @@
 from operator import attrgetter
 
-from judge.models import SubmissionSourceAccess
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+from judge.models import Contest, SubmissionSourceAccess
 from . import registry
 
 
@@ -9,13 +12,49 @@ def get_editor_ids(contest):
     return set(map(attrgetter('id'), contest.authors.all())) | set(map(attrgetter('id'), contest.curators.all()))
 
 
+class SubmissionPermissions:
+    """
+    Permission data shared by all rows of a submission list, computed once on first use instead of once per row.
+    """
+
+    def __init__(self, submissions, profile_id):
+        self.submissions = submissions
+        self.profile_id = profile_id
+
+    @cached_property
+    def edited_contest_ids(self):
+        contest_ids = {submission.contest_object_id for submission in self.submissions} - {None}
+        if not contest_ids or not self.profile_id:
+            return set()
+        return set(Contest.objects.filter(Q(authors=self.profile_id) | Q(curators=self.profile_id),
+                                          id__in=contest_ids).values_list('id', flat=True))
+
+    @cached_property
+    def source_visibility(self):
+        return {submission.problem_id: submission.problem.submission_source_visibility
+                for submission in self.submissions}
+
+    def can_edit_contest(self, submission):
+        return submission.contest_object_id in self.edited_contest_ids
+
+    def get_source_visibility(self, submission):
+        try:
+            return self.source_visibility[submission.problem_id]
+        except KeyError:
+            return submission.problem.submission_source_visibility
+
+
 @registry.function
-def submission_layout(submission, profile_id, user, completed_problem_ids, editable_problem_ids, tester_problem_ids):
+def submission_layout(submission, profile_id, user, completed_problem_ids, editable_problem_ids, tester_problem_ids,
+                      permissions=None):
     if not user.is_authenticated:
         return False, False
 
     problem_id = submission.problem_id
-    submission_source_visibility = submission.problem.submission_source_visibility
+    if not permissions:
+        submission_source_visibility = submission.problem.submission_source_visibility
+    else:
+        submission_source_visibility = permissions.get_source_visibility(submission)
     can_view = False
     can_edit = False
 
@@ -34,7 +73,9 @@ def submission_layout(submission, profile_id, user, completed_problem_ids, edita
         can_view = True
     elif submission_source_visibility == SubmissionSourceAccess.ALWAYS:
         can_view = True
-    elif submission.contest_object is not None and profile_id in get_editor_ids(submission.contest_object):
+    elif submission.contest_object_id is not None and (
+            permissions.can_edit_contest(submission) if permissions else
+            profile_id in get_editor_ids(submission.contest_object)):
         can_view = True
     elif submission.problem_id in completed_problem_ids:
         can_view = submission.problem_id in tester_problem_ids
@@ -1,4 +1,3 @@
-import json
 import logging
 import socket
 import struct
@@ -9,6 +8,7 @@ from django.utils import timezone
 
 from judge import event_poster as event
 from judge.judge_priority import BATCH_REJUDGE_PRIORITY, CONTEST_SUBMISSION_PRIORITY, DEFAULT_PRIORITY, REJUDGE_PRIORITY
+from judge.utils import json_codec
 
 logger = logging.getLogger('judge.judgeapi')
 size_pack = struct.Struct('!I')
@@ -30,8 +30,7 @@ def judge_request(packet, reply=True):
     sock = socket.create_connection(settings.BRIDGED_DJANGO_CONNECT or
                                     settings.BRIDGED_DJANGO_ADDRESS[0])
 
-    output = json.dumps(packet, separators=(',', ':'))
-    output = zlib.compress(output.encode('utf-8'))
+    output = zlib.compress(json_codec.dumpb(packet))
     writer = sock.makefile('wb')
     writer.write(size_pack.pack(len(output)))
     writer.write(output)
@@ -49,12 +48,12 @@ def judge_request(packet, reply=True):
         reader.close()
         sock.close()
 
-        result = json.loads(zlib.decompress(input).decode('utf-8'))
+        result = json_codec.loads(zlib.decompress(input))
         return result
 
 
 def judge_submission(submission, rejudge=False, batch_rejudge=False, judge_id=None):
-    from .models import ContestSubmission, Submission, SubmissionTestCase
+    from .models import ContestChange, ContestResultCount, ContestSubmission, Submission, SubmissionTestCase
 
     updates = {'time': None, 'memory': None, 'points': None, 'result': None, 'case_points': 0, 'case_total': 0,
                'error': None, 'rejudged_date': timezone.now() if rejudge or batch_rejudge else None, 'status': 'QU'}
@@ -76,8 +75,13 @@ def judge_submission(submission, rejudge=False, batch_rejudge=False, judge_id=No
     # as that would prevent people from knowing a submission is being scheduled for rejudging.
     # It is worth noting that this mechanism does not prevent a new rejudge from being scheduled
     # while already queued, but that does not lead to data corruption.
+    counted = ContestResultCount.get_submission_key(submission.id)
     if not Submission.objects.filter(id=submission.id).exclude(status__in=('P', 'G')).update(**updates):
         return False
+    if counted is not None:
+        ContestResultCount.add(*counted, delta=-1)
+    if (rejudge or batch_rejudge) and submission.contest_object_id is not None:
+        ContestChange.record(submission.contest_object_id, ContestChange.SUBMISSION, submission.id)
 
     SubmissionTestCase.objects.filter(submission_id=submission.id).delete()
 
@@ -104,10 +108,12 @@ def judge_submission(submission, rejudge=False, batch_rejudge=False, judge_id=No
     except BaseException:
         logger.exception('Failed to send request to judge')
         Submission.objects.filter(id=submission.id).update(status='IE', result='IE')
+        ContestResultCount.record_submission(submission.id)
         success = False
     else:
         if response['name'] != 'submission-received' or response['submission-id'] != submission.id:
             Submission.objects.filter(id=submission.id).update(status='IE', result='IE')
+            ContestResultCount.record_submission(submission.id)
         _post_update_submission(submission)
         success = True
     return success
@@ -1,11 +1,19 @@
 import csv
+import os
 import secrets
+import time
+from collections import Counter
+from multiprocessing import get_context
 
-from django.conf import settings
+from django import db
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models.functions import Lower
 
 from judge.models import Language, Profile
+from judge.utils.iterator import chunk
 
 ALPHABET = 'abcdefghkqtxyz' + 'abcdefghkqtxyz'.upper() + '23456789'
 
@@ -14,14 +22,18 @@ def generate_password():
     return ''.join(secrets.choice(ALPHABET) for _ in range(8))
 
 
-def add_user(username, fullname, password):
-    usr = User(username=username, first_name=fullname, is_active=True)
-    usr.set_password(password)
-    usr.save()
-
-    profile = Profile(user=usr)
-    profile.language = Language.objects.get(key=settings.DEFAULT_USER_LANGUAGE)
-    profile.save()
+def add_users(rows, language):
+    """
+    Creates users and their profiles from (username, fullname, password hash) tuples.
+    """
+    users = [User(username=username, first_name=fullname, password=password, is_active=True)
+             for username, fullname, password in rows]
+    with transaction.atomic():
+        User.objects.bulk_create(users)
+        # MySQL does not return the primary keys of bulk inserted rows.
+        user_ids = dict(User.objects.filter(username__in=[user.username for user in users])
+                        .values_list('username', 'id'))
+        Profile.objects.bulk_create([Profile(user_id=user_ids[user.username], language=language) for user in users])
 
 
 class Command(BaseCommand):
@@ -30,27 +42,62 @@ class Command(BaseCommand):
     def add_arguments(self, parser):
         parser.add_argument('input', help='csv file containing username and fullname')
         parser.add_argument('output', help='where to store output csv file')
+        parser.add_argument('-w', '--workers', type=int, default=os.cpu_count(),
+                            help='number of processes to hash passwords with')
+        parser.add_argument('--chunk-size', type=int, default=500, help='number of users to create at once')
 
     def handle(self, *args, **options):
-        fin = open(options['input'], 'r')
-        fout = open(options['output'], 'w', newline='')
-
-        reader = csv.DictReader(fin)
-        writer = csv.DictWriter(fout, fieldnames=['username', 'fullname', 'password'])
-        writer.writeheader()
-
-        for row in reader:
-            username = row['username']
-            fullname = row['fullname']
-            password = generate_password()
-
-            add_user(username, fullname, password)
-
-            writer.writerow({
-                'username': username,
-                'fullname': fullname,
-                'password': password,
-            })
-
-        fin.close()
-        fout.close()
+        with open(options['input'], 'r') as fin:
+            rows = [(row['username'], row['fullname']) for row in csv.DictReader(fin)]
+
+        # Usernames that differ only in case collide under MySQL's case-insensitive collation.
+        usernames = [username.lower() for username, _ in rows]
+        duplicates = {username for username, count in Counter(usernames).items() if count > 1}
+        if duplicates:
+            raise CommandError('duplicate usernames in input: %s' % ', '.join(sorted(duplicates)))
+        existing = []
+        for usernames_chunk in chunk(usernames, 1000):
+            existing += (User.objects.annotate(lower_username=Lower('username'))
+                         .filter(lower_username__in=usernames_chunk).values_list('username', flat=True))
+        if existing:
+            raise CommandError('users already exist: %s' % ', '.join(sorted(existing)))
+
+        language = Language.get_default_language()
+        workers = max(options['workers'] or 1, 1)
+        start = time.monotonic()
+        created = 0
+
+        with open(options['output'], 'w', newline='') as fout:
+            writer = csv.DictWriter(fout, fieldnames=['username', 'fullname', 'password'])
+            writer.writeheader()
+
+            pool = None
+            if workers > 1:
+                # Forked workers must not share the parent's database connections.
+                db.connections.close_all()
+                pool = get_context('fork').Pool(workers)
+            try:
+                for batch in chunk(rows, options['chunk_size']):
+                    passwords = [generate_password() for _ in batch]
+                    if pool is None:
+                        hashes = list(map(make_password, passwords))
+                    else:
+                        hashes = pool.map(make_password, passwords, chunksize=max(len(batch) // workers, 1))
+
+                    add_users([(username, fullname, password_hash)
+                               for (username, fullname), password_hash in zip(batch, hashes)], language)
+                    writer.writerows({'username': username, 'fullname': fullname, 'password': password}
+                                     for (username, fullname), password in zip(batch, passwords))
+                    fout.flush()
+
+                    created += len(batch)
+                    elapsed = time.monotonic() - start
+                    self.stdout.write('Created %d/%d users (%.1f users/s)' %
+                                      (created, len(rows), created / elapsed if elapsed else 0))
+            finally:
+                if pool is not None:
+                    pool.close()
+                    pool.join()
+
+        elapsed = time.monotonic() - start
+        self.stdout.write(self.style.SUCCESS('Created %d users in %.1fs' % (created, elapsed)))
@@ -0,0 +1,51 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from judge.utils.home import WIDGETS
+
+
+class Command(BaseCommand):
+    help = 'count the queries and time taken to render the home page, with a cold and a warm cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-u', '--user', help='also render the page for this user')
+        parser.add_argument('-r', '--rounds', type=int, default=5, help='number of warm renders to average over')
+
+    def handle(self, *args, **options):
+        host = next((host.lstrip('.') for host in settings.ALLOWED_HOSTS if host != '*'), 'localhost')
+        clients = [('anonymous', Client(SERVER_NAME=host))]
+        if options['user']:
+            try:
+                user = User.objects.get(username=options['user'])
+            except User.DoesNotExist:
+                raise CommandError('user not found')
+            client = Client(SERVER_NAME=host)
+            client.force_login(user)
+            clients.append((user.username, client))
+
+        url = reverse('home')
+        for name, client in clients:
+            cache.delete_many(['home:%s' % widget for widget in WIDGETS])
+            self.render(name, 'cold', client, url, 1)
+            self.render(name, 'warm', client, url, options['rounds'])
+
+    def render(self, name, state, client, url, rounds):
+        queries = 0
+        start = time.perf_counter()
+        for _ in range(rounds):
+            with CaptureQueriesContext(connection) as context:
+                response = client.get(url)
+            if response.status_code != 200:
+                raise CommandError('home page returned %d' % response.status_code)
+            queries += len(context.captured_queries)
+        elapsed = time.perf_counter() - start
+        self.stdout.write('%-16s %s: %5.1f queries, %7.1f ms per render' %
+                          (name, state, queries / rounds, elapsed / rounds * 1000))
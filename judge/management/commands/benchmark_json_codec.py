@@ -0,0 +1,74 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from judge.utils.json_codec import CODECS, get_codec
+
+
+def synthetic_trace(submissions=100, cases=50):
+    """Packets resembling what a judge sends while grading submissions with many test cases."""
+    for id in range(1, submissions + 1):
+        yield {'name': 'submission-acknowledged', 'submission-id': id}
+        yield {'name': 'grading-begin', 'submission-id': id, 'pretested': False}
+        for position in range(1, cases + 1):
+            yield {
+                'name': 'test-case-status', 'submission-id': id,
+                'cases': [{
+                    'position': position, 'status': 0, 'time': 0.0123, 'points': 1.0, 'total-points': 1.0,
+                    'memory': 3456, 'output': '42\n' * 8, 'feedback': '', 'extended-feedback': '',
+                    'voluntary-context-switches': 3, 'involuntary-context-switches': 1,
+                    'runtime-version': 'cpython 3.11.7',
+                }],
+            }
+        yield {'name': 'grading-end', 'submission-id': id}
+        yield {'name': 'ping-response', 'when': time.time(), 'time': time.time(), 'load': 0.25}
+
+
+class Command(BaseCommand):
+    help = 'benchmark the available JSON codecs over recorded bridge packets'
+
+    def add_arguments(self, parser):
+        parser.add_argument('traces', nargs='*',
+                            help='files containing one recorded packet per line; a synthetic trace is used if omitted')
+        parser.add_argument('-r', '--rounds', type=int, default=5, help='number of passes over the trace')
+
+    def handle(self, *args, **options):
+        if options['traces']:
+            packets = []
+            for trace in options['traces']:
+                with open(trace) as f:
+                    packets.extend(json.loads(line) for line in f if line.strip())
+        else:
+            packets = list(synthetic_trace())
+
+        if not packets:
+            raise CommandError('trace contains no packets')
+
+        encoded = [json.dumps(packet, separators=(',', ':')).encode('utf-8') for packet in packets]
+        total_bytes = sum(map(len, encoded))
+        self.stdout.write('%d packets, %.1f KiB per round, %d rounds' %
+                          (len(packets), total_bytes / 1024, options['rounds']))
+
+        for name in CODECS:
+            try:
+                codec = get_codec(name)
+            except ImportError:
+                self.stdout.write('%-8s not installed' % name)
+                continue
+
+            start = time.perf_counter()
+            for _ in range(options['rounds']):
+                for packet in packets:
+                    codec.dumpb(packet)
+            dump_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(options['rounds']):
+                for data in encoded:
+                    codec.loads(data)
+            load_time = time.perf_counter() - start
+
+            count = len(packets) * options['rounds']
+            self.stdout.write('%-8s dumps: %8.0f packets/s   loads: %8.0f packets/s' %
+                              (name, count / dump_time, count / load_time))
@@ -0,0 +1,56 @@
+import os
+import shutil
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from judge.bridge.judge_list import JudgeList
+
+
+class Command(BaseCommand):
+    help = 'benchmark the bridge problem monitor on a synthetic tree of problem directories'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-n', '--problems', type=int, default=50000, help='number of problem directories')
+        parser.add_argument('--groups', type=int, default=100, help='number of directories to spread problems over')
+
+    def handle(self, *args, **options):
+        from judge.bridge.monitor import has_watchdog_installed
+        if not has_watchdog_installed:
+            raise CommandError('watchdog is not installed')
+        from judge.bridge.monitor import Monitor
+
+        root = tempfile.mkdtemp(prefix='benchmark_monitor')
+        try:
+            for i in range(options['problems']):
+                problem_dir = os.path.join(root, 'group%d' % (i % options['groups']), 'benchmark%d' % i)
+                os.makedirs(problem_dir)
+                open(os.path.join(problem_dir, 'init.yml'), 'w').close()
+
+            monitor = Monitor(JudgeList(), [os.path.join(root, '**', '')])
+            self.time('full scan', monitor.update_supported_problems)
+            self.time('full scan, nothing changed', monitor.update_supported_problems)
+
+            problem_dir = os.path.join(root, 'group0', 'benchmark_new')
+            os.makedirs(problem_dir)
+            open(os.path.join(problem_dir, 'init.yml'), 'w').close()
+            self.time('new problem', monitor.update_problem_paths,
+                      {problem_dir, os.path.join(problem_dir, 'init.yml')})
+
+            test_data = [os.path.join(problem_dir, '%d.in' % i) for i in range(100)]
+            for path in test_data:
+                open(path, 'w').close()
+            self.time('100 test files', monitor.update_problem_paths, set(test_data))
+
+            shutil.rmtree(problem_dir)
+            self.time('deleted problem', monitor.update_problem_paths, {problem_dir, *test_data})
+
+            self.stdout.write('%d problems found' % len(monitor.problems))
+        finally:
+            shutil.rmtree(root)
+
+    def time(self, name, function, *args):
+        start = time.perf_counter()
+        function(*args)
+        self.stdout.write('%-28s %9.1f ms' % (name, (time.perf_counter() - start) * 1000))
@@ -0,0 +1,37 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.template import engines
+
+from judge.models import Profile
+
+TEMPLATES = {
+    'link_user': '{% for user in users %}<tr><td>{{ link_user(user) }}</td></tr>{% endfor %}',
+    'user_links': '{% set user_link = user_links() %}'
+                  '{% for user in users %}<tr><td>{{ user_link(user) }}</td></tr>{% endfor %}',
+}
+
+
+class Command(BaseCommand):
+    help = 'benchmark rendering user links for a large ranking, with and without the user link fragment store'
+
+    def add_arguments(self, parser):
+        parser.add_argument('-n', '--rows', type=int, default=10000, help='number of ranking rows')
+        parser.add_argument('-r', '--rounds', type=int, default=5, help='number of renders to average over')
+
+    def handle(self, *args, **options):
+        env = next(engine.env for engine in engines.all() if hasattr(engine, 'env'))
+        # Unsaved profiles, so that only the rendering is measured.
+        users = [Profile(id=id, user=User(id=id, username='user%d' % id), rating=1000 + id % 2000,
+                         display_rank='user') for id in range(1, options['rows'] + 1)]
+
+        for name, source in TEMPLATES.items():
+            template = env.from_string(source)
+            timings = []
+            for _ in range(options['rounds']):
+                start = time.perf_counter()
+                template.render({'users': users})
+                timings.append(time.perf_counter() - start)
+            self.stdout.write('%-12s first: %7.1f ms, average: %7.1f ms over %d rows' %
+                              (name, timings[0] * 1000, sum(timings) / len(timings) * 1000, len(users)))
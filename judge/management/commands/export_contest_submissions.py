@@ -3,6 +3,7 @@ import os
 from django.core.management.base import BaseCommand, CommandError
 
 from judge.models import Contest, ContestParticipation
+from judge.utils.contest_export import ContestDataExport, DirectoryWriter, ZipWriter
 
 
 class Command(BaseCommand):
@@ -10,51 +11,37 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument('key', help='contest key')
-        parser.add_argument('output', help='output directory')
+        parser.add_argument('output', help='output directory, or zip file if it ends with .zip')
+        parser.add_argument('-w', '--workers', type=int, default=1,
+                            help='number of processes to export with, each handling a share of the problems')
+        parser.add_argument('--chunk-size', type=int, default=500, help='number of sources to load at once')
 
     def handle(self, *args, **options):
         contest_key = options['key']
-        output_dir = options['output']
+        output = options['output']
 
         contest = Contest.objects.filter(key=contest_key).first()
         if contest is None:
             raise CommandError('contest not found')
 
-        if os.path.exists(output_dir):
-            raise CommandError('output directory already exists')
-
-        os.makedirs(output_dir)
-
-        users = contest.users.filter(virtual=ContestParticipation.LIVE).select_related('user__user')
-
-        user_count = 0
-        submission_count = 0
-
-        for user in users:
-            user_count += 1
-
-            username = user.user.user.username
-            user_dir = os.path.join(output_dir, username)
-            user_history_dir = os.path.join(user_dir, '$History')
-
-            os.makedirs(user_dir)
-
-            problems = set()
-            submissions = user.submissions.order_by('-id') \
-                .select_related('problem__problem', 'submission__source', 'submission__language') \
-                .values_list('problem__problem__code', 'submission__source__source',
-                             'submission__language__extension', 'submission__id')
-
-            for problem, source, ext, sub_id in submissions:
-                submission_count += 1
-
-                if problem not in problems:  # Last submission
-                    problems.add(problem)
-                    with open(os.path.join(user_dir, f'{problem}.{ext}'), 'w') as f:
-                        f.write(source)
-                else:
-                    os.makedirs(user_history_dir, exist_ok=True)
-                    with open(os.path.join(user_history_dir, f'{problem}_{sub_id}.{ext}'), 'w') as f:
-                        f.write(source)
-
+        if os.path.exists(output):
+            raise CommandError('output already exists')
+
+        if output.endswith('.zip'):
+            writer = ZipWriter(output)
+        else:
+            os.makedirs(output)
+            for username in contest.users.filter(virtual=ContestParticipation.LIVE) \
+                                         .values_list('user__user__username', flat=True):
+                os.makedirs(os.path.join(output, username), exist_ok=True)
+            writer = DirectoryWriter(output)
+
+        # The latest submission to each problem gets the main path.
+        export = ContestDataExport(contest.id, ordering=('-id',), chunk_size=options['chunk_size'])
+        try:
+            submission_count = export.export_parallel(writer, options['workers'])
+        finally:
+            writer.close()
+
+        user_count = contest.users.filter(virtual=ContestParticipation.LIVE).count()
         print(f'Exported {submission_count} submissions by {user_count} users')
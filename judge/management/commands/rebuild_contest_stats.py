@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from judge.models import Contest, ContestResultCount
+
+
+class Command(BaseCommand):
+    help = 'rebuild the submission counts shown on contest statistics pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('contests', nargs='*', help='keys of the contests to rebuild')
+        parser.add_argument('--all', action='store_true', help='rebuild every contest')
+
+    def handle(self, *args, **options):
+        if options['all']:
+            contests = Contest.objects.all()
+        elif options['contests']:
+            contests = Contest.objects.filter(key__in=options['contests'])
+            missing = set(options['contests']) - set(contests.values_list('key', flat=True))
+            if missing:
+                raise CommandError('contests not found: %s' % ', '.join(sorted(missing)))
+        else:
+            raise CommandError('specify contest keys or --all')
+
+        for contest in contests.only('id', 'key', 'start_time').iterator():
+            ContestResultCount.rebuild(contest)
+            self.stdout.write('Rebuilt %s' % contest.key)
@@ -0,0 +1,136 @@
+import heapq
+import random
+from itertools import count
+
+from django.core.management.base import BaseCommand
+
+from judge.bridge.judge_list import JudgeAffinity, JudgeList
+from judge.judge_priority import CONTEST_SUBMISSION_PRIORITY
+
+
+class NoAffinity:
+    def record(self, problem, language):
+        pass
+
+    def score(self, problem, language):
+        return 0
+
+    def is_warm(self, problem):
+        return False
+
+
+class SimulatedJudgeList(JudgeList):
+    def on_long_queue(self):
+        pass
+
+
+class SimulatedJudge:
+    def __init__(self, simulation, name, use_affinity):
+        self.simulation = simulation
+        self.name = name
+        self.tier = 1
+        self.is_disabled = False
+        self.load = 0
+        self._working = False
+        # What is actually warm on the judge, regardless of whether the scheduler is told about it.
+        self.cache = JudgeAffinity()
+        self.cache.problem_cache_size = simulation.options['judge_cache_size']
+        self.affinity = self.cache if use_affinity else NoAffinity()
+
+    @property
+    def working(self):
+        return bool(self._working)
+
+    def get_current_submission(self):
+        return self._working or None
+
+    def can_judge(self, problem, executor, judge_id=None):
+        return (not judge_id and not self.is_disabled) or self.name == judge_id
+
+    def submit(self, id, problem, language, source, priority):
+        self._working = id
+        self.simulation.on_dispatch(self, id, problem, language)
+
+
+class Simulation:
+    def __init__(self, options, use_affinity):
+        self.options = options
+        self.random = random.Random(options['seed'])
+        self.now = 0.0
+        self.events = []
+        self.sequence = count()
+        self.arrivals = {}
+        self.waits = []
+        self.cold_starts = 0
+
+        self.judges = SimulatedJudgeList()
+        for i in range(options['judges']):
+            self.judges.register(SimulatedJudge(self, 'judge-%d' % i, use_affinity))
+
+    def schedule(self, time, callback, *args):
+        heapq.heappush(self.events, (time, next(self.sequence), callback, args))
+
+    def on_dispatch(self, judge, id, problem, language):
+        self.waits.append(self.now - self.arrivals.pop(id))
+        duration = self.random.expovariate(1 / self.options['grading_time'])
+        if not judge.cache.is_warm(problem):
+            self.cold_starts += 1
+            duration += self.options['cold_penalty']
+        judge.cache.record(problem, language)
+        self.schedule(self.now + duration, self.judges.on_judge_free, judge, id)
+
+    def on_arrival(self, id, problem, language):
+        self.arrivals[id] = self.now
+        self.judges.judge(id, problem, language, '', None, CONTEST_SUBMISSION_PRIORITY)
+
+    def run(self):
+        options = self.options
+        # Contest workloads are heavily skewed: a few easy problems receive most submissions.
+        weights = [1 / (rank + 1) ** options['skew'] for rank in range(options['problems'])]
+        problems = ['problem%d' % i for i in range(options['problems'])]
+        languages = ['CPP20', 'PY3', 'JAVA', 'PYPY3']
+        rate = options['judges'] * options['load'] / (options['grading_time'] + options['cold_penalty'] / 2)
+
+        time = 0.0
+        for id in range(1, options['submissions'] + 1):
+            time += self.random.expovariate(rate)
+            problem = self.random.choices(problems, weights)[0]
+            language = self.random.choices(languages, (6, 3, 1, 1))[0]
+            self.schedule(time, self.on_arrival, id, problem, language)
+
+        while self.events:
+            self.now, _, callback, args = heapq.heappop(self.events)
+            callback(*args)
+        return self
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class Command(BaseCommand):
+    help = 'simulate queue wait of the bridge judge scheduler under a skewed contest workload'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--judges', type=int, default=8, help='number of judges')
+        parser.add_argument('--problems', type=int, default=12, help='number of contest problems')
+        parser.add_argument('--submissions', type=int, default=20000, help='number of submissions')
+        parser.add_argument('--skew', type=float, default=1.2, help='Zipf exponent of problem popularity')
+        parser.add_argument('--grading-time', type=float, default=2.0, help='mean grading time with warm caches')
+        parser.add_argument('--cold-penalty', type=float, default=3.0,
+                            help='extra seconds to load test data and compile checkers from cold')
+        parser.add_argument('--judge-cache-size', type=int, default=3,
+                            help='number of problems a judge keeps warm')
+        parser.add_argument('--load', type=float, default=0.85, help='target utilization of the judge pool')
+        parser.add_argument('--seed', type=int, default=0, help='random seed')
+
+    def handle(self, *args, **options):
+        for name, use_affinity in (('random', False), ('affinity', True)):
+            result = Simulation(options, use_affinity).run()
+            waits = result.waits
+            self.stdout.write(
+                '%-9s mean wait: %7.2fs  p50: %7.2fs  p95: %7.2fs  max: %7.2fs  cold starts: %5.1f%%  makespan: %.0fs' %
+                (name, sum(waits) / len(waits), percentile(waits, 0.5), percentile(waits, 0.95), max(waits),
+                 result.cold_starts / len(waits) * 100, result.now),
+            )
@@ -17,6 +17,7 @@ from requests.exceptions import HTTPError
 
 from judge.ip_auth import IPBasedAuthBackend
 from judge.models import MiscConfig, Organization
+from judge.utils.user_reference import user_reference_scope
 
 try:
     import uwsgi
@@ -229,6 +230,17 @@ class MiscConfigMiddleware:
         return self.get_response(request)
 
 
+class UserReferenceMiddleware:
+    """Lets every user reference rendered for a request be resolved together."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with user_reference_scope():
+            return self.get_response(request)
+
+
 class OrganizationSubdomainMiddleware(object):
     def __init__(self, get_response):
         self.get_response = get_response
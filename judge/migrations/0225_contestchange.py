@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-19 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('judge', '0224_ticketmessage_action'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContestChange',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('S', 'submission'), ('P', 'participation')], max_length=1, verbose_name='kind')),
+                ('object_id', models.PositiveIntegerField(verbose_name='object ID')),
+                ('time', models.DateTimeField(auto_now_add=True, verbose_name='change time')),
+                ('contest', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='changes', to='judge.contest', verbose_name='contest')),
+            ],
+            options={
+                'verbose_name': 'contest change',
+                'verbose_name_plural': 'contest changes',
+                'indexes': [models.Index(fields=['contest', 'id'], name='judge_conte_contest_539ea5_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-19 11:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def rebuild_result_counts(apps, schema_editor):
+    Contest = apps.get_model('judge', 'Contest')
+    ContestResultCount = apps.get_model('judge', 'ContestResultCount')
+    Submission = apps.get_model('judge', 'Submission')
+
+    for contest in Contest.objects.only('id', 'start_time').iterator():
+        counts = (
+            Submission.objects.filter(contest_object=contest, date__gt=contest.start_time, result__isnull=False)
+            .values('problem_id', 'language_id', 'result').annotate(count=models.Count('id')).order_by()
+        )
+        ContestResultCount.objects.bulk_create([ContestResultCount(contest=contest, **data) for data in counts])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('judge', '0225_contestchange'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContestResultCount',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('result', models.CharField(choices=[('AC', 'Accepted'), ('WA', 'Wrong Answer'), ('TLE', 'Time Limit Exceeded'), ('MLE', 'Memory Limit Exceeded'), ('OLE', 'Output Limit Exceeded'), ('IR', 'Invalid Return'), ('RTE', 'Runtime Error'), ('CE', 'Compile Error'), ('IE', 'Internal Error'), ('SC', 'Short Circuited'), ('AB', 'Aborted')], max_length=3, verbose_name='result')),
+                ('count', models.PositiveIntegerField(default=0, verbose_name='count')),
+                ('contest', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='result_counts', to='judge.contest', verbose_name='contest')),
+                ('language', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='judge.language', verbose_name='language')),
+                ('problem', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='judge.problem', verbose_name='problem')),
+            ],
+            options={
+                'verbose_name': 'contest result count',
+                'verbose_name_plural': 'contest result counts',
+                'unique_together': {('contest', 'problem', 'language', 'result')},
+            },
+        ),
+        migrations.RunPython(rebuild_result_counts, migrations.RunPython.noop),
+    ]
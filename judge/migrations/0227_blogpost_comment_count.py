@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-19 12:05
+
+from django.db import migrations, models
+
+
+def count_comments(apps, schema_editor):
+    BlogPost = apps.get_model('judge', 'BlogPost')
+    Comment = apps.get_model('judge', 'Comment')
+
+    counts = Comment.objects.filter(page__startswith='b:', hidden=False).values_list('page') \
+                            .annotate(count=models.Count('id')).order_by()
+    for page, count in counts:
+        if page[2:].isdigit():
+            BlogPost.objects.filter(id=page[2:]).update(comment_count=count)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('judge', '0226_contestresultcount'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='comment count'),
+        ),
+        migrations.RunPython(count_comments, migrations.RunPython.noop),
+    ]
@@ -4,8 +4,8 @@ from django.conf import settings
 from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
 from django.core.validators import RegexValidator
-from django.db import models
-from django.db.models import CASCADE
+from django.db import models, transaction
+from django.db.models import CASCADE, F
 from django.urls import reverse
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
@@ -47,10 +47,18 @@ class Comment(MPTTModel):
     class MPTTMeta:
         order_insertion_by = ['-time']
 
-    def vote(self, delta):
-        self.score += delta
-        self.save(update_fields=['score'])
-        self.author.update_contribution_points(delta * settings.VNOJ_CP_COMMENT)
+    def vote(self, voter, delta):
+        """
+        Records a vote by voter. Raises IntegrityError if voter has already voted on this comment.
+        """
+        with transaction.atomic():
+            # The score is updated first to lock the comment. Otherwise the foreign key check of the vote would only
+            # share-lock it, and concurrent voters upgrading their shared locks for the score update would deadlock.
+            Comment.objects.filter(id=self.id).update(score=F('score') + delta)
+            CommentVote.objects.create(comment_id=self.id, voter=voter, score=delta)
+        # Outside the transaction, since the vote share-locks the voter's profile and two users voting on each other's
+        # comments would otherwise deadlock on their profiles.
+        Profile.add_contribution_points([self.author_id], delta * settings.VNOJ_CP_COMMENT)
 
     @classmethod
     def get_newest_visible_comments(cls, viewer, author=None, n=None, batch=None):
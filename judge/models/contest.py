@@ -5,8 +5,8 @@ from datetime import date, timedelta
 from django.conf import settings
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator, RegexValidator
-from django.db import models, transaction
-from django.db.models import CASCADE, Exists, OuterRef, Q
+from django.db import IntegrityError, models, transaction
+from django.db.models import CASCADE, Count, Exists, F, OuterRef, Q
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.functional import cached_property
@@ -18,7 +18,8 @@ from moss import MOSS_LANG_C, MOSS_LANG_CC, MOSS_LANG_JAVA, MOSS_LANG_PASCAL, MO
 from judge import contest_format, event_poster as event
 from judge.models.problem import Problem
 from judge.models.profile import Organization, Profile
-from judge.models.submission import Submission
+from judge.models.runtime import Language
+from judge.models.submission import SUBMISSION_RESULT, Submission
 from judge.ratings import rate_contest
 from judge.utils.unicode import utf8bytes
 
@@ -775,6 +776,101 @@ class ContestSubmission(models.Model):
         verbose_name_plural = _('contest submissions')
 
 
+class ContestChange(models.Model):
+    """
+    Append-only log of changes to a contest's submissions and participations. The id is a monotonically increasing
+    sequence number that sync clients use as a cursor.
+    """
+
+    SUBMISSION = 'S'
+    PARTICIPATION = 'P'
+    KINDS = (
+        (SUBMISSION, _('submission')),
+        (PARTICIPATION, _('participation')),
+    )
+
+    id = models.BigAutoField(primary_key=True)
+    contest = models.ForeignKey(Contest, verbose_name=_('contest'), related_name='changes', on_delete=CASCADE)
+    kind = models.CharField(max_length=1, verbose_name=_('kind'), choices=KINDS)
+    object_id = models.PositiveIntegerField(verbose_name=_('object ID'))
+    time = models.DateTimeField(verbose_name=_('change time'), auto_now_add=True)
+
+    @classmethod
+    def record(cls, contest_id, kind, object_id):
+        cls.objects.create(contest_id=contest_id, kind=kind, object_id=object_id)
+
+    class Meta:
+        verbose_name = _('contest change')
+        verbose_name_plural = _('contest changes')
+        indexes = [
+            models.Index(fields=['contest', 'id']),
+        ]
+
+
+class ContestResultCount(models.Model):
+    """
+    Number of graded submissions to a contest, per problem, language and result. Maintained incrementally as
+    submissions finish grading or are rejudged, and rebuilt from the submissions with `rebuild`.
+    """
+
+    contest = models.ForeignKey(Contest, verbose_name=_('contest'), related_name='result_counts', on_delete=CASCADE)
+    problem = models.ForeignKey(Problem, verbose_name=_('problem'), related_name='+', on_delete=CASCADE)
+    language = models.ForeignKey(Language, verbose_name=_('language'), related_name='+', on_delete=CASCADE)
+    result = models.CharField(max_length=3, verbose_name=_('result'), choices=SUBMISSION_RESULT)
+    count = models.PositiveIntegerField(verbose_name=_('count'), default=0)
+
+    @classmethod
+    def add(cls, contest_id, problem_id, language_id, result, delta=1):
+        lookup = {'contest_id': contest_id, 'problem_id': problem_id, 'language_id': language_id, 'result': result}
+        if delta < 0:
+            # Counts can drift from manual edits until rebuilt, so never let them go negative.
+            cls.objects.filter(count__gte=-delta, **lookup).update(count=F('count') + delta)
+            return
+        if cls.objects.filter(**lookup).update(count=F('count') + delta):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(count=delta, **lookup)
+        except IntegrityError:
+            cls.objects.filter(**lookup).update(count=F('count') + delta)
+
+    @classmethod
+    def get_submission_key(cls, submission_id):
+        """
+        Returns the (contest, problem, language, result) a submission is counted under, or None if it is not counted.
+        """
+        try:
+            data = Submission.objects.filter(id=submission_id, contest_object__isnull=False).values(
+                'contest_object_id', 'contest_object__start_time', 'date', 'problem_id', 'language_id', 'result',
+            ).get()
+        except Submission.DoesNotExist:
+            return None
+        if data['result'] is None or data['date'] <= data['contest_object__start_time']:
+            return None
+        return data['contest_object_id'], data['problem_id'], data['language_id'], data['result']
+
+    @classmethod
+    def record_submission(cls, submission_id, delta=1):
+        key = cls.get_submission_key(submission_id)
+        if key is not None:
+            cls.add(*key, delta=delta)
+
+    @classmethod
+    def rebuild(cls, contest):
+        counts = (
+            Submission.objects.filter(contest_object=contest, date__gt=contest.start_time, result__isnull=False)
+            .values('problem_id', 'language_id', 'result').annotate(count=Count('id')).order_by()
+        )
+        with transaction.atomic():
+            cls.objects.filter(contest=contest).delete()
+            cls.objects.bulk_create([cls(contest=contest, **data) for data in counts])
+
+    class Meta:
+        unique_together = ('contest', 'problem', 'language', 'result')
+        verbose_name = _('contest result count')
+        verbose_name_plural = _('contest result counts')
+
+
 class Rating(models.Model):
     user = models.ForeignKey(Profile, verbose_name=_('user'), related_name='ratings', on_delete=CASCADE)
     contest = models.ForeignKey(Contest, verbose_name=_('contest'), related_name='ratings', on_delete=CASCADE)
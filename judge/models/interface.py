@@ -2,8 +2,8 @@ import re
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import models
-from django.db.models import CASCADE
+from django.db import models, transaction
+from django.db.models import CASCADE, Count, F
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
@@ -88,6 +88,7 @@ class BlogPost(models.Model):
     summary = models.TextField(verbose_name=_('post summary'), blank=True)
     og_image = models.CharField(verbose_name=_('OpenGraph image'), default='', max_length=150, blank=True)
     score = models.IntegerField(verbose_name=_('votes'), default=0)
+    comment_count = models.PositiveIntegerField(verbose_name=_('comment count'), default=0)
     global_post = models.BooleanField(verbose_name=_('global post'), default=False,
                                       help_text=_('Display this blog post at the homepage.'))
     organization = models.ForeignKey(Organization, on_delete=models.CASCADE, verbose_name=_('organization'),
@@ -97,15 +98,32 @@ class BlogPost(models.Model):
     def __str__(self):
         return self.title
 
-    def vote(self, delta):
-        self.score += delta
-        self.save(update_fields=['score'])
+    def vote(self, voter, delta):
+        """
+        Records a vote by voter. Raises IntegrityError if voter has already voted on this post.
+        """
+        with transaction.atomic():
+            # Lock the post before the vote's foreign key check share-locks it, see Comment.vote.
+            BlogPost.objects.filter(id=self.id).update(score=F('score') + delta)
+            BlogVote.objects.create(blog_id=self.id, voter=voter, score=delta)
 
         # Only update contributions for global and personal posts
         if self.visible and self.organization is None:
-            for author in self.authors.all():
-                # Blog votes are counted as comment votes
-                author.update_contribution_points(delta * settings.VNOJ_CP_COMMENT)
+            # Blog votes are counted as comment votes
+            Profile.add_contribution_points(self.authors.values_list('id', flat=True),
+                                            delta * settings.VNOJ_CP_COMMENT)
+
+    @classmethod
+    def update_comment_counts(cls, pages):
+        """Recounts the visible comments of the blog posts among the given comment pages."""
+        from judge.models import Comment
+        pages = {page for page in pages if page.startswith('b:') and page[2:].isdigit()}
+        if not pages:
+            return
+        counts = dict(Comment.objects.filter(page__in=pages, hidden=False).values_list('page')
+                      .annotate(count=Count('id')).order_by())
+        for page in pages:
+            cls.objects.filter(id=page[2:]).update(comment_count=counts.get(page, 0))
 
     def get_absolute_url(self):
         return reverse('blog_post', args=(self.id, self.slug))
@@ -9,6 +9,8 @@ import pyotp
 import webauthn
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
 from django.core.validators import RegexValidator
 from django.db import models
 from django.db.models import F, Max, Sum
@@ -22,7 +24,7 @@ from fernet_fields import EncryptedCharField
 from pyotp.utils import strings_equal
 from sortedm2m.fields import SortedManyToManyField
 
-from judge.models.choices import ACE_THEMES, MATH_ENGINES_CHOICES, SITE_THEMES, TIMEZONE
+from judge.models.choices import ACE_THEMES, EFFECTIVE_MATH_ENGINES, MATH_ENGINES_CHOICES, SITE_THEMES, TIMEZONE
 from judge.models.runtime import Language
 from judge.ratings import rating_class
 from judge.utils.float_compare import float_compare_equal
@@ -361,12 +363,24 @@ class Profile(models.Model):
     def update_contribution_points(self, delta):
         # this is just for testing the contribution
         # we should not use this function to update contribution points
-        self.contribution_points += delta
-        self.save(update_fields=['contribution_points'])
+        Profile.add_contribution_points([self.id], delta)
+        self.refresh_from_db(fields=['contribution_points'])
         return self.contribution_points
 
     update_contribution_points.alters_data = True
 
+    @classmethod
+    def add_contribution_points(cls, profile_ids, delta):
+        # Incremented in the database, so that concurrent votes never overwrite each other. This skips save(), so the
+        # caches that would be cleared by profile_update are cleared here.
+        from judge.utils.home import invalidate_home
+
+        profile_ids = list(profile_ids)
+        cls.objects.filter(id__in=profile_ids).update(contribution_points=F('contribution_points') + delta)
+        invalidate_home('top_contrib')
+        cache.delete_many([make_template_fragment_key('user_about', (id, engine))
+                           for id in profile_ids for engine in EFFECTIVE_MATH_ENGINES])
+
     def generate_api_token(self):
         secret = secrets.token_bytes(32)
         self.api_token = hmac.new(force_bytes(settings.SECRET_KEY), msg=secret, digestmod='sha256').hexdigest()
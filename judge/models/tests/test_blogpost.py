@@ -1,5 +1,10 @@
+from unittest import mock
+
+from django.contrib import admin
 from django.test import TestCase
 
+from judge.admin.comments import CommentAdmin
+from judge.models import BlogPost, Comment
 from judge.models.tests.util import CommonDataMixin, create_blogpost, create_user
 
 
@@ -55,6 +60,29 @@ class BlogPostTestCase(CommonDataMixin, TestCase):
     def test_basic_blogpost(self):
         self.assertEqual(str(self.basic_blogpost), self.basic_blogpost.title)
 
+    @mock.patch('judge.signals.on_new_comment')
+    def test_comment_count(self, on_new_comment):
+        def comment_count():
+            return BlogPost.objects.get(id=self.visible_blogpost.id).comment_count
+
+        page = 'b:%d' % self.visible_blogpost.id
+        comments = [Comment.objects.create(author=self.users['normal'].profile, page=page, body='body')
+                    for _ in range(3)]
+        self.assertEqual(comment_count(), 3)
+
+        Comment.objects.filter(id=comments[0].id).update(hidden=True)
+        BlogPost.update_comment_counts([page])
+        self.assertEqual(comment_count(), 2)
+
+        comments[1].delete()
+        self.assertEqual(comment_count(), 1)
+
+        Comment.objects.create(author=self.users['normal'].profile, page=page, body='reply', parent=comments[2])
+        self.assertEqual(comment_count(), 2)
+        comments[2].hidden = True
+        CommentAdmin(Comment, admin.site).save_model(None, comments[2], None, True)
+        self.assertEqual(comment_count(), 0)
+
     def test_basic_blogpost_methods(self):
         data = {
             'superuser': {
@@ -1,12 +1,15 @@
+from unittest import mock
+
 from django.core.exceptions import ValidationError
 from django.test import SimpleTestCase, TestCase, override_settings
 from django.utils import timezone
 
-from judge.models import ContestParticipation, Language, LanguageLimit, Problem
+from judge.models import ContestParticipation, Language, LanguageLimit, Problem, Solution
 from judge.models.problem import ProblemTestcaseAccess, disallowed_characters_validator
 from judge.models.tests.util import CommonDataMixin, create_contest, create_contest_participation, \
     create_contest_problem, create_organization, create_problem, create_problem_type, create_solution, \
     create_user
+from judge.utils.problems import filter_by_visible_problems, visible_problem_ids
 
 
 class ProblemTestCase(CommonDataMixin, TestCase):
@@ -435,6 +438,12 @@ class ProblemTestCase(CommonDataMixin, TestCase):
                         problem_codes,
                     )
 
+                with self.subTest(list='visible problem ids'):
+                    self.assertEqual(
+                        visible_problem_ids(user),
+                        set(Problem.get_visible_problems(user).values_list('id', flat=True)),
+                    )
+
                 with self.subTest(list='editable problems'):
                     # We only care about consistency between Problem.is_editable_by and Problem.get_editable_problems
                     problem_codes = []
@@ -447,6 +456,19 @@ class ProblemTestCase(CommonDataMixin, TestCase):
                         problem_codes,
                     )
 
+    def test_filter_by_visible_problems(self):
+        for problem in Problem.objects.all():
+            create_solution(problem=problem)
+
+        for name, user in self.users.items():
+            expected = set(Problem.get_visible_problems(user).values_list('id', flat=True))
+            # Both the inlined id list and the subquery must match Problem.get_visible_problems.
+            for limit in (1000, 0):
+                with self.subTest(user=name, inline_limit=limit), \
+                        mock.patch('judge.utils.problems.VISIBLE_PROBLEMS_INLINE_LIMIT', limit):
+                    solutions = filter_by_visible_problems(Solution.objects.all(), user)
+                    self.assertEqual(set(solutions.values_list('problem_id', flat=True)), expected)
+
 
 @override_settings(LANGUAGE_CODE='en-US', LANGUAGES=(('en', 'English'),))
 class SolutionTestCase(CommonDataMixin, TestCase):
@@ -141,6 +141,9 @@ def recalculate_ratings(ranking, old_mean, times_ranked, historical_p):
 
 def rate_contest(contest):
     from judge.models import Rating, Profile
+    from judge.utils.home import invalidate_home
+    from judge.utils.user_links import invalidate_user_links
+    from judge.utils.user_reference import invalidate_user_info
 
     rating_subquery = Rating.objects.filter(user=OuterRef('user'))
     rating_sorted = rating_subquery.order_by('-contest__end_time')
@@ -188,6 +191,10 @@ def rate_contest(contest):
         Profile.objects.filter(contest_history__contest=contest, contest_history__virtual=0).update(
             rating=Subquery(Rating.objects.filter(user=OuterRef('id'))
                             .order_by('-contest__end_time').values('rating')[:1]))
+        invalidate_home('top_rated')
+        invalidate_user_links()
+        invalidate_user_info(Profile.objects.filter(contest_history__contest=contest, contest_history__virtual=0)
+                             .values_list('user__username', flat=True))
 
 
 RATING_LEVELS = ['Newbie', 'Pupil', 'Specialist', 'Expert', 'Candidate Master', 'Master', 'International Master',
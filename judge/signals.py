@@ -3,6 +3,7 @@ import os
 from typing import Optional
 
 from django.conf import settings
+from django.contrib.auth.models import User
 from django.contrib.flatpages.models import FlatPage
 from django.core.cache import cache
 from django.core.cache.utils import make_template_fragment_key
@@ -13,10 +14,15 @@ from registration.models import RegistrationProfile
 from registration.signals import user_registered
 
 from judge.caching import finished_submission
-from judge.models import BlogPost, Comment, Contest, ContestAnnouncement, ContestProblem, ContestSubmission, \
-    EFFECTIVE_MATH_ENGINES, Judge, Language, License, MiscConfig, Organization, Problem, Profile, Submission, \
-    WebAuthnCredential
+from judge.models import Badge, BlogPost, Comment, Contest, ContestAnnouncement, ContestProblem, ContestResultCount, \
+    ContestSubmission, EFFECTIVE_MATH_ENGINES, Judge, Language, License, MiscConfig, Organization, Problem, Profile, \
+    Submission, WebAuthnCredential
 from judge.tasks import on_new_comment
+from judge.utils.deletion import current_bulk_deletion
+from judge.utils.home import invalidate_home
+from judge.utils.problems import invalidate_user_visible_problems, invalidate_visible_problems
+from judge.utils.user_links import invalidate_user_links
+from judge.utils.user_reference import invalidate_user_info
 from judge.views.register import RegistrationView
 
 
@@ -40,6 +46,8 @@ def problem_update(sender, instance, **kwargs):
     if hasattr(instance, '_updating_stats_only'):
         return
 
+    invalidate_visible_problems()
+    invalidate_home('new_problems', 'count:problems', 'comments')
     cache.delete_many([
         make_template_fragment_key('submission_problem', (instance.id,)),
         make_template_fragment_key('problem_feed', (instance.id,)),
@@ -57,15 +65,41 @@ def problem_update(sender, instance, **kwargs):
             unlink_if_exists(cached_pdf_filename)
 
 
+@receiver(post_delete, sender=Problem)
+def problem_delete(sender, instance, **kwargs):
+    invalidate_visible_problems()
+    invalidate_home('new_problems', 'count:problems', 'comments')
+
+
+@receiver(m2m_changed, sender=Problem.authors.through)
+@receiver(m2m_changed, sender=Problem.curators.through)
+@receiver(m2m_changed, sender=Problem.testers.through)
+def problem_access_update(sender, instance, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_visible_problems()
+
+
 @receiver(post_save, sender=Profile)
 def profile_update(sender, instance, **kwargs):
     if hasattr(instance, '_updating_stats_only'):
         return
 
+    invalidate_home('top_rated', 'top_contrib')
+    invalidate_user_info([instance.user.username])
+    invalidate_user_links()
     cache.delete_many([make_template_fragment_key('user_about', (instance.id, engine))
                        for engine in EFFECTIVE_MATH_ENGINES])
 
 
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Badge)
+def user_link_update(sender, instance, update_fields=None, **kwargs):
+    # Logging in saves the user just to update last_login, which no user link shows.
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    invalidate_user_links()
+
+
 @receiver(post_delete, sender=WebAuthnCredential)
 def webauthn_delete(sender, instance, **kwargs):
     profile = instance.user
@@ -79,6 +113,7 @@ def contest_update(sender, instance, **kwargs):
     if hasattr(instance, '_updating_stats_only'):
         return
 
+    invalidate_home('contests', 'comments')
     cache.delete_many(['generated-meta-contest:%d' % instance.id] +
                       [make_template_fragment_key('contest_html', (instance.id, engine))
                        for engine in EFFECTIVE_MATH_ENGINES])
@@ -98,6 +133,7 @@ def license_update(sender, instance, **kwargs):
 
 @receiver(post_save, sender=Language)
 def language_update(sender, instance, **kwargs):
+    invalidate_home('count:languages')
     cache.delete_many([make_template_fragment_key('language_html', (instance.id,)),
                        'lang:cn_map'])
 
@@ -110,13 +146,22 @@ def judge_update(sender, instance, **kwargs):
 @receiver(post_save, sender=Comment)
 def comment_update(sender, instance, created, **kwargs):
     cache.delete('comment_feed:%d' % instance.id)
+    invalidate_home('comments')
+    BlogPost.update_comment_counts([instance.page])
     if not created:
         return
     on_new_comment.delay(instance.id)
 
 
+@receiver(post_delete, sender=Comment)
+def comment_delete(sender, instance, **kwargs):
+    invalidate_home('comments')
+    BlogPost.update_comment_counts([instance.page])
+
+
 @receiver(post_save, sender=BlogPost)
 def post_update(sender, instance, **kwargs):
+    invalidate_home('comments')
     cache.delete_many([
         make_template_fragment_key('post_summary', (instance.id,)),
         'blog_slug:%d' % instance.id,
@@ -128,6 +173,11 @@ def post_update(sender, instance, **kwargs):
 
 @receiver(post_delete, sender=Submission)
 def submission_delete(sender, instance, **kwargs):
+    deletion = current_bulk_deletion()
+    if deletion is not None:
+        deletion.submission_deleted(instance)
+        return
+
     finished_submission(instance)
     instance.user._updating_stats_only = True
     instance.user.calculate_points()
@@ -137,8 +187,14 @@ def submission_delete(sender, instance, **kwargs):
 
 @receiver(post_delete, sender=ContestSubmission)
 def contest_submission_delete(sender, instance, **kwargs):
+    deletion = current_bulk_deletion()
+    if deletion is not None:
+        deletion.contest_submission_deleted(instance)
+        return
+
     participation = instance.participation
     participation.recompute_results()
+    ContestResultCount.record_submission(instance.submission_id, delta=-1)
     Submission.objects.filter(id=instance.submission_id).update(contest_object=None)
 
 
@@ -188,6 +244,19 @@ def profile_organization_update(sender, instance, action, **kwargs):
         org.on_user_changes()
 
 
+@receiver(m2m_changed, sender=Profile.organizations.through)
+def profile_organization_visibility_update(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        invalidate_user_visible_problems([instance.id])
+    elif pk_set:
+        invalidate_user_visible_problems(pk_set)
+    else:
+        # Clearing an organization's members does not tell us who they were.
+        invalidate_visible_problems()
+
+
 @receiver(post_save, sender=ContestAnnouncement)
 def contest_announcement_create(sender, instance, created, **kwargs):
     if not created:
@@ -1,22 +1,19 @@
-import fnmatch
 import json
 import logging
 import os
-import re
-import zipfile
 
 from celery import shared_task
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
-from django.core.files.storage import default_storage
+from django.utils import timezone
 from django.utils.translation import gettext as _
 from moss import MOSS
 
-from judge.models import Contest, ContestMoss, ContestParticipation, ContestSubmission, Problem, Submission
+from judge.models import Contest, ContestChange, ContestMoss, ContestParticipation, Submission
 from judge.utils.celery import Progress
+from judge.utils.contest_export import ContestDataExport, ZipWriter
 
-__all__ = ('rescore_contest', 'run_moss', 'prepare_contest_data')
-rewildcard = re.compile(r'\*+')
+__all__ = ('rescore_contest', 'run_moss', 'prepare_contest_data', 'prune_contest_changes')
 logger = logging.getLogger('judge.celery')
 
 
@@ -94,54 +91,23 @@ def prepare_contest_data(self, contest_id, options):
         # Force an update so that we get a progress bar.
         p.done = 0
         contest = Contest.objects.get(id=contest_id)
-        queryset = ContestSubmission.objects.filter(participation__contest=contest, participation__virtual=0) \
-                                    .order_by('-points', 'id') \
-                                    .select_related('problem__problem', 'submission__user__user',
-                                                    'submission__source', 'submission__language') \
-                                    .values_list('submission__user__user__id', 'submission__user__user__username',
-                                                 'problem__problem__code', 'submission__source__source',
-                                                 'submission__language__extension', 'submission__id',
-                                                 'submission__language__file_only')
-
-        if options['submission_results']:
-            queryset = queryset.filter(result__in=options['submission_results'])
-
-        # Compress wildcards to avoid exponential complexity on certain glob patterns before Python 3.9.
-        # For details, see <https://bugs.python.org/issue40480>.
-        problem_glob = rewildcard.sub('*', options['submission_problem_glob'])
-        if problem_glob != '*':
-            queryset = queryset.filter(
-                problem__problem__in=Problem.objects.filter(code__regex=fnmatch.translate(problem_glob)),
-            )
-
-        submissions = list(queryset)
+        export = ContestDataExport(contest.id, options['submission_results'], options['submission_problem_glob'])
+        length = export.count()
         p.did(1)
 
-    length = len(submissions)
+    # Celery pool workers are daemonic and cannot fork a process pool of their own, so export sequentially.
     with Progress(self, length, stage=_('Preparing contest data')) as p:
-        data_file = zipfile.ZipFile(os.path.join(settings.DMOJ_CONTEST_DATA_CACHE, '%s.zip' % contest_id), mode='w')
-        exported = set()
-        for user_id, username, problem, source, ext, sub_id, file_only in submissions:
-            if (user_id, problem) in exported:
-                path = os.path.join(username, '$History', f'{problem}_{sub_id}.{ext}')
-            else:
-                path = os.path.join(username, f'{problem}.{ext}')
-                exported.add((user_id, problem))
-
-            if file_only:
-                # Get the basename of the source as it is an URL
-                filename = os.path.basename(source)
-                data_file.write(
-                    default_storage.path(os.path.join(settings.SUBMISSION_FILE_UPLOAD_MEDIA_DIR,
-                                         problem, str(user_id), filename)),
-                    path,
-                )
-                pass
-            else:
-                data_file.writestr(path, source)
-
-            p.did(1)
-
-        data_file.close()
+        writer = ZipWriter(os.path.join(settings.DMOJ_CONTEST_DATA_CACHE, '%s.zip' % contest_id))
+        try:
+            export.export_to(writer, progress=p.did)
+        finally:
+            writer.close()
 
     return length
+
+
+@shared_task
+def prune_contest_changes():
+    cutoff = timezone.now() - settings.VNOJ_CONTEST_SYNC_CHANGE_RETENTION
+    deleted = ContestChange.objects.filter(time__lt=cutoff).delete()[0]
+    logger.info('Pruned %d contest changes older than %s', deleted, cutoff)
@@ -1,18 +1,62 @@
+import logging
+import time
+
 from celery import shared_task
 from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from django.utils import timezone
 
-from judge.models import Problem
+from judge.models import Problem, Submission, SubmissionSource, SubmissionTestCase
+from judge.utils.deletion import bulk_deletion
 from judge.utils.problems import fast_delete_problem
 
 __all__ = ('problem_garbage_collect',)
+logger = logging.getLogger('judge.celery')
+
+GARBAGE_COLLECTOR_CHECKPOINT = 'problem_garbage_collect:checkpoint'
+
+
+def _delete_submissions(ids):
+    # Test cases and sources are deleted directly, so the submission deletion only has to cascade to a few rows.
+    with transaction.atomic(), bulk_deletion(recompute=False):
+        deleted = SubmissionTestCase.objects.filter(submission_id__in=ids).delete()[0]
+        deleted += SubmissionSource.objects.filter(submission_id__in=ids).delete()[0]
+        deleted += Submission.objects.filter(id__in=ids).delete()[0]
+    return deleted
 
 
 @shared_task
 def problem_garbage_collect():
-    problems = Problem.expired_deletion.all()
+    # Submissions are deleted in short transactions of bounded id ranges. The position is checkpointed after each
+    # one, so a run that hits the time limit is resumed by the next one.
+    start = time.monotonic()
     end = timezone.now() + settings.VNOJ_PROBLEM_GARBAGE_COLLECTOR_TIME_LIMIT
-    for problem in problems:
-        if timezone.now() > end:
+    chunk_size = settings.VNOJ_PROBLEM_GARBAGE_COLLECTOR_CHUNK_SIZE
+    checkpoint_problem, checkpoint_id = cache.get(GARBAGE_COLLECTOR_CHECKPOINT, (None, 0))
+
+    problems = sorted(Problem.expired_deletion.values_list('id', flat=True), key=lambda id: id != checkpoint_problem)
+    deleted = 0
+    for problem_id in problems:
+        last_id = checkpoint_id if problem_id == checkpoint_problem else 0
+        while timezone.now() <= end:
+            ids = list(Submission.objects.filter(problem_id=problem_id, id__gt=last_id).order_by('id')
+                       .values_list('id', flat=True)[:chunk_size])
+            if not ids:
+                break
+            deleted += _delete_submissions(ids)
+            last_id = ids[-1]
+            cache.set(GARBAGE_COLLECTOR_CHECKPOINT, (problem_id, last_id), None)
+        else:
+            # Out of time
             break
-        fast_delete_problem(problem)
+
+        problem = Problem.expired_deletion.filter(id=problem_id).first()
+        if problem is not None:
+            deleted += fast_delete_problem(problem)
+        cache.delete(GARBAGE_COLLECTOR_CHECKPOINT)
+
+    elapsed = time.monotonic() - start
+    logger.info('Problem garbage collector deleted %d rows in %.1f seconds (%.1f rows/s)',
+                deleted, elapsed, deleted / elapsed if elapsed > 0 else 0)
+    return deleted
@@ -0,0 +1,59 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from judge.models import Profile
+from judge.utils.cursor_paginator import decode_cursor, encode_cursor
+from judge.views.api.api_v2 import APIUserList
+
+
+class SmallPageUserList(APIUserList):
+    paginate_by = 2
+
+
+class CursorPaginationTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user_model = get_user_model()
+        cls.profiles = [
+            Profile.objects.create(user=user_model.objects.create_user(username='cursor%d' % i, password='pw'))
+            for i in range(5)
+        ]
+
+    def get(self, **params):
+        request = RequestFactory().get('/api/v2/users', params)
+        request.user = self.profiles[0].user
+        response = SmallPageUserList.as_view()(request)
+        return response.status_code, json.loads(response.content)
+
+    def test_cursor_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor(12345)), 12345)
+        self.assertIsNone(decode_cursor(''))
+        with self.assertRaises(ValueError):
+            decode_cursor('not a cursor!')
+
+    def test_crawl(self):
+        seen = []
+        cursor = ''
+        while True:
+            with CaptureQueriesContext(connection) as queries:
+                status, data = self.get(after=cursor)
+            self.assertEqual(status, 200)
+            self.assertFalse(any('COUNT(' in query['sql'].upper() for query in queries.captured_queries))
+
+            data = data['data']
+            self.assertNotIn('page_index', data)
+            seen += [user['username'] for user in data['objects']]
+            if not data['has_more']:
+                self.assertIsNone(data['next_cursor'])
+                break
+            cursor = data['next_cursor']
+
+        self.assertEqual(seen, [profile.user.username for profile in self.profiles])
+
+    def test_invalid_cursor(self):
+        status, data = self.get(after='%%%')
+        self.assertEqual(status, 400)
@@ -0,0 +1,78 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+
+from judge.models import Profile
+from judge.views.api.api_v2 import APISubmissionList, APIUserList
+
+
+class SmallChunkUserList(APIUserList):
+    export_chunk_size = 2
+
+
+class APIExportTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user_model = get_user_model()
+        cls.profiles = [
+            Profile.objects.create(user=user_model.objects.create_user(username='export%d' % i, password='pw'))
+            for i in range(5)
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, user=None, **params):
+        request = RequestFactory().get('/api/v2/users', params)
+        request.user = user or self.profiles[0].user
+        return SmallChunkUserList.as_view()(request)
+
+    def test_ndjson(self):
+        response = self.get(export='ndjson')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode('utf-8').splitlines()]
+        self.assertEqual([row['username'] for row in rows], [profile.user.username for profile in self.profiles])
+        self.assertEqual(set(rows[0]), {'id', 'username', 'points', 'performance_points', 'problem_count', 'rank',
+                                        'rating'})
+
+    def test_csv(self):
+        response = self.get(export='csv', username='export3')
+        self.assertEqual(response.status_code, 200)
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode('utf-8'))))
+        self.assertEqual(rows[0][:2], ['id', 'username'])
+        self.assertEqual([row[1] for row in rows[1:]], ['export3'])
+
+    def test_invalid_format(self):
+        self.assertEqual(self.get(export='xml').status_code, 400)
+
+    def test_login_required(self):
+        self.assertEqual(self.get(user=AnonymousUser(), export='csv').status_code, 403)
+
+    @override_settings(VNOJ_API_EXPORT_LIMIT_COUNT=2)
+    def test_rate_limit(self):
+        self.assertEqual(self.get(export='csv').status_code, 200)
+        self.assertEqual(self.get(export='csv').status_code, 200)
+        self.assertEqual(self.get(export='csv').status_code, 429)
+        self.assertEqual(self.get(user=self.profiles[1].user, export='csv').status_code, 200)
+        # Regular paging is not limited.
+        self.assertEqual(self.get().status_code, 200)
+
+    def test_submission_row(self):
+        start = datetime(2025, 1, 1, 9)
+        values = {
+            'id': 1, 'problem': 'aplusb', 'user': 'export0', 'date': start + timedelta(minutes=5), 'language': 'PY3',
+            'time': 0.5, 'memory': 1024, 'points': 1.0, 'result': 'AC', 'contest': 'contest',
+            'contest_points': 100.0, 'virtual_participation_number': 0, 'time_since_start_of_participation': start,
+        }
+        view = APISubmissionList()
+        columns = view.get_export_columns()
+        row = dict(zip(columns, view.get_export_row([values[name] for name in columns])))
+        self.assertEqual(row['time_since_start_of_participation'], 300)
+        self.assertEqual(row['date'], values['date'].isoformat())
@@ -6,6 +6,7 @@ from django.utils import timezone
 
 from judge.models import (
     Contest,
+    ContestChange,
     ContestParticipation,
     ContestProblem,
     Language,
@@ -15,6 +16,7 @@ from judge.models import (
     Profile,
     Submission,
 )
+from judge.tasks import prune_contest_changes
 
 
 @override_settings(GLOBAL_API_KEY='test-api-key-123')
@@ -97,7 +99,7 @@ class ContestSyncAPITestCase(TestCase):
             order=2,
         )
 
-        ContestParticipation.objects.create(
+        cls.team_foo_participation = ContestParticipation.objects.create(
             contest=cls.contest,
             user=cls.team_foo_profile,
             score=500,
@@ -235,6 +237,58 @@ class ContestSyncAPITestCase(TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertIn('error', response.json())
 
+    @override_settings(VNOJ_CONTEST_SYNC_SETTLE_TIME=0)
+    def test_change_feed(self):
+        ContestChange.record(self.contest.id, ContestChange.SUBMISSION, self.final_submission.id)
+        ContestChange.record(self.contest.id, ContestChange.SUBMISSION, self.processing_submission.id)
+        ContestChange.record(self.contest.id, ContestChange.SUBMISSION, self.final_submission.id)
+        ContestChange.record(self.contest.id, ContestChange.PARTICIPATION, self.team_foo_participation.id)
+
+        response = self.client.get(
+            '/api/v2/sync/contest/icpc-2025/changes',
+            {'limit': 3},
+            headers={'X-Global-API-Key': 'test-api-key-123'},
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertTrue(data['has_more'])
+        # Repeated changes to the same submission collapse into its latest position.
+        self.assertEqual(
+            [change['submission']['id'] for change in data['changes']],
+            [str(self.processing_submission.id), str(self.final_submission.id)],
+        )
+
+        response = self.client.get(
+            '/api/v2/sync/contest/icpc-2025/changes',
+            {'after': data['next_after']},
+            headers={'X-Global-API-Key': 'test-api-key-123'},
+        )
+        data = response.json()
+        self.assertFalse(data['has_more'])
+        self.assertEqual(len(data['changes']), 1)
+        self.assertEqual(data['changes'][0]['type'], 'participation')
+        self.assertEqual(data['changes'][0]['participation']['user'], 'team_foo')
+        self.assertEqual(data['changes'][0]['participation']['score'], 500)
+
+        response = self.client.get(
+            '/api/v2/sync/contest/icpc-2025/changes',
+            {'after': data['next_after']},
+            headers={'X-Global-API-Key': 'test-api-key-123'},
+        )
+        self.assertEqual(response.json()['changes'], [])
+        self.assertEqual(response.json()['next_after'], data['next_after'])
+
+    def test_prune_changes(self):
+        ContestChange.record(self.contest.id, ContestChange.SUBMISSION, self.final_submission.id)
+        ContestChange.record(self.contest.id, ContestChange.SUBMISSION, self.processing_submission.id)
+        old = timezone.now() - timedelta(days=30)
+        ContestChange.objects.filter(object_id=self.final_submission.id).update(time=old)
+
+        prune_contest_changes()
+        self.assertListEqual(
+            list(ContestChange.objects.values_list('object_id', flat=True)), [self.processing_submission.id],
+        )
+
     def test_global_api_key_authentication_header(self):
         """Test API access using X-Global-API-Key header"""
         with self.settings(GLOBAL_API_KEY='test-api-key-123'):
@@ -0,0 +1,65 @@
+import unittest
+from collections import deque
+from threading import RLock
+from unittest import mock
+
+from judge.balancer.balancer import JudgeBalancer
+from judge.balancer.fair_queue import FairQueue
+from judge.balancer.judge_handler import JudgeHandler
+
+
+def create_judge(name, durations=(), load=None):
+    judge = JudgeHandler.__new__(JudgeHandler)
+    judge.name = name
+    judge.current_submission_id = None
+    judge.load = load
+    judge._durations = deque(durations, maxlen=20)
+
+    def submit(packet):
+        judge.current_submission_id = packet['submission-id']
+
+    judge.submit = mock.Mock(side_effect=submit)
+    return judge
+
+
+def create_balancer(judges):
+    balancer = JudgeBalancer.__new__(JudgeBalancer)
+    balancer.config = {'bridges': [{}]}
+    balancer.judges = set(judges)
+    balancer.lock = RLock()
+    balancer.judge_to_bridge = {}
+    balancer.bridge_to_judge = {}
+    balancer.queue = FairQueue()
+    return balancer
+
+
+class JudgeSchedulingTestCase(unittest.TestCase):
+    def test_expected_duration(self):
+        self.assertEqual(create_judge('new').expected_duration(2.0), 2.0)
+        self.assertEqual(create_judge('measured', durations=[1.0, 3.0]).expected_duration(5.0), 2.0)
+        self.assertEqual(create_judge('loaded', durations=[2.0], load=0.5).expected_duration(5.0), 3.0)
+        # Judges report a negative load when it is unavailable.
+        self.assertEqual(create_judge('unknown', durations=[2.0], load=-1).expected_duration(5.0), 2.0)
+
+    def test_fastest_judge_picked(self):
+        slow = create_judge('slow', durations=[4.0])
+        fast = create_judge('fast', durations=[1.0])
+        busy = create_judge('busy', durations=[0.5], load=9)
+        balancer = create_balancer([slow, fast, busy])
+
+        balancer.queue.push('site', (0, {'submission-id': 1}))
+        balancer._try_judge()
+        fast.submit.assert_called_once()
+        self.assertIs(balancer.bridge_to_judge[0], fast)
+
+    def test_only_free_judges_picked(self):
+        slow = create_judge('slow', durations=[4.0])
+        fast = create_judge('fast', durations=[1.0])
+        fast.current_submission_id = 1
+        balancer = create_balancer([slow, fast])
+
+        balancer.queue.push('site', (0, {'submission-id': 2}))
+        balancer._try_judge()
+        fast.submit.assert_not_called()
+        slow.submit.assert_called_once()
+        self.assertFalse(balancer.queue)
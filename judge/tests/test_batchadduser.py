@@ -0,0 +1,56 @@
+import csv
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from judge.models import Language, Profile
+from judge.models.tests.util import create_user
+
+
+class BatchAddUserTestCase(TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.input = os.path.join(self.root, 'input.csv')
+        self.output = os.path.join(self.root, 'output.csv')
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def run_command(self, rows, chunk_size=500):
+        with open(self.input, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['username', 'fullname'])
+            writer.writerows(rows)
+        call_command('batchadduser', self.input, self.output, workers=1, chunk_size=chunk_size, stdout=StringIO())
+
+    def test_create(self):
+        rows = [('batch_%d' % i, 'Batch User %d' % i) for i in range(5)]
+        self.run_command(rows, chunk_size=2)
+
+        with open(self.output, newline='') as f:
+            output = list(csv.DictReader(f))
+        self.assertEqual([(row['username'], row['fullname']) for row in output], rows)
+
+        language = Language.get_default_language()
+        for row in output:
+            user = User.objects.get(username=row['username'])
+            self.assertEqual(user.first_name, row['fullname'])
+            self.assertTrue(user.is_active)
+            self.assertTrue(user.check_password(row['password']))
+            self.assertEqual(Profile.objects.get(user=user).language, language)
+
+    def test_duplicate_usernames(self):
+        with self.assertRaisesRegex(CommandError, 'batch_dup'):
+            self.run_command([('batch_dup', 'A'), ('Batch_Dup', 'B')])
+        self.assertFalse(User.objects.filter(username__istartswith='batch_dup').exists())
+
+    def test_existing_usernames(self):
+        create_user(username='batch_existing')
+        with self.assertRaisesRegex(CommandError, 'batch_existing'):
+            self.run_command([('batch_new', 'A'), ('BATCH_EXISTING', 'B')])
+        self.assertFalse(User.objects.filter(username='batch_new').exists())
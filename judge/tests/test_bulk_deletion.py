@@ -0,0 +1,43 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from judge.models import Language, Problem, Profile, Submission
+from judge.models.tests.util import create_problem, create_user
+from judge.utils.deletion import bulk_deletion, current_bulk_deletion
+
+
+class BulkDeletionTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.profile = create_user(username='bulk_deletion').profile
+        cls.problems = [create_problem(code='bulk_deletion_%d' % i) for i in range(2)]
+        for problem in cls.problems:
+            for _ in range(5):
+                Submission.objects.create(user=cls.profile, problem=problem, language=Language.get_python3(),
+                                          result='AC', status='D', points=1)
+
+    def test_recomputes_once(self):
+        with mock.patch.object(Profile, 'calculate_points') as calculate_points, \
+                mock.patch.object(Problem, 'update_stats') as update_stats:
+            with bulk_deletion():
+                Submission.objects.filter(user=self.profile).delete()
+                self.assertEqual(calculate_points.call_count, 0)
+        self.assertEqual(calculate_points.call_count, 1)
+        self.assertEqual(update_stats.call_count, 2)
+        self.assertIsNone(current_bulk_deletion())
+
+    def test_without_recompute(self):
+        with mock.patch.object(Profile, 'calculate_points') as calculate_points:
+            with bulk_deletion(recompute=False):
+                Submission.objects.filter(user=self.profile).delete()
+        self.assertEqual(calculate_points.call_count, 0)
+
+    def test_nested(self):
+        with bulk_deletion() as outer, bulk_deletion() as inner:
+            self.assertIs(outer, inner)
+
+    def test_per_row_outside_context(self):
+        with mock.patch.object(Profile, 'calculate_points') as calculate_points:
+            Submission.objects.filter(problem=self.problems[0]).delete()
+        self.assertEqual(calculate_points.call_count, 5)
@@ -0,0 +1,54 @@
+from django.test import TestCase
+from django.utils import timezone
+
+from judge.models import ContestResultCount, ContestSubmission, Language, Submission
+from judge.models.tests.util import create_contest, create_contest_participation, create_contest_problem, \
+    create_problem, create_user
+
+
+class ContestResultCountTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.profile = create_user(username='result_count').profile
+        cls.problem = create_problem(code='result_count')
+        cls.contest = create_contest(key='result_count')
+        cls.contest_problem = create_contest_problem(contest=cls.contest, problem=cls.problem)
+        cls.participation = create_contest_participation(contest=cls.contest, user=cls.profile)
+        cls.language = Language.get_python3()
+
+    def submit(self, result):
+        submission = Submission.objects.create(user=self.profile, problem=self.problem, language=self.language,
+                                               contest_object=self.contest, result=result, status='D')
+        ContestSubmission.objects.create(submission=submission, problem=self.contest_problem,
+                                         participation=self.participation)
+        return submission
+
+    def counts(self):
+        return dict(self.contest.result_counts.filter(count__gt=0).values_list('result', 'count'))
+
+    def test_add(self):
+        key = (self.contest.id, self.problem.id, self.language.id)
+        ContestResultCount.add(*key, 'AC')
+        ContestResultCount.add(*key, 'AC', delta=2)
+        ContestResultCount.add(*key, 'WA', delta=-1)
+        self.assertEqual(self.counts(), {'AC': 3})
+        ContestResultCount.add(*key, 'AC', delta=-5)
+        self.assertEqual(self.counts(), {'AC': 3})
+
+    def test_record_and_rebuild(self):
+        submissions = [self.submit('AC'), self.submit('WA'), self.submit(None)]
+        early = self.submit('AC')
+        Submission.objects.filter(id=early.id).update(date=self.contest.start_time - timezone.timedelta(days=1))
+        for submission in submissions + [early]:
+            ContestResultCount.record_submission(submission.id)
+        self.assertEqual(self.counts(), {'AC': 1, 'WA': 1})
+
+        ContestResultCount.objects.filter(contest=self.contest).delete()
+        ContestResultCount.rebuild(self.contest)
+        self.assertEqual(self.counts(), {'AC': 1, 'WA': 1})
+
+    def test_delete(self):
+        submission = self.submit('AC')
+        ContestResultCount.record_submission(submission.id)
+        submission.delete()
+        self.assertEqual(self.counts(), {})
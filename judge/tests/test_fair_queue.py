@@ -0,0 +1,68 @@
+import unittest
+
+from judge.balancer.fair_queue import FairQueue
+from judge.judge_priority import BATCH_REJUDGE_PRIORITY, CONTEST_SUBMISSION_PRIORITY, DEFAULT_PRIORITY
+
+
+class FairQueueTestCase(unittest.TestCase):
+    def drain(self, queue):
+        result = []
+        while queue:
+            result.append(queue.pop())
+        return result
+
+    def test_round_robin(self):
+        queue = FairQueue()
+        for i in range(100):
+            queue.push('busy', i, BATCH_REJUDGE_PRIORITY)
+        queue.push('quiet', 'a', BATCH_REJUDGE_PRIORITY)
+        queue.push('quiet', 'b', BATCH_REJUDGE_PRIORITY)
+
+        order = [share for share, _ in self.drain(queue)]
+        self.assertEqual(order[:4], ['busy', 'quiet', 'busy', 'quiet'])
+        self.assertEqual(len(order), 102)
+
+    def test_weights(self):
+        queue = FairQueue({'big': 3})
+        for i in range(30):
+            queue.push('big', i)
+            queue.push('small', i)
+
+        order = [share for share, _ in self.drain(queue)][:20]
+        self.assertEqual(order.count('big'), 15)
+        self.assertEqual(order.count('small'), 5)
+
+    def test_priority(self):
+        queue = FairQueue()
+        queue.push('a', 1, BATCH_REJUDGE_PRIORITY)
+        queue.push('a', 2, DEFAULT_PRIORITY)
+        queue.push('b', 3, CONTEST_SUBMISSION_PRIORITY)
+
+        self.assertEqual([item for _, item in self.drain(queue)], [3, 2, 1])
+
+    def test_virtual_time_per_priority(self):
+        queue = FairQueue()
+        for i in range(10):
+            queue.push('busy', i, BATCH_REJUDGE_PRIORITY)
+        for _ in range(5):
+            queue.pop()
+        # Serving another priority must not rewind the batch priority's virtual time, which would let a share that
+        # arrives late jump ahead of the backlog.
+        queue.push('other', 'x', DEFAULT_PRIORITY)
+        queue.pop()
+        for i in range(5):
+            queue.push('late', i, BATCH_REJUDGE_PRIORITY)
+
+        order = [share for share, _ in self.drain(queue)]
+        self.assertEqual(order[:4], ['busy', 'late', 'busy', 'late'])
+
+    def test_stats(self):
+        queue = FairQueue()
+        queue.push('a', 1)
+        queue.push('a', 2)
+        queue.pop()
+
+        stats = queue.get_stats()['a']
+        self.assertEqual(stats['depth'], 1)
+        self.assertEqual(stats['dispatched'], 1)
+        self.assertEqual(len(queue), 1)
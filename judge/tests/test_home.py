@@ -0,0 +1,56 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+
+from judge.models import Comment
+from judge.models.tests.util import create_problem, create_user
+from judge.utils import home
+from judge.views.comment import comment_hide
+
+
+class HomeWidgetTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.problem = create_problem(code='home_widget', is_public=True)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_cached(self):
+        for widget in (home.new_problems, home.public_contests, home.top_rated_users, home.top_contributors):
+            with self.subTest(widget=widget.__name__):
+                widget()
+                with self.assertNumQueries(0):
+                    widget()
+        for name in home.COUNTS:
+            with self.subTest(count=name):
+                home.home_count(name)
+                with self.assertNumQueries(0):
+                    home.home_count(name)
+
+    def test_invalidated_on_problem_change(self):
+        self.assertIn(self.problem, home.new_problems())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.problem.is_public = False
+            self.problem.save()
+        self.assertNotIn(self.problem, home.new_problems())
+        self.assertEqual(home.home_count('problems'), 0)
+
+    @mock.patch('judge.signals.on_new_comment')
+    def test_invalidated_on_comment_removal(self, on_new_comment):
+        author = create_user(username='home_commenter').profile
+        with self.captureOnCommitCallbacks(execute=True):
+            hidden = Comment.objects.create(author=author, page='p:home_widget', body='hidden')
+            deleted = Comment.objects.create(author=author, page='p:home_widget', body='deleted')
+        self.assertEqual({comment.id for comment in home.recent_comments()}, {hidden.id, deleted.id})
+
+        request = RequestFactory().post('/comments/hide', {'id': hidden.id})
+        request.user = create_user(username='home_moderator', is_superuser=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(comment_hide(request).status_code, 200)
+        self.assertEqual([comment.id for comment in home.recent_comments()], [deleted.id])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            deleted.delete()
+        self.assertEqual(home.recent_comments(), [])
@@ -0,0 +1,81 @@
+import unittest
+
+from judge.bridge.judge_list import JudgeAffinity, JudgeList
+from judge.judge_priority import DEFAULT_PRIORITY
+
+
+class FakeJudge:
+    def __init__(self, name):
+        self.name = name
+        self.tier = 1
+        self.is_disabled = False
+        self.load = 0
+        self._working = False
+        self.affinity = JudgeAffinity()
+        self.submitted = []
+
+    @property
+    def working(self):
+        return bool(self._working)
+
+    def get_current_submission(self):
+        return self._working or None
+
+    def can_judge(self, problem, executor, judge_id=None):
+        return (not judge_id and not self.is_disabled) or self.name == judge_id
+
+    def submit(self, id, problem, language, source, priority):
+        self._working = id
+        self.affinity.record(problem, language)
+        self.submitted.append(id)
+
+
+class JudgeAffinityTestCase(unittest.TestCase):
+    def test_lru(self):
+        affinity = JudgeAffinity()
+        affinity.problem_cache_size = 2
+        affinity.record('a', 'CPP20')
+        affinity.record('b', 'CPP20')
+        affinity.record('a', 'CPP20')
+        affinity.record('c', 'PY3')
+
+        self.assertTrue(affinity.is_warm('a'))
+        self.assertFalse(affinity.is_warm('b'))
+        self.assertEqual(affinity.score('c', 'PY3'), 2)
+        self.assertEqual(affinity.score('b', 'CPP20'), 1)
+        self.assertEqual(affinity.score('b', 'JAVA'), 0)
+
+
+class JudgeListAffinityTestCase(unittest.TestCase):
+    def setUp(self):
+        self.judges = JudgeList()
+        self.cold = FakeJudge('cold')
+        self.warm = FakeJudge('warm')
+        self.warm.affinity.record('aplusb', 'CPP20')
+        self.judges.register(self.cold)
+        self.judges.register(self.warm)
+
+    def test_prefers_warm_judge(self):
+        self.judges.judge(1, 'aplusb', 'PY3', '', None, DEFAULT_PRIORITY)
+        self.assertEqual(self.warm.submitted, [1])
+
+    def test_free_judge_prefers_warm_submission(self):
+        self.judges.judge(1, 'aplusb', 'CPP20', '', None, DEFAULT_PRIORITY)
+        self.judges.judge(2, 'helloworld', 'CPP20', '', None, DEFAULT_PRIORITY)
+        self.judges.judge(3, 'other', 'CPP20', '', None, DEFAULT_PRIORITY)
+        self.judges.judge(4, 'aplusb', 'CPP20', '', None, DEFAULT_PRIORITY)
+
+        self.judges.on_judge_free(self.warm, 1)
+        self.assertEqual(self.warm.submitted, [1, 4])
+
+    def test_skip_limit(self):
+        self.judges.affinity_max_skips = 1
+        self.judges.judge(1, 'aplusb', 'CPP20', '', None, DEFAULT_PRIORITY)
+        self.judges.judge(2, 'helloworld', 'CPP20', '', None, DEFAULT_PRIORITY)
+        self.judges.judge(3, 'other', 'CPP20', '', None, DEFAULT_PRIORITY)
+        self.judges.judge(4, 'aplusb', 'CPP20', '', None, DEFAULT_PRIORITY)
+        self.judges.judge(5, 'aplusb', 'CPP20', '', None, DEFAULT_PRIORITY)
+
+        self.judges.on_judge_free(self.warm, 1)
+        self.judges.on_judge_free(self.warm, 4)
+        self.assertEqual(self.warm.submitted, [1, 4, 3])
@@ -0,0 +1,75 @@
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+
+from judge.bridge.judge_handler import JudgeHandler
+from judge.models import Judge, Language, RuntimeVersion
+from judge.utils.judge_status import apply_judge_status, clear_judge_status, invalidate_runtimes, online_runtimes, \
+    publish_judge_status, runtime_versions
+from judge.views.api.api_v2 import APIJudgeList
+
+
+class JudgeStatusTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.online = Judge.objects.create(name='status_online', auth_key='key', online=True, ping=1, load=1)
+        cls.offline = Judge.objects.create(name='status_offline', auth_key='key', online=False, ping=1, load=1)
+        RuntimeVersion.objects.create(judge=cls.online, language=Language.get_python3(), name='python3',
+                                      version='3.11', priority=0)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_apply_status(self):
+        publish_judge_status(self.online.name, 0.5, 0.25)
+        publish_judge_status(self.offline.name, 0.5, 0.25)
+        online, offline = apply_judge_status(Judge.objects.filter(id__in=[self.online.id, self.offline.id])
+                                             .order_by('-online'))
+        self.assertEqual((online.ping, online.load), (0.5, 0.25))
+        self.assertEqual((offline.ping, offline.load), (1, 1))
+
+        clear_judge_status(self.online.name)
+        online, = apply_judge_status(Judge.objects.filter(id=self.online.id))
+        self.assertEqual((online.ping, online.load), (1, 1))
+
+    def test_api_judge_list(self):
+        other = Judge.objects.create(name='status_other', auth_key='key', online=True, ping=1, load=1)
+        publish_judge_status(self.online.name, 0.5, 0.25)
+        publish_judge_status(other.name, 0.75, 0.5)
+        with mock.patch.object(cache, 'get_many', wraps=cache.get_many) as get_many:
+            response = APIJudgeList.as_view()(RequestFactory().get('/api/v2/judges'))
+        self.assertEqual(get_many.call_count, 1)
+        judges = {judge['name']: judge for judge in json.loads(response.content)['data']['objects']}
+        self.assertEqual((judges[self.online.name]['ping'], judges[self.online.name]['load']), (500, 0.25))
+        self.assertEqual((judges[other.name]['ping'], judges[other.name]['load']), (750, 0.5))
+
+    def test_runtimes_cached(self):
+        self.assertIn(self.online.name, runtime_versions())
+        self.assertEqual([runtime.judge.name for runtime in online_runtimes()], [self.online.name])
+        with self.assertNumQueries(0):
+            runtime_versions()
+            online_runtimes()
+
+        Judge.objects.filter(id=self.online.id).update(online=False)
+        self.assertIn(self.online.name, runtime_versions())
+        invalidate_runtimes()
+        self.assertEqual(runtime_versions(), {})
+        self.assertEqual(online_runtimes(), [])
+
+    def test_ping_saved_periodically(self):
+        handler = JudgeHandler.__new__(JudgeHandler)
+        handler.name = self.online.name
+        handler._ping_saved = None
+
+        handler.latency, handler.load = 0.5, 0.25
+        handler._update_ping()
+        handler.latency, handler.load = 0.75, 0.5
+        with self.assertNumQueries(0):
+            handler._update_ping()
+
+        self.online.refresh_from_db()
+        self.assertEqual((self.online.ping, self.online.load), (0.5, 0.25))
+        online, = apply_judge_status([self.online])
+        self.assertEqual((online.ping, online.load), (0.75, 0.5))
@@ -0,0 +1,70 @@
+import unittest
+
+from django.test import TestCase
+
+from judge.bridge.judge_handler import JudgeHandler
+from judge.bridge.judge_list import JudgeList
+from judge.models import Judge, Language, RuntimeVersion
+from judge.models.tests.util import create_problem
+
+
+class JudgeSyncTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.judge = Judge.objects.create(name='sync_judge', auth_key='key')
+        cls.problems = [create_problem(code='sync_problem_%d' % i) for i in range(4)]
+
+    def setUp(self):
+        self.handler = JudgeHandler.__new__(JudgeHandler)
+        self.handler.name = self.judge.name
+        self.handler.judge = self.judge
+
+    def stored_problem_ids(self):
+        return set(self.judge.problems.values_list('id', flat=True))
+
+    def test_problems(self):
+        ids = [problem.id for problem in self.problems]
+        self.handler._sync_problem_ids(ids[:3])
+        self.assertEqual(self.stored_problem_ids(), set(ids[:3]))
+        rows = set(Judge.problems.through.objects.filter(judge=self.judge, problem_id__in=ids[1:3])
+                   .values_list('id', flat=True))
+
+        self.handler._sync_problem_ids(ids[1:])
+        self.assertEqual(self.stored_problem_ids(), set(ids[1:]))
+        # Rows for problems supported all along are left alone.
+        self.assertEqual(set(Judge.problems.through.objects.filter(judge=self.judge, problem_id__in=ids[1:3])
+                             .values_list('id', flat=True)), rows)
+
+        self.handler._change_problem_ids({ids[0], ids[1]}, {ids[3]})
+        self.assertEqual(self.stored_problem_ids(), set(ids[:3]))
+
+    def test_runtimes(self):
+        python3 = Language.get_python3()
+        self.handler.executors = {'PY3': [['python3', [3, 11]], ['pypy3', [7, 3]]]}
+        self.handler.update_runtimes()
+        stored = dict(RuntimeVersion.objects.filter(judge=self.judge).values_list('name', 'id'))
+        self.assertEqual(set(stored), {'python3', 'pypy3'})
+        self.assertEqual(list(self.judge.runtimes.all()), [python3])
+
+        self.handler.executors = {'PY3': [['python3', [3, 12]], ['pypy3', [7, 3]]]}
+        self.handler.update_runtimes()
+        updated = dict(RuntimeVersion.objects.filter(judge=self.judge).values_list('name', 'id'))
+        self.assertEqual(updated['pypy3'], stored['pypy3'])
+        self.assertNotEqual(updated['python3'], stored['python3'])
+        self.assertEqual(RuntimeVersion.objects.get(id=updated['python3']).version, '3.12')
+
+
+class FakeJudge:
+    def __init__(self, problems):
+        self.problems = problems
+
+
+class SharedProblemsTestCase(unittest.TestCase):
+    def test_share_problems(self):
+        judges = JudgeList()
+        first = FakeJudge(frozenset({'a', 'b'}))
+        judges.judges.add(first)
+
+        self.assertIs(judges.share_problems(frozenset({'b', 'a'})), first.problems)
+        other = frozenset({'a'})
+        self.assertIs(judges.share_problems(other), other)
@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from django.test import TestCase
+
+try:
+    import watchdog
+except ImportError:
+    watchdog = None
+
+
+class FakeJudgeList:
+    def __init__(self):
+        self.calls = []
+
+    def update_problems_all(self, **kwargs):
+        self.calls.append(kwargs)
+
+
+@unittest.skipIf(watchdog is None, 'watchdog is not installed')
+class MonitorTestCase(TestCase):
+    def setUp(self):
+        from judge.bridge.monitor import Monitor
+
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.judges = FakeJudgeList()
+        self.monitor = Monitor(self.judges, [os.path.join(self.root, '**', '')])
+
+    def make_problem(self, *path):
+        problem_dir = os.path.join(self.root, *path)
+        os.makedirs(problem_dir)
+        Path(problem_dir, 'init.yml').touch()
+        return problem_dir
+
+    def last_change(self):
+        call = self.judges.calls.pop()
+        return call['new_problems'], call['deleted_problems']
+
+    def test_match(self):
+        from judge.bridge.monitor import _match_parts
+
+        pattern = Path('/data/**/init.yml').parts
+        self.assertTrue(_match_parts(Path('/data/a/init.yml').parts, pattern))
+        self.assertTrue(_match_parts(Path('/data/group/a/init.yml').parts, pattern))
+        self.assertFalse(_match_parts(Path('/data/.git/a/init.yml').parts, pattern))
+        self.assertFalse(_match_parts(Path('/other/a/init.yml').parts, pattern))
+        self.assertFalse(_match_parts(Path('/data/group/a/init.yml').parts, Path('/data/*/init.yml').parts))
+
+    def test_incremental(self):
+        first = self.make_problem('first')
+        self.make_problem('group', 'second')
+        self.monitor.update_supported_problems()
+        self.assertEqual(self.last_change(), ({'first', 'second'}, set()))
+
+        third = self.make_problem('third')
+        self.monitor.update_problem_paths({third, os.path.join(third, 'init.yml')})
+        self.assertEqual(self.last_change(), ({'third'}, set()))
+
+        Path(first, 'tests.zip').touch()
+        self.monitor.update_problem_paths({os.path.join(first, 'tests.zip')})
+        self.assertEqual(self.judges.calls, [])
+
+        shutil.rmtree(os.path.join(self.root, 'group'))
+        self.monitor.update_problem_paths({os.path.join(self.root, 'group')})
+        self.assertEqual(self.last_change(), (set(), {'second'}))
+
+        outside = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, outside, True)
+        os.makedirs(os.path.join(outside, 'moved', 'fourth'))
+        Path(outside, 'moved', 'fourth', 'init.yml').touch()
+        os.rename(os.path.join(outside, 'moved'), os.path.join(self.root, 'moved'))
+        self.monitor.update_problem_paths({os.path.join(self.root, 'moved')})
+        self.assertEqual(self.last_change(), ({'fourth'}, set()))
+
+        self.assertEqual(set(self.monitor.problems), {'first', 'third', 'fourth'})
+        self.monitor.update_supported_problems()
+        self.assertEqual(self.judges.calls, [])
@@ -0,0 +1,39 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from judge.models import Language, Problem, Submission, SubmissionSource
+from judge.models.tests.util import create_problem, create_user
+from judge.tasks.problem import GARBAGE_COLLECTOR_CHECKPOINT, problem_garbage_collect
+
+
+@override_settings(VNOJ_PROBLEM_GARBAGE_COLLECTOR_CHUNK_SIZE=2)
+class ProblemGarbageCollectTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        profile = create_user(username='garbage_collect').profile
+        cls.expired = create_problem(code='garbage_expired')
+        cls.kept = create_problem(code='garbage_kept')
+        for problem in (cls.expired, cls.kept):
+            for _ in range(5):
+                submission = Submission.objects.create(user=profile, problem=problem,
+                                                       language=Language.get_python3())
+                SubmissionSource.objects.create(submission=submission, source='')
+        Problem.objects.filter(id=cls.expired.id).update(deleted_at=timezone.now() - timedelta(days=30))
+
+    def setUp(self):
+        cache.delete(GARBAGE_COLLECTOR_CHECKPOINT)
+
+    def test_collect(self):
+        self.assertGreater(problem_garbage_collect(), 10)
+        self.assertFalse(Problem.objects.filter(id=self.expired.id).exists())
+        self.assertFalse(Submission.objects.filter(problem_id=self.expired.id).exists())
+        self.assertEqual(Submission.objects.filter(problem=self.kept).count(), 5)
+        self.assertIsNone(cache.get(GARBAGE_COLLECTOR_CHECKPOINT))
+
+    @override_settings(VNOJ_PROBLEM_GARBAGE_COLLECTOR_TIME_LIMIT=timedelta(0))
+    def test_time_limit(self):
+        self.assertEqual(problem_garbage_collect(), 0)
+        self.assertTrue(Problem.objects.filter(id=self.expired.id).exists())
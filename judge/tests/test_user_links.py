@@ -0,0 +1,28 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from judge.jinja2 import reference
+from judge.models import Profile
+from judge.utils.user_links import invalidate_user_links
+
+
+class UserLinkStoreTestCase(TestCase):
+    def setUp(self):
+        reference.UserLinkStore.fragments.clear()
+        self.users = [Profile(id=id, user=User(id=id, username='link%d' % id), display_rank='user')
+                      for id in range(1, 4)]
+
+    def test_reused_until_invalidated(self):
+        with mock.patch.object(reference, 'link_user', wraps=reference.link_user) as link_user:
+            links = reference.user_links(self.users)
+            self.assertEqual(set(links), {1, 2, 3})
+            self.assertIn('link1', links[1])
+            reference.user_links(self.users)
+            self.assertEqual(link_user.call_count, 3)
+
+            with self.captureOnCommitCallbacks(execute=True):
+                invalidate_user_links()
+            reference.user_links(self.users)
+            self.assertEqual(link_user.call_count, 6)
@@ -0,0 +1,36 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from judge.models.tests.util import create_user
+from judge.utils.user_reference import collect_user_references, get_user_info, rereference, user_reference_scope
+
+
+class UserReferenceTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = create_user(username='ref_alice').profile
+        cls.bob = create_user(username='ref_bob').profile
+
+    def setUp(self):
+        cache.clear()
+
+    def test_page_resolved_at_once(self):
+        with user_reference_scope():
+            collect_user_references(['hi [user:ref_alice]', None, 'and [ruser:ref_bob] and [user:ref_nobody]'])
+            with self.assertNumQueries(1):
+                self.assertEqual(set(get_user_info(['ref_alice'])), {'ref_alice'})
+            with self.assertNumQueries(0):
+                self.assertEqual(set(get_user_info(['ref_bob', 'ref_nobody'])), {'ref_bob'})
+
+    def test_shared_cache(self):
+        get_user_info(['ref_alice', 'ref_nobody'])
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_info(['ref_alice', 'ref_nobody']), {'ref_alice': ('user', None)})
+
+        self.alice.display_rank = 'setter'
+        self.alice.save()
+        self.assertEqual(get_user_info(['ref_alice']), {'ref_alice': ('setter', None)})
+
+    def test_long_names_ignored(self):
+        self.assertEqual(rereference.findall('[user:%s]' % ('a' * 150)), [('user', 'a' * 150)])
+        self.assertEqual(rereference.findall('[user:%s]' % ('a' * 151)), [])
@@ -1,26 +1,73 @@
+import time
+
 from celery.result import AsyncResult
+from django.conf import settings
 from django.http import HttpResponseRedirect
 from django.urls import reverse
 from django.utils.http import urlencode
 
 
 class Progress:
-    def __init__(self, task, total, stage=None):
+    """
+    Reports the progress of a task to its result backend.
+
+    Updates are coalesced: the state is written at most once every `interval` seconds, unless progress has moved by
+    at least `step` percent of the total since the last write. Changes to the total and leaving the context always
+    write immediately, so the final state is never lost. Every write includes the rate so far, in items per second,
+    and the estimated time remaining.
+    """
+
+    def __init__(self, task, total, stage=None, interval=None, step=None):
         self.task = task
         self._total = total
         self._done = 0
         self._stage = stage
+        self._interval = settings.VNOJ_TASK_PROGRESS_INTERVAL if interval is None else interval
+        self._step = settings.VNOJ_TASK_PROGRESS_STEP if step is None else step
+        self._start_time = time.monotonic()
+        self._last_update = None
+        self._last_done = 0
+
+    def _rate(self, now):
+        elapsed = now - self._start_time
+        return self._done / elapsed if elapsed > 0 else 0.0
+
+    def _eta(self, now):
+        rate = self._rate(now)
+        if not rate:
+            return None
+        return max(self._total - self._done, 0) / rate
+
+    @property
+    def rate(self):
+        return self._rate(time.monotonic())
 
-    def _update_state(self):
+    @property
+    def eta(self):
+        return self._eta(time.monotonic())
+
+    def _update_state(self, force=False):
+        now = time.monotonic()
+        if not force and self._last_update is not None and now - self._last_update < self._interval and \
+                abs(self._done - self._last_done) * 100 < self._step * self._total:
+            return
+
+        self._last_update = now
+        self._last_done = self._done
         self.task.update_state(
             state='PROGRESS',
             meta={
                 'done': self._done,
                 'total': self._total,
                 'stage': self._stage,
+                'rate': self._rate(now),
+                'eta': self._eta(now),
             },
         )
 
+    def flush(self):
+        self._update_state(force=True)
+
     @property
     def done(self):
         return self._done
@@ -38,7 +85,7 @@ class Progress:
     def total(self, value):
         self._total = value
         self._done = min(self._done, value)
-        self._update_state()
+        self._update_state(force=True)
 
     def did(self, delta):
         self._done += delta
@@ -49,7 +96,8 @@ class Progress:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         if exc_type is None:
-            self.done = self._total
+            self._done = self._total
+            self.flush()
 
 
 def task_status_url_by_id(result_id, message=None, redirect=None):
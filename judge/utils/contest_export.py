@@ -0,0 +1,193 @@
+import fnmatch
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+from multiprocessing import get_context
+
+from django import db
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.utils.functional import cached_property
+
+from judge.models import ContestParticipation, ContestSubmission, Problem, SubmissionSource
+from judge.utils.iterator import chunk
+
+__all__ = ['ContestDataExport', 'DirectoryWriter', 'ZipWriter', 'contest_submissions']
+
+rewildcard = re.compile(r'\*+')
+
+
+def contest_submissions(contest, results=None, problem_glob='*'):
+    queryset = ContestSubmission.objects.filter(participation__contest=contest,
+                                                participation__virtual=ContestParticipation.LIVE)
+    if results:
+        queryset = queryset.filter(submission__result__in=results)
+
+    # Compress wildcards to avoid exponential complexity on certain glob patterns before Python 3.9.
+    # For details, see <https://bugs.python.org/issue40480>.
+    problem_glob = rewildcard.sub('*', problem_glob)
+    if problem_glob != '*':
+        queryset = queryset.filter(
+            problem__problem__in=Problem.objects.filter(code__regex=fnmatch.translate(problem_glob)),
+        )
+    return queryset
+
+
+class DirectoryWriter:
+    def __init__(self, root):
+        self.root = root
+
+    def _prepare(self, path):
+        path = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+    def write_source(self, path, source):
+        with open(self._prepare(path), 'w') as f:
+            f.write(source)
+
+    def write_file(self, path, disk_path):
+        shutil.copyfile(disk_path, self._prepare(path))
+
+    def merge(self, shard):
+        # Shards write straight into the same directory, since their paths never collide.
+        pass
+
+    def shard_writer(self, shard, temp_dir):
+        return DirectoryWriter(self.root)
+
+    def close(self):
+        pass
+
+
+class ZipWriter:
+    def __init__(self, path):
+        self.path = path
+
+    @cached_property
+    def file(self):
+        # Opened on first use, so that unopened shard writers can be sent to pool workers.
+        return zipfile.ZipFile(self.path, mode='w')
+
+    def write_source(self, path, source):
+        self.file.writestr(path, source)
+
+    def write_file(self, path, disk_path):
+        self.file.write(disk_path, path)
+
+    def merge(self, shard):
+        with zipfile.ZipFile(shard.path) as source:
+            for info in source.infolist():
+                with source.open(info) as src, self.file.open(info, 'w') as dst:
+                    shutil.copyfileobj(src, dst)
+        os.unlink(shard.path)
+
+    def shard_writer(self, shard, temp_dir):
+        return ZipWriter(os.path.join(temp_dir, '%s.zip' % shard))
+
+    def close(self):
+        self.file.close()
+
+
+def _export_shard(args):
+    # Only the export's arguments are sent to the worker, which builds its own queryset: pickling a queryset would
+    # evaluate it in the parent.
+    export_args, shard, writer = args
+    try:
+        return ContestDataExport(**export_args).export_to(writer, shard)
+    finally:
+        writer.close()
+        db.connections.close_all()
+
+
+class ContestDataExport:
+    """
+    Writes the sources of the live submissions to a contest, optionally restricted to some results and to problems
+    matching a glob, as `<user>/<problem>.<ext>`, with every other
+    submission to the same problem under `<user>/$History/<problem>_<id>.<ext>`. The first submission in `ordering`
+    gets the main path.
+
+    Rows are streamed, and sources are only loaded `chunk_size` at a time, so memory use does not grow with the
+    size of the contest. The work can be sharded by problem across a process pool.
+    """
+
+    fields = ('submission__id', 'submission__user__user__id', 'submission__user__user__username',
+              'problem__problem__code', 'submission__language__extension', 'submission__language__file_only')
+
+    def __init__(self, contest_id, results=None, problem_glob='*', ordering=('-points', 'id'), chunk_size=500):
+        self.contest_id = contest_id
+        self.results = results
+        self.problem_glob = problem_glob
+        self.ordering = ordering
+        self.chunk_size = chunk_size
+
+    @property
+    def queryset(self):
+        return contest_submissions(self.contest_id, self.results, self.problem_glob)
+
+    def get_args(self):
+        return {'contest_id': self.contest_id, 'results': self.results, 'problem_glob': self.problem_glob,
+                'ordering': self.ordering, 'chunk_size': self.chunk_size}
+
+    def count(self):
+        return self.queryset.count()
+
+    def shards(self):
+        return list(self.queryset.order_by().values_list('problem__problem__code', flat=True).distinct())
+
+    def export_to(self, writer, shard=None, progress=None):
+        queryset = self.queryset
+        if shard is not None:
+            queryset = queryset.filter(problem__problem__code=shard)
+        rows = queryset.order_by(*self.ordering).values_list(*self.fields).iterator(chunk_size=self.chunk_size)
+
+        exported = set()
+        count = 0
+        for batch in chunk(rows, self.chunk_size):
+            sources = dict(SubmissionSource.objects.filter(submission_id__in=[row[0] for row in batch])
+                           .values_list('submission_id', 'source'))
+            for sub_id, user_id, username, problem, ext, file_only in batch:
+                source = sources.get(sub_id)
+                if source is None:
+                    continue
+
+                if (user_id, problem) in exported:
+                    path = os.path.join(username, '$History', f'{problem}_{sub_id}.{ext}')
+                else:
+                    path = os.path.join(username, f'{problem}.{ext}')
+                    exported.add((user_id, problem))
+
+                if file_only:
+                    # Get the basename of the source as it is an URL
+                    filename = os.path.basename(source)
+                    writer.write_file(path, default_storage.path(os.path.join(
+                        settings.SUBMISSION_FILE_UPLOAD_MEDIA_DIR, problem, str(user_id), filename,
+                    )))
+                else:
+                    writer.write_source(path, source)
+            count += len(batch)
+            if progress is not None:
+                progress(len(batch))
+        return count
+
+    def export_parallel(self, writer, workers, progress=None):
+        shards = self.shards()
+        if workers <= 1 or len(shards) <= 1:
+            return self.export_to(writer, progress=progress)
+
+        # Forked workers must not share the parent's database connections.
+        db.connections.close_all()
+        count = 0
+        with tempfile.TemporaryDirectory() as temp_dir:
+            shard_writers = {shard: writer.shard_writer(index, temp_dir) for index, shard in enumerate(shards)}
+            with get_context('fork').Pool(workers) as pool:
+                export_args = self.get_args()
+                tasks = [(export_args, shard, shard_writer) for shard, shard_writer in shard_writers.items()]
+                for (_, _, shard_writer), shard_count in zip(tasks, pool.imap(_export_shard, tasks)):
+                    writer.merge(shard_writer)
+                    count += shard_count
+                    if progress is not None:
+                        progress(shard_count)
+        return count
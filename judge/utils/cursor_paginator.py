@@ -0,0 +1,79 @@
+import base64
+import binascii
+import collections.abc
+
+from django.utils.functional import cached_property
+
+
+def encode_cursor(value):
+    return base64.urlsafe_b64encode(str(value).encode('ascii')).rstrip(b'=').decode('ascii')
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor. An empty cursor means "from the beginning" and decodes to None.
+
+    Raises ValueError on malformed cursors.
+    """
+    if not cursor:
+        return None
+    try:
+        return int(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('ascii'))
+    except (TypeError, UnicodeDecodeError, binascii.Error):
+        raise ValueError('invalid cursor')
+
+
+class CursorPaginator:
+    is_infinite = True
+    is_cursor = True
+
+    def __init__(self, per_page):
+        self.per_page = per_page
+
+
+class CursorPage(collections.abc.Sequence):
+    """
+    A page fetched with keyset pagination: `field > after ORDER BY field LIMIT per_page + 1`.
+
+    Unlike offset pagination, every page costs an indexed range scan, and no count query is ever run. The
+    extra row fetched is only used to tell whether there is a next page.
+    """
+
+    def __init__(self, object_list, per_page, field, paginator):
+        object_list = list(object_list)
+        self.has_more = len(object_list) > per_page
+        self.object_list = object_list[:per_page]
+        self.field = field
+        self.paginator = paginator
+
+    def __repr__(self):
+        return '<Page after cursor>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.has_more
+
+    def has_previous(self):
+        return False
+
+    def has_other_pages(self):
+        return self.has_more
+
+    @cached_property
+    def next_cursor(self):
+        if not self.has_more:
+            return None
+        return encode_cursor(getattr(self.object_list[-1], self.field))
+
+
+def cursor_paginate(queryset, after, per_page, field='id'):
+    if after is not None:
+        queryset = queryset.filter(**{field + '__gt': after})
+    queryset = queryset.order_by(field)[:per_page + 1]
+    paginator = CursorPaginator(per_page)
+    return paginator, CursorPage(queryset, per_page, field, paginator)
@@ -0,0 +1,89 @@
+import threading
+from contextlib import contextmanager
+
+from django.core.cache import cache
+
+from judge.models import Contest, ContestParticipation, ContestResultCount, Problem, Profile, Submission
+from judge.utils.iterator import chunk
+
+__all__ = ['bulk_deletion', 'current_bulk_deletion']
+
+_local = threading.local()
+
+
+class BulkDeletion:
+    """
+    Collects what the submission deletion receivers would have recomputed for every deleted row, so that each
+    affected user, problem and participation is recomputed only once.
+    """
+
+    def __init__(self, recompute=True):
+        self.recompute = recompute
+        self.users = set()
+        self.problems = set()
+        self.participations = set()
+        self.contest_submissions = set()
+        self.contests = set()
+
+    def submission_deleted(self, submission):
+        self.users.add(submission.user_id)
+        self.problems.add(submission.problem_id)
+        if submission.contest_object_id is not None:
+            self.contests.add(submission.contest_object_id)
+
+    def contest_submission_deleted(self, contest_submission):
+        self.participations.add(contest_submission.participation_id)
+        self.contest_submissions.add(contest_submission.submission_id)
+
+    def finish(self):
+        if not self.recompute:
+            return
+
+        for ids in chunk(self.contest_submissions, 1000):
+            submissions = Submission.objects.filter(id__in=ids)
+            self.contests.update(submissions.exclude(contest_object=None).values_list('contest_object_id', flat=True))
+            submissions.update(contest_object=None)
+
+        # Objects deleted along with the submissions need no recomputation.
+        for profile in Profile.objects.filter(id__in=self.users):
+            profile._updating_stats_only = True
+            profile.calculate_points()
+        for problem in Problem.objects.filter(id__in=self.problems):
+            problem._updating_stats_only = True
+            problem.update_stats()
+        for participation in ContestParticipation.objects.filter(id__in=self.participations):
+            participation.recompute_results()
+        for contest in Contest.objects.filter(id__in=self.contests):
+            ContestResultCount.rebuild(contest)
+
+        keys = []
+        for user_id in self.users:
+            keys += ['user_complete:%d' % user_id, 'user_attempted:%s' % user_id]
+        for participation_id in self.participations:
+            keys += ['contest_complete:%d' % participation_id, 'contest_attempted:%d' % participation_id]
+        cache.delete_many(keys)
+
+
+def current_bulk_deletion():
+    return getattr(_local, 'deletion', None)
+
+
+@contextmanager
+def bulk_deletion(recompute=True):
+    """
+    Within this context, deleting submissions and contest submissions in the current thread does not recompute user
+    points, problem statistics or contest results per row. Instead, everything affected is recomputed once when the
+    context exits without an exception. With recompute=False, nothing is recomputed at all.
+
+    Nested contexts share the outermost one.
+    """
+    if current_bulk_deletion() is not None:
+        yield current_bulk_deletion()
+        return
+
+    deletion = _local.deletion = BulkDeletion(recompute)
+    try:
+        yield deletion
+    finally:
+        _local.deletion = None
+    deletion.finish()
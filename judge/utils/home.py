@@ -0,0 +1,80 @@
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from judge.models import Comment, Contest, Language, Problem, Profile, Submission
+
+__all__ = ['home_count', 'invalidate_home', 'new_problems', 'public_contests', 'recent_comments',
+           'top_contributors', 'top_rated_users']
+
+
+def _cached(name, compute):
+    key = 'home:%s' % name
+    result = cache.get(key)
+    if result is None:
+        result = compute()
+        cache.set(key, result, settings.VNOJ_HOMEPAGE_CACHE_TIMEOUT)
+    return result
+
+
+def invalidate_home(*names):
+    # Deferred until commit, so that nobody can repopulate a widget with data from before this transaction.
+    keys = ['home:%s' % name for name in names]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def recent_comments(n=10):
+    """Comment stream as seen by an anonymous user."""
+    return _cached('comments', lambda: list(Comment.most_recent(AnonymousUser(), n)))
+
+
+def new_problems():
+    return _cached('new_problems', lambda: list(
+        Problem.get_public_problems().order_by('-date', 'code')[:settings.DMOJ_BLOG_NEW_PROBLEM_COUNT],
+    ))
+
+
+def public_contests():
+    """Visible contests that an anonymous user can see and that have not ended, ordered by start time."""
+    return _cached('contests', lambda: list(
+        Contest.get_visible_contests(AnonymousUser()).filter(is_visible=True, end_time__gt=timezone.now())
+               .order_by('start_time'),
+    ))
+
+
+def top_rated_users():
+    return _cached('top_rated', lambda: list(
+        Profile.objects.filter(rating__isnull=False, is_unlisted=False)
+               .order_by('-rating')
+               .only('user', 'rating', 'display_rank', 'display_badge', 'username_display_override')
+               .select_related('user', 'display_badge')[:settings.VNOJ_HOMEPAGE_TOP_USERS_COUNT],
+    ))
+
+
+def top_contributors():
+    return _cached('top_contrib', lambda: list(
+        Profile.objects.order_by('-contribution_points')
+               .filter(contribution_points__gt=0, is_unlisted=False)
+               .only('user', 'contribution_points', 'display_rank', 'display_badge', 'rating',
+                     'username_display_override')
+               .select_related('user', 'display_badge')[:settings.VNOJ_HOMEPAGE_TOP_USERS_COUNT],
+    ))
+
+
+COUNTS = {
+    'users': lambda: Profile.objects.count(),
+    'problems': lambda: Problem.get_public_problems().count(),
+    'submissions': lambda: Submission.objects.aggregate(max_id=Max('id'))['max_id'] or 0,
+    'languages': lambda: Language.objects.count(),
+}
+
+
+def home_count(name):
+    return _cached('count:%s' % name, COUNTS[name])
+
+
+WIDGETS = ('comments', 'new_problems', 'contests', 'top_rated', 'top_contrib') + \
+    tuple('count:%s' % name for name in COUNTS)
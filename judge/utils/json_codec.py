@@ -0,0 +1,121 @@
+import json
+import logging
+
+from django.conf import settings
+
+__all__ = ['name', 'dumps', 'dumpb', 'loads', 'LazyJSON', 'get_codec']
+
+logger = logging.getLogger('judge.utils.json_codec')
+
+
+class JSONCodec:
+    name = None
+
+    def dumps(self, obj):
+        """Serialize obj to a compact str."""
+        raise NotImplementedError()
+
+    def dumpb(self, obj):
+        """Serialize obj to compact UTF-8 encoded bytes."""
+        return self.dumps(obj).encode('utf-8')
+
+    def loads(self, data):
+        """Deserialize a str or UTF-8 encoded bytes."""
+        raise NotImplementedError()
+
+
+class StdlibCodec(JSONCodec):
+    name = 'json'
+
+    def __init__(self):
+        self._encoder = json.JSONEncoder(separators=(',', ':'))
+        self._decoder = json.JSONDecoder()
+
+    def dumps(self, obj):
+        return self._encoder.encode(obj)
+
+    def loads(self, data):
+        if isinstance(data, (bytes, bytearray)):
+            data = data.decode('utf-8')
+        return self._decoder.decode(data)
+
+
+class UJSONCodec(JSONCodec):
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson
+        self._ujson = ujson
+
+    def dumps(self, obj):
+        return self._ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False)
+
+    def loads(self, data):
+        return self._ujson.loads(data)
+
+
+class ORJSONCodec(JSONCodec):
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj):
+        return self._orjson.dumps(obj, option=self._options).decode('utf-8')
+
+    def dumpb(self, obj):
+        return self._orjson.dumps(obj, option=self._options)
+
+    def loads(self, data):
+        return self._orjson.loads(data)
+
+
+CODECS = {codec.name: codec for codec in (ORJSONCodec, UJSONCodec, StdlibCodec)}
+
+
+def get_codec(name=None):
+    """
+    Return an instance of the named codec. If name is None, return the fastest
+    codec that is installed, falling back to the standard library.
+    """
+    if name is not None:
+        return CODECS[name]()
+
+    for codec in CODECS.values():
+        try:
+            return codec()
+        except ImportError:
+            pass
+    raise AssertionError('stdlib json codec should always be available')
+
+
+_codec = get_codec(getattr(settings, 'JSON_CODEC', None))
+logger.debug('Using JSON codec: %s', _codec.name)
+
+name = _codec.name
+dumps = _codec.dumps
+dumpb = _codec.dumpb
+loads = _codec.loads
+
+
+class LazyJSON:
+    """
+    Defers building and serializing a JSON document until the object is
+    formatted, so that passing it to a disabled logger costs next to nothing.
+    """
+    __slots__ = ('_builder', '_args', '_kwargs', '_value')
+
+    def __init__(self, builder, *args, **kwargs):
+        self._builder = builder
+        self._args = args
+        self._kwargs = kwargs
+        self._value = None
+
+    def __str__(self):
+        if self._value is None:
+            self._value = dumps(self._builder(*self._args, **self._kwargs))
+        return self._value
+
+    __repr__ = __str__
@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from judge.models import Judge, RuntimeVersion
+
+__all__ = ['apply_judge_status', 'clear_judge_status', 'invalidate_runtimes', 'online_runtimes',
+           'publish_judge_status', 'runtime_versions']
+
+
+def _status_key(name):
+    return 'judge_status:%s' % name
+
+
+def publish_judge_status(name, ping, load):
+    cache.set(_status_key(name), (ping, load), settings.BRIDGED_JUDGE_STATUS_TIMEOUT)
+
+
+def clear_judge_status(name):
+    cache.delete(_status_key(name))
+
+
+def apply_judge_status(judges):
+    """
+    Returns judges as a list, with the ping and load of online judges replaced by the latest values reported to the
+    bridge. The database only holds values saved every BRIDGED_JUDGE_PING_SAVE_INTERVAL seconds.
+    """
+    judges = list(judges)
+    status = cache.get_many([_status_key(judge.name) for judge in judges if judge.online])
+    for judge in judges:
+        key = _status_key(judge.name)
+        if key in status:
+            judge.ping, judge.load = status[key]
+    return judges
+
+
+def _cached(key, compute):
+    result = cache.get(key)
+    if result is None:
+        result = compute()
+        cache.set(key, result, settings.VNOJ_JUDGE_RUNTIME_CACHE_TIMEOUT)
+    return result
+
+
+def runtime_versions():
+    """Cached Judge.runtime_versions()."""
+    return _cached('judge_status:runtime_versions', Judge.runtime_versions)
+
+
+def online_runtimes():
+    """Runtime versions of all online judges, ordered by priority."""
+    return _cached('judge_status:online_runtimes', lambda: list(
+        RuntimeVersion.objects.filter(judge__online=True).select_related('judge', 'language').order_by('priority'),
+    ))
+
+
+def invalidate_runtimes():
+    """Called by the bridge whenever a judge connects, disconnects or reports different runtimes."""
+    cache.delete_many(['judge_status:runtime_versions', 'judge_status:online_runtimes'])
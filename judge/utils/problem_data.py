@@ -7,6 +7,7 @@ import yaml
 from django.conf import settings
 from django.core.files.base import ContentFile
 from django.core.files.storage import FileSystemStorage
+from django.db import transaction
 from django.urls import reverse
 from django.utils.translation import gettext as _
 
@@ -111,9 +112,30 @@ class ProblemDataCompiler(object):
         self.problem = problem
         self.data = data
         self.cases = cases
-        self.files = files
+        # Membership is checked for every case, so don't scan the ZIP namelist each time.
+        self.files = frozenset(files)
 
         self.generator = data.generator
+        # Maps each modified case to the names of the fields that were changed.
+        self.dirty_cases = {}
+
+    def update_case(self, case, **values):
+        for field, value in values.items():
+            if getattr(case, field) != value:
+                setattr(case, field, value)
+                self.dirty_cases.setdefault(case, set()).add(field)
+
+    def save_cases(self):
+        from judge.models import ProblemTestCase
+
+        by_fields = {}
+        for case, fields in self.dirty_cases.items():
+            by_fields.setdefault(tuple(sorted(fields)), []).append(case)
+
+        with transaction.atomic():
+            for fields, cases in by_fields.items():
+                ProblemTestCase.objects.bulk_update(cases, fields, batch_size=1000)
+        self.dirty_cases = {}
 
     def make_init(self):
         # The judge server has an ability to find the testcase
@@ -122,9 +144,16 @@ class ProblemDataCompiler(object):
         # could contain a very large number of testcases
         # and that is not what we want. So in case of user
         # did not specify testcases, we will not create the init
-        if self.cases.count() == 0:
+        test_case_objects = list(self.cases)
+        if not test_case_objects:
             return {}
 
+        try:
+            return self._make_init(test_case_objects)
+        finally:
+            self.save_cases()
+
+    def _make_init(self, test_case_objects):
         cases = []
         batch = None
 
@@ -219,12 +248,12 @@ class ProblemDataCompiler(object):
                 return
 
         total_points = 0
-        for i, case in enumerate(self.cases, 1):
+        for i, case in enumerate(test_case_objects, 1):
             if case.type == 'C':
                 data = {}
                 if batch:
                     case.points = None
-                    case.is_pretest = batch['is_pretest']
+                    self.update_case(case, is_pretest=batch['is_pretest'])
                 else:
                     if case.points is None:
                         raise ProblemDataError(_('Points must be defined for non-batch case #%d.') % i)
@@ -254,8 +283,7 @@ class ProblemDataCompiler(object):
                 if case.checker:
                     data['checker'] = make_checker(case)
                 else:
-                    case.checker_args = ''
-                case.save(update_fields=('checker_args', 'is_pretest'))
+                    self.update_case(case, checker_args='')
                 (batch['batched'] if batch else cases).append(data)
             elif case.type == 'S':
                 if batch:
@@ -277,20 +305,13 @@ class ProblemDataCompiler(object):
                 if case.checker:
                     batch['checker'] = make_checker(case)
                 else:
-                    case.checker_args = ''
-                case.input_file = ''
-                case.output_file = ''
-                case.save(update_fields=('checker_args', 'input_file', 'output_file'))
+                    self.update_case(case, checker_args='')
+                self.update_case(case, input_file='', output_file='')
             elif case.type == 'E':
                 if not batch:
                     raise ProblemDataError(_('Attempt to end batch outside of one in case #%d.') % i)
-                case.is_pretest = batch['is_pretest']
-                case.input_file = ''
-                case.output_file = ''
-                case.generator_args = ''
-                case.checker = ''
-                case.checker_args = ''
-                case.save()
+                self.update_case(case, is_pretest=batch['is_pretest'], input_file='', output_file='',
+                                 generator_args='', checker='', checker_args='')
                 end_batch()
                 batch = None
         if total_points <= 0:
@@ -1,16 +1,24 @@
+import time
 from collections import defaultdict
 from math import e
 
 from django.core.cache import cache
-from django.db import transaction
-from django.db.models import Case, Count, ExpressionWrapper, F, When
+from django.db import connection, transaction
+from django.db.models import Case, Count, ExpressionWrapper, F, Q, When
 from django.db.models.fields import FloatField
 from django.utils import timezone
 from django.utils.translation import gettext_noop
 
-from judge.models import ContestSubmission, Problem, Submission, SubmissionTestCase
+from judge.models import Problem, Profile, Submission, SubmissionTestCase
+from judge.utils.deletion import bulk_deletion
 
-__all__ = ['contest_completed_ids', 'get_result_data', 'user_completed_ids', 'user_editable_ids', 'user_tester_ids']
+__all__ = ['contest_completed_ids', 'get_result_data', 'user_completed_ids', 'user_editable_ids', 'user_tester_ids',
+           'visible_problem_ids', 'filter_by_visible_problems', 'invalidate_visible_problems',
+           'invalidate_user_visible_problems']
+
+VISIBLE_PROBLEMS_TIMEOUT = 86400
+# Larger visible sets are filtered on with a subquery rather than an inlined list of ids.
+VISIBLE_PROBLEMS_INLINE_LIMIT = 1000
 
 
 def user_tester_ids(profile):
@@ -59,6 +67,117 @@ def user_attempted_ids(profile):
     return result
 
 
+def _visible_problems_version():
+    return cache.get_or_set('visible_problems:version', time.time_ns, None)
+
+
+def _bump_visible_problems_version():
+    cache.set('visible_problems:version', time.time_ns(), None)
+
+
+def invalidate_visible_problems():
+    # Bumped right away, so that this transaction no longer reads the old sets, and again on commit, so that nobody
+    # can keep sets computed from data before this transaction committed.
+    _bump_visible_problems_version()
+    transaction.on_commit(_bump_visible_problems_version)
+
+
+def _store_visibility(key, value):
+    # Sets computed inside a transaction may contain changes that are later rolled back.
+    if not connection.in_atomic_block:
+        cache.set(key, value, VISIBLE_PROBLEMS_TIMEOUT)
+
+
+def invalidate_user_visible_problems(profile_ids):
+    cache.delete_many(['visible_problems:profile:%d' % id for id in profile_ids])
+
+
+def _cached_problem_ids(version, name, queryset):
+    key = 'visible_problems:%s:%s' % (version, name)
+    result = cache.get(key)
+    if result is None:
+        result = frozenset(queryset.values_list('id', flat=True))
+        _store_visibility(key, result)
+    return result
+
+
+def _profile_visibility(version, profile):
+    # Organization membership and author/curator/tester status are the only per-user inputs to visibility.
+    key = 'visible_problems:profile:%d' % profile.id
+    result = cache.get(key)
+    if result is None or result[0] != version:
+        organization_ids = frozenset(Profile.organizations.through.objects.filter(profile=profile)
+                                     .values_list('organization_id', flat=True))
+        personal_ids = frozenset(Problem.available.filter(
+            Problem.q_add_author_curator_tester(Q(pk__in=[]), profile),
+        ).values_list('id', flat=True))
+        result = (version, organization_ids, personal_ids)
+        _store_visibility(key, result)
+    return result[1], result[2]
+
+
+def _sees_all_problems(user):
+    return user.is_authenticated and (
+        user.has_perm('judge.see_private_problem') or
+        (user.has_perm('judge.edit_own_problem') and user.has_perm('judge.edit_all_problem'))
+    )
+
+
+def visible_problem_ids(user):
+    """
+    Returns the set of ids of non-deleted problems visible to user, equivalent to Problem.get_visible_problems.
+
+    The set is assembled from cached per-permission-class sets (public, public in organization X, suggesting,
+    everything) plus the user's own authored, curated and tested problems, so that building it costs no queries
+    once warm. Any change to problem visibility invalidates every set at once.
+    """
+    version = _visible_problems_version()
+    public = Problem.get_public_problems()
+    if not user.is_authenticated:
+        return _cached_problem_ids(version, 'public', public)
+
+    edit_own_problem = user.has_perm('judge.edit_own_problem')
+    edit_public_problem = edit_own_problem and user.has_perm('judge.edit_public_problem')
+    edit_suggesting_problem = edit_own_problem and user.has_perm('judge.suggest_new_problem')
+
+    if _sees_all_problems(user):
+        return _cached_problem_ids(version, 'all', Problem.available.all())
+
+    organization_ids, personal_ids = _profile_visibility(version, user.profile)
+    if user.has_perm('judge.see_organization_problem') or edit_public_problem:
+        result = _cached_problem_ids(version, 'public_all', Problem.available.filter(is_public=True))
+    else:
+        result = _cached_problem_ids(version, 'public', public)
+        for organization_id in organization_ids:
+            result = result | _cached_problem_ids(
+                version, 'organization:%d' % organization_id,
+                Problem.available.filter(is_public=True, is_organization_private=True, organization=organization_id),
+            )
+
+    if edit_suggesting_problem:
+        result = result | _cached_problem_ids(
+            version, 'suggesting', Problem.available.filter(suggester__isnull=False, is_public=False),
+        )
+    return result | personal_ids
+
+
+def filter_by_visible_problems(queryset, user, field='problem'):
+    """
+    Restrict queryset to rows whose field references a problem visible to user.
+
+    Users who can see every problem only need deleted problems excluded. Otherwise, small visible sets are inlined
+    from the cache, and large ones, such as the public problems of a big site, are filtered on with a subquery.
+    """
+    if _sees_all_problems(user):
+        return queryset.filter(**{field + '__deleted_at__isnull': True})
+    visible = visible_problem_ids(user)
+    if not visible:
+        return queryset.none()
+    if len(visible) > VISIBLE_PROBLEMS_INLINE_LIMIT:
+        return queryset.filter(**{field + '__in': Problem.get_visible_problems(user).values('id')})
+    return queryset.filter(**{field + '__in': visible})
+
+
 def _get_result_data(results):
     return {
         'categories': [
@@ -128,14 +247,6 @@ def hot_problems(duration, limit):
 @transaction.atomic
 def fast_delete_problem(problem: Problem):
     # Deliberately skips point recalculation and contest result recomputation during cascade deletion.
-    from django.db.models.signals import post_delete
-    from judge.signals import contest_submission_delete, submission_delete
-
-    post_delete.disconnect(submission_delete, sender=Submission)
-    post_delete.disconnect(contest_submission_delete, sender=ContestSubmission)
-    try:
-        SubmissionTestCase.objects.filter(submission__problem=problem).delete()
-        problem.delete()
-    finally:
-        post_delete.connect(submission_delete, sender=Submission)
-        post_delete.connect(contest_submission_delete, sender=ContestSubmission)
+    with bulk_deletion(recompute=False):
+        deleted = SubmissionTestCase.objects.filter(submission__problem=problem).delete()[0]
+        return deleted + problem.delete()[0]
@@ -0,0 +1,46 @@
+import unittest
+from unittest import mock
+
+from judge.utils.celery import Progress
+
+
+class FakeTask:
+    def __init__(self):
+        self.states = []
+
+    def update_state(self, state, meta):
+        self.states.append(meta)
+
+
+class ProgressTestCase(unittest.TestCase):
+    def test_coalesce(self):
+        task = FakeTask()
+        with Progress(task, 1000, interval=60, step=10) as p:
+            for _ in range(1000):
+                p.did(1)
+        self.assertEqual([state['done'] for state in task.states], list(range(1, 1001, 100)) + [1000])
+
+    def test_interval(self):
+        task = FakeTask()
+        with mock.patch('judge.utils.celery.time.monotonic', side_effect=[0, 0, 0.5, 2]):
+            p = Progress(task, 100, interval=1, step=100)
+            p.did(1)
+            p.did(1)
+            p.did(1)
+        self.assertEqual([state['done'] for state in task.states], [1, 3])
+
+    def test_final_state(self):
+        task = FakeTask()
+        with Progress(task, 10, stage='Stage', interval=60, step=100) as p:
+            p.did(1)
+            p.did(1)
+        self.assertEqual(task.states[-1]['done'], 10)
+        self.assertEqual(task.states[-1]['stage'], 'Stage')
+
+    def test_rate_and_eta(self):
+        task = FakeTask()
+        with mock.patch('judge.utils.celery.time.monotonic', side_effect=[0, 10]):
+            p = Progress(task, 100, interval=0, step=0)
+            p.did(20)
+        self.assertEqual(task.states[-1]['rate'], 2)
+        self.assertEqual(task.states[-1]['eta'], 40)
@@ -0,0 +1,100 @@
+import os
+import pickle
+import tempfile
+import unittest
+import zipfile
+
+from django.test import TestCase
+
+from judge.models import ContestSubmission, Language, Submission, SubmissionSource
+from judge.models.tests.util import create_contest, create_contest_participation, create_contest_problem, \
+    create_problem, create_user
+from judge.utils.contest_export import ContestDataExport, DirectoryWriter, ZipWriter
+
+
+class ContestExportWriterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def test_directory(self):
+        writer = DirectoryWriter(self.temp_dir.name)
+        writer.write_source(os.path.join('alice', '$History', 'A_1.py'), 'print(1)')
+        writer.close()
+        with open(os.path.join(self.temp_dir.name, 'alice', '$History', 'A_1.py')) as f:
+            self.assertEqual(f.read(), 'print(1)')
+
+    def test_zip_merge(self):
+        writer = ZipWriter(os.path.join(self.temp_dir.name, 'data.zip'))
+        shards = [writer.shard_writer(index, self.temp_dir.name) for index in range(2)]
+        shards[0].write_source('alice/A.py', 'a')
+        shards[1].write_source('bob/B.cpp', 'b')
+        for shard in shards:
+            shard.close()
+            writer.merge(shard)
+            self.assertFalse(os.path.exists(shard.path))
+        writer.close()
+
+        with zipfile.ZipFile(writer.path) as data:
+            self.assertEqual(data.namelist(), ['alice/A.py', 'bob/B.cpp'])
+            self.assertEqual(data.read('bob/B.cpp'), b'b')
+
+
+class ContestDataExportTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.contest = create_contest(key='export')
+        cls.language = Language.get_python3()
+        cls.problems = {code: create_contest_problem(contest=cls.contest, problem=create_problem(code=code))
+                        for code in ('export_a', 'export_b')}
+        cls.submissions = {}
+        for username in ('export_alice', 'export_bob'):
+            profile = create_user(username=username).profile
+            participation = create_contest_participation(contest=cls.contest, user=profile)
+            for code, result, points in (('export_a', 'WA', 0), ('export_a', 'AC', 100), ('export_b', 'AC', 100)):
+                submission = Submission.objects.create(user=participation.user, problem=cls.problems[code].problem,
+                                                       language=cls.language, contest_object=cls.contest,
+                                                       result=result, status='D', points=points)
+                SubmissionSource.objects.create(submission=submission, source='%s %s' % (username, submission.id))
+                ContestSubmission.objects.create(submission=submission, problem=cls.problems[code],
+                                                 participation=participation, points=points)
+                cls.submissions.setdefault((username, code), []).append(submission)
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+
+    def export(self, **kwargs):
+        writer = ZipWriter(os.path.join(self.temp_dir.name, 'data.zip'))
+        export = ContestDataExport(self.contest.id, **kwargs)
+        count = export.export_to(writer)
+        writer.close()
+        with zipfile.ZipFile(writer.path) as data:
+            return count, {name: data.read(name).decode() for name in data.namelist()}
+
+    def test_layout(self):
+        ext = self.language.extension
+        count, files = self.export()
+        self.assertEqual(count, 6)
+
+        expected = {}
+        for username in ('export_alice', 'export_bob'):
+            wrong, accepted = self.submissions[username, 'export_a']
+            solved_b, = self.submissions[username, 'export_b']
+            # The submission with the most points gets the main path, the others go to the history.
+            expected['%s/export_a.%s' % (username, ext)] = '%s %s' % (username, accepted.id)
+            expected['%s/$History/export_a_%s.%s' % (username, wrong.id, ext)] = '%s %s' % (username, wrong.id)
+            expected['%s/export_b.%s' % (username, ext)] = '%s %s' % (username, solved_b.id)
+        self.assertEqual(files, expected)
+
+    def test_filters(self):
+        count, files = self.export(results=['AC'], problem_glob='export_a')
+        self.assertEqual(count, 2)
+        self.assertEqual(sorted(files), ['export_alice/export_a.%s' % self.language.extension,
+                                         'export_bob/export_a.%s' % self.language.extension])
+
+    def test_pickle_without_queries(self):
+        export = ContestDataExport(self.contest.id, results=['AC'])
+        with self.assertNumQueries(0):
+            pickle.dumps(export.get_args())
+            pickle.dumps(export)
@@ -0,0 +1,42 @@
+import unittest
+
+from judge.utils.json_codec import CODECS, LazyJSON, get_codec
+
+
+class JSONCodecTestCase(unittest.TestCase):
+    packet = {
+        'name': 'test-case-status',
+        'submission-id': 12,
+        'cases': [{'position': 1, 'status': 0, 'time': 0.5, 'output': 'đúng\n', 'feedback': None}],
+    }
+
+    def test_round_trip(self):
+        for name in CODECS:
+            try:
+                codec = get_codec(name)
+            except ImportError:
+                continue
+            with self.subTest(codec=name):
+                self.assertEqual(codec.loads(codec.dumps(self.packet)), self.packet)
+                self.assertEqual(codec.loads(codec.dumpb(self.packet)), self.packet)
+                self.assertIsInstance(codec.dumps(self.packet), str)
+                self.assertIsInstance(codec.dumpb(self.packet), bytes)
+
+    def test_default_codec(self):
+        self.assertIn(get_codec().name, CODECS)
+
+
+class LazyJSONTestCase(unittest.TestCase):
+    def test_lazy(self):
+        called_times = 0
+
+        def build(value):
+            nonlocal called_times
+            called_times += 1
+            return {'value': value}
+
+        log = LazyJSON(build, 1)
+        self.assertEqual(called_times, 0)
+        self.assertEqual(get_codec().loads(str(log)), {'value': 1})
+        self.assertEqual(get_codec().loads(str(log)), {'value': 1})
+        self.assertEqual(called_times, 1)
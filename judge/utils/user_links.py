@@ -0,0 +1,16 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+__all__ = ['invalidate_user_links', 'user_link_version']
+
+
+def user_link_version():
+    """Stamp of the current state of everything user links are rendered from."""
+    return cache.get_or_set('user_link:version', time.time_ns, None)
+
+
+def invalidate_user_links():
+    # Deferred until commit, so that nobody can store links rendered from before this transaction under the new stamp.
+    transaction.on_commit(lambda: cache.set('user_link:version', time.time_ns(), None))
@@ -0,0 +1,102 @@
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+from judge.models import Profile
+
+__all__ = ['collect_user_references', 'fetch_user_info', 'get_user_info', 'invalidate_user_info', 'rereference',
+           'user_reference_scope']
+
+# Usernames are at most 150 characters long, and longer names would make cache keys that memcached rejects.
+rereference = re.compile(r'\[(r?user):(\w{1,150})\]')
+
+_resolver = ContextVar('user_reference_resolver', default=None)
+
+
+def _user_info_key(username):
+    return 'user_ref:%s' % username
+
+
+def fetch_user_info(usernames):
+    """
+    Returns {username: (display rank, rating)} for the existing users among usernames, through a short-lived shared
+    cache. Users that do not exist are cached as well, so that references to them cost nothing either.
+    """
+    usernames = set(usernames)
+    if not usernames:
+        return {}
+
+    keys = {username: _user_info_key(username) for username in usernames}
+    cached = cache.get_many(keys.values())
+    result = {username: cached[key] for username, key in keys.items() if key in cached}
+
+    missing = usernames - result.keys()
+    if missing:
+        found = {name: (rank, rating) for name, rank, rating in
+                 Profile.objects.filter(user__username__in=missing)
+                        .values_list('user__username', 'display_rank', 'rating')}
+        fetched = {username: found.get(username, ()) for username in missing}
+        cache.set_many({keys[username]: info for username, info in fetched.items()},
+                       settings.VNOJ_USER_REFERENCE_CACHE_TIMEOUT)
+        result.update(fetched)
+
+    return {username: info for username, info in result.items() if info}
+
+
+def invalidate_user_info(usernames):
+    cache.delete_many([_user_info_key(username) for username in usernames])
+
+
+class UserReferenceResolver:
+    """
+    Resolves the users referenced on one page. Usernames collected in advance are resolved together with the first
+    lookup, and every username is resolved at most once.
+    """
+
+    def __init__(self):
+        self.pending = set()
+        self.resolved = {}
+
+    def collect(self, texts):
+        for text in texts:
+            if text:
+                self.pending.update(username for _, username in rereference.findall(text))
+        self.pending.difference_update(self.resolved)
+
+    def resolve(self, usernames):
+        self.pending.update(username for username in usernames if username not in self.resolved)
+        if self.pending:
+            info = fetch_user_info(self.pending)
+            self.resolved.update({username: info.get(username) for username in self.pending})
+            self.pending = set()
+        return {username: self.resolved[username] for username in usernames if self.resolved[username]}
+
+
+@contextmanager
+def user_reference_scope():
+    """All user references rendered within this context share one resolver."""
+    token = _resolver.set(UserReferenceResolver())
+    try:
+        yield _resolver.get()
+    finally:
+        _resolver.reset(token)
+
+
+def collect_user_references(texts):
+    """
+    Registers texts that are about to be rendered with the reference filter, so that all users they reference are
+    fetched at once. Does nothing outside of a user_reference_scope.
+    """
+    resolver = _resolver.get()
+    if resolver is not None:
+        resolver.collect(texts)
+
+
+def get_user_info(usernames):
+    resolver = _resolver.get()
+    if resolver is None:
+        return fetch_user_info(usernames)
+    return resolver.resolve(usernames)
@@ -1,7 +1,9 @@
+from django.db import transaction
 from django.shortcuts import render
 from django.views.generic import FormView
 from django.views.generic.detail import SingleObjectMixin
 
+from judge.utils.deletion import bulk_deletion
 from judge.utils.diggpaginator import DiggPaginator
 
 
@@ -44,6 +46,17 @@ class NoBatchDeleteMixin(object):
         return actions
 
 
+class BulkDeletionMixin(object):
+    # Deletions that cascade to submissions recompute every affected user, problem and participation only once.
+    def delete_model(self, request, obj):
+        with transaction.atomic(), bulk_deletion():
+            super(BulkDeletionMixin, self).delete_model(request, obj)
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic(), bulk_deletion():
+            super(BulkDeletionMixin, self).delete_queryset(request, queryset)
+
+
 class TitleMixin(object):
     title = '(untitled)'
     content_title = None
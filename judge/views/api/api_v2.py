@@ -1,9 +1,12 @@
-from operator import attrgetter
+import csv
+from datetime import datetime, timedelta
+from operator import attrgetter, itemgetter
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist, PermissionDenied, ValidationError
 from django.db.models import Count, F, OuterRef, Prefetch, Q, Subquery
-from django.http import Http404, JsonResponse
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
 from django.utils.functional import cached_property
@@ -11,11 +14,15 @@ from django.views.generic.detail import BaseDetailView
 from django.views.generic.list import BaseListView
 
 from judge.models import (
-    Contest, ContestParticipation, ContestTag, Judge, Language, Organization, Problem, ProblemType, Profile, Rating,
-    Submission,
+    Contest, ContestChange, ContestParticipation, ContestTag, Judge, Language, Organization, Problem, ProblemType,
+    Profile, Rating, Submission,
 )
+from judge.utils import json_codec
+from judge.utils.cursor_paginator import cursor_paginate, decode_cursor
 from judge.utils.infinite_paginator import InfinitePaginationMixin
-from judge.utils.raw_sql import join_sql_subquery, use_straight_join
+from judge.utils.judge_status import apply_judge_status
+from judge.utils.problems import filter_by_visible_problems
+from judge.utils.raw_sql import use_straight_join
 from judge.views.submission import group_test_cases
 
 
@@ -85,6 +92,23 @@ class APIKeyRequiredMixin:
         super().setup_api(request, *args, **kwargs)
 
 
+class APIRateLimitedException(Exception):
+    pass
+
+
+class EchoBuffer:
+    def write(self, value):
+        return value
+
+
+def export_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    return value
+
+
 class APIMixin:
     @cached_property
     def _now(self):
@@ -115,6 +139,7 @@ class APIMixin:
             PermissionDenied: (403, 'permission denied'),
             APILoginRequiredException: (403, 'login required'),
             APIKeyRequiredException: (403, 'api key required'),
+            APIRateLimitedException: (429, 'too many requests'),
             Http404: (404, 'page/object not found'),
         }
         exception_type = type(exception)
@@ -151,14 +176,102 @@ class APIListView(APIMixin, InfinitePaginationMixin, BaseListView):
     paginate_by = settings.DMOJ_API_PAGE_SIZE
     basic_filters = ()
     list_filters = ()
+    cursor_kwarg = 'after'
+    cursor_field = 'id'
 
     @property
     def use_infinite_pagination(self):
         return False
 
+    @property
+    def use_cursor_pagination(self):
+        return self.cursor_kwarg in self.request.GET
+
+    def paginate_queryset(self, queryset, page_size):
+        if not self.use_cursor_pagination:
+            return super().paginate_queryset(queryset, page_size)
+
+        # May raise ValueError, but is caught in APIMixin
+        after = decode_cursor(self.request.GET.get(self.cursor_kwarg))
+        paginator, page = cursor_paginate(queryset, after, page_size, self.cursor_field)
+        return paginator, page, page.object_list, page.has_other_pages()
+
     def get_unfiltered_queryset(self):
         return super().get_queryset()
 
+    # Streaming export. A list view opts in by declaring export_fields, a sequence of (column name, field path)
+    # pairs fetched with values_list, so exports never build model instances or hold more than one chunk in memory.
+    # Rows are read in chunks keyed on the id, which must be one of the fields.
+    export_kwarg = 'export'
+    export_formats = ('ndjson', 'csv')
+    export_fields = ()
+    export_chunk_size = 2000
+
+    @property
+    def export_format(self):
+        if not self.export_fields or self.export_kwarg not in self.request.GET:
+            return None
+        export_format = self.request.GET.get(self.export_kwarg)
+        if export_format not in self.export_formats:
+            raise ValueError('invalid export format')
+        return export_format
+
+    def check_export_rate_limit(self):
+        # API tokens are per user, so limiting the user limits the token.
+        if not self.request.user.is_authenticated:
+            raise APILoginRequiredException()
+        key = 'api_export:%d' % self.request.user.id
+        cache.add(key, 0, timeout=settings.VNOJ_API_EXPORT_LIMIT_WINDOW)
+        if cache.incr(key) > settings.VNOJ_API_EXPORT_LIMIT_COUNT:
+            raise APIRateLimitedException()
+
+    def get_export_columns(self):
+        return [name for name, _ in self.export_fields]
+
+    def get_export_row(self, row):
+        return [export_value(value) for value in row]
+
+    def iter_export_rows(self, queryset):
+        # Each chunk is a separate short query, instead of one long-running cursor held open for the whole download.
+        fields = [field for _, field in self.export_fields]
+        id_index = fields.index('id')
+        queryset = queryset.prefetch_related(None).order_by('id').values_list(*fields)
+        last_id = 0
+        while True:
+            chunk = list(queryset.filter(id__gt=last_id)[:self.export_chunk_size])
+            if not chunk:
+                return
+            last_id = chunk[-1][id_index]
+            yield [self.get_export_row(row) for row in chunk]
+
+    def stream_ndjson(self, queryset):
+        columns = self.get_export_columns()
+        for chunk in self.iter_export_rows(queryset):
+            yield ''.join(json_codec.dumps(dict(zip(columns, row))) + '\n' for row in chunk)
+
+    def stream_csv(self, queryset):
+        writer = csv.writer(EchoBuffer())
+        yield writer.writerow(self.get_export_columns())
+        for chunk in self.iter_export_rows(queryset):
+            yield ''.join(writer.writerow(row) for row in chunk)
+
+    def render_export(self, export_format):
+        self.check_export_rate_limit()
+        queryset = self.get_queryset()
+        if export_format == 'csv':
+            response = StreamingHttpResponse(self.stream_csv(queryset), content_type='text/csv; charset=utf-8')
+        else:
+            response = StreamingHttpResponse(self.stream_ndjson(queryset), content_type='application/x-ndjson')
+        response['Content-Disposition'] = 'attachment; filename="%s.%s"' % (self.model._meta.model_name, export_format)
+        return response
+
+    def get(self, request, *args, **kwargs):
+        # May raise ValueError, but is caught in APIMixin
+        export_format = self.export_format
+        if export_format is not None:
+            return self.render_export(export_format)
+        return super().get(request, *args, **kwargs)
+
     def filter_queryset(self, queryset):
         self.used_basic_filters = set()
         self.used_list_filters = set()
@@ -193,6 +306,15 @@ class APIListView(APIMixin, InfinitePaginationMixin, BaseListView):
     def get_api_data(self, context):
         page = context['page_obj']
         objects = context['object_list']
+        if getattr(page.paginator, 'is_cursor', False):
+            return {
+                'current_object_count': len(objects),
+                'objects_per_page': page.paginator.per_page,
+                'has_more': page.has_next(),
+                'next_cursor': page.next_cursor,
+                'objects': [self.get_object_data(obj) for obj in objects],
+            }
+
         result = {
             'current_object_count': len(objects),
             'objects_per_page': page.paginator.per_page,
@@ -509,6 +631,16 @@ class APIUserList(APIListView):
         ('organization', 'organizations'),
     )
 
+    export_fields = (
+        ('id', 'id'),
+        ('username', 'user__username'),
+        ('points', 'points'),
+        ('performance_points', 'performance_points'),
+        ('problem_count', 'problem_count'),
+        ('rank', 'display_rank'),
+        ('rating', 'rating'),
+    )
+
     def get_unfiltered_queryset(self):
         return (
             Profile.objects
@@ -598,6 +730,23 @@ class APISubmissionList(APIListView):
         ('result', 'result'),
     )
 
+    # Contest fields are flattened, since CSV rows cannot nest.
+    export_fields = (
+        ('id', 'id'),
+        ('problem', 'problem__code'),
+        ('user', 'user__user__username'),
+        ('date', 'date'),
+        ('language', 'language__key'),
+        ('time', 'time'),
+        ('memory', 'memory'),
+        ('points', 'points'),
+        ('result', 'result'),
+        ('contest', 'contest_object__key'),
+        ('contest_points', 'contest__points'),
+        ('virtual_participation_number', 'contest__participation__virtual'),
+        ('time_since_start_of_participation', 'contest__participation__real_start'),
+    )
+
     @property
     def use_infinite_pagination(self):
         return not self.used_basic_filters
@@ -605,16 +754,8 @@ class APISubmissionList(APIListView):
     def get_unfiltered_queryset(self):
         queryset = Submission.objects.all()
         use_straight_join(queryset)
-        join_sql_subquery(
-            queryset,
-            subquery=Problem.get_visible_problems(self.request.user).distinct().only('id').query,
-            params=[],
-            related_model=Problem,
-            join_fields=[('problem_id', 'id')],
-            alias='visible_problems',
-        )
         return (
-            queryset
+            filter_by_visible_problems(queryset, self.request.user)
             .select_related('problem', 'contest', 'contest__participation', 'contest_object', 'user__user', 'language')
             .order_by('id')
             .only(
@@ -634,6 +775,12 @@ class APISubmissionList(APIListView):
             )
         )
 
+    def get_export_row(self, row):
+        row = dict(zip(self.get_export_columns(), row))
+        if row['time_since_start_of_participation'] is not None:
+            row['time_since_start_of_participation'] = row['date'] - row['time_since_start_of_participation']
+        return super().get_export_row(row.values())
+
     def get_object_data(self, submission):
         return {
             'id': submission.id,
@@ -760,10 +907,15 @@ class APIJudgeList(APIListView):
     def get_unfiltered_queryset(self):
         return Judge.objects.filter(online=True).prefetch_related('runtimes').order_by('id')
 
+    def get_api_data(self, context):
+        # The latest ping and load of the whole page are fetched from the cache at once.
+        context['object_list'] = apply_judge_status(context['object_list'])
+        return super().get_api_data(context)
+
     def get_object_data(self, judge):
         return {
             'name': judge.name,
-            'start_time': judge.start_time.isoformat(),
+            'start_time': judge.start_time.isoformat() if judge.start_time else None,
             'ping': judge.ping_ms,
             'load': judge.load,
             'languages': list(judge.runtimes.values_list('key', flat=True)),
@@ -775,9 +927,35 @@ class APIContestSyncBase(APIKeyRequiredMixin, APIMixin, BaseDetailView):
     slug_field = 'key'
     slug_url_kwarg = 'contest_code'
 
+    max_limit = 2000
+
     def get_data(self, context):
         return self.get_api_data(context)
 
+    def get_limit(self):
+        limit_param = self.request.GET.get('limit')
+        if limit_param is None:
+            return self.max_limit
+        try:
+            limit = int(limit_param)
+        except (TypeError, ValueError):
+            raise ValidationError('limit must be an integer')
+        if limit < 1:
+            raise ValidationError('limit must be positive')
+        return min(limit, self.max_limit)
+
+    @staticmethod
+    def get_submission_data(submission, contest):
+        return {
+            'id': str(submission.id),
+            'submittedAt': submission.date.isoformat(),
+            'judgedAt': submission.judged_date.isoformat() if submission.judged_date else None,
+            'author': submission.user.user.username,
+            'submissionStatus': submission.result or submission.status,
+            'contest_code': contest.key,
+            'problem_code': submission.problem.code,
+        }
+
     def render_to_response(self, context, **response_kwargs):
         data = self.get_data(context)
         if not isinstance(data, dict):
@@ -858,17 +1036,7 @@ class APIContestSyncSubmissions(APIContestSyncBase):
         if timezone.is_naive(parsed):
             parsed = timezone.make_aware(parsed, timezone=timezone.utc)
 
-        limit_param = self.request.GET.get('limit')
-        if limit_param is None:
-            limit = 2000
-        else:
-            try:
-                limit = int(limit_param)
-            except (TypeError, ValueError):
-                raise ValidationError('limit must be an integer')
-            if limit < 1:
-                raise ValidationError('limit must be positive')
-            limit = min(limit, 2000)
+        limit = self.get_limit()
 
         status = self.request.GET.get('status', 'final')
         if status not in ('final', 'all'):
@@ -884,15 +1052,87 @@ class APIContestSyncSubmissions(APIContestSyncBase):
             submissions = submissions.exclude(status__in=Submission.IN_PROGRESS_GRADING_STATUS)
         submissions = submissions[:limit]
 
-        return [
-            {
-                'id': str(submission.id),
-                'submittedAt': submission.date.isoformat(),
-                'judgedAt': submission.judged_date.isoformat() if submission.judged_date else None,
-                'author': submission.user.user.username,
-                'submissionStatus': submission.result or submission.status,
-                'contest_code': contest.key,
-                'problem_code': submission.problem.code,
+        return [self.get_submission_data(submission, contest) for submission in submissions]
+
+
+class APIContestSyncChanges(APIContestSyncBase):
+    """
+    Incremental feed of a contest's submission and participation changes, in change log order.
+
+    Clients pass the `next_after` value of the previous response as `after` and apply the returned states in order,
+    which syncs every change exactly once. The request returns immediately, with no changes if there are none yet, so
+    clients poll it periodically. Entries older than VNOJ_CONTEST_SYNC_CHANGE_RETENTION are pruned.
+    """
+
+    def get_changes(self, contest, after, limit):
+        # Rows younger than the settle time are held back, since a concurrent insert with a smaller id may not have
+        # committed yet, and a client that skipped past it would never see it.
+        settled = timezone.now() - timedelta(seconds=settings.VNOJ_CONTEST_SYNC_SETTLE_TIME)
+        return list(
+            contest.changes.filter(id__gt=after, time__lte=settled)
+            .order_by('id').values_list('id', 'kind', 'object_id')[:limit],
+        )
+
+    def get_api_data(self, context):
+        contest = context['object']
+        try:
+            after = int(self.request.GET.get('after', 0))
+        except ValueError:
+            raise ValidationError('after must be an integer')
+
+        limit = self.get_limit()
+        changes = self.get_changes(contest, after, limit)
+        if not changes:
+            return {'changes': [], 'next_after': after, 'has_more': False}
+
+        # Only the latest state of each object is sent, at the position of its last change.
+        latest = {}
+        for sequence, kind, object_id in changes:
+            latest[kind, object_id] = sequence
+
+        submission_ids = [object_id for kind, object_id in latest if kind == ContestChange.SUBMISSION]
+        submissions = (
+            Submission.objects.filter(id__in=submission_ids, contest_object=contest)
+            .select_related('user__user', 'problem').in_bulk()
+        )
+
+        score_field = 'frozen_score' if contest.is_frozen else 'score'
+        cumtime_field = 'frozen_cumtime' if contest.is_frozen else 'cumtime'
+        tiebreaker_field = 'frozen_tiebreaker' if contest.is_frozen else 'tiebreaker'
+        participation_ids = [object_id for kind, object_id in latest if kind == ContestChange.PARTICIPATION]
+        participations = {
+            participation['id']: {
+                'user': participation['username'],
+                'contest': contest.key,
+                'score': participation[score_field],
+                'cumtime': participation[cumtime_field],
+                'tiebreaker': participation[tiebreaker_field],
+                'is_disqualified': participation['is_disqualified'],
             }
-            for submission in submissions
-        ]
+            for participation in (
+                contest.users.filter(id__in=participation_ids, virtual=ContestParticipation.LIVE)
+                .annotate(username=F('user__user__username'))
+                .values('id', 'username', score_field, cumtime_field, tiebreaker_field, 'is_disqualified')
+            )
+        }
+
+        result = []
+        for (kind, object_id), sequence in sorted(latest.items(), key=itemgetter(1)):
+            if kind == ContestChange.SUBMISSION and object_id in submissions:
+                result.append({
+                    'sequence': sequence,
+                    'type': 'submission',
+                    'submission': self.get_submission_data(submissions[object_id], contest),
+                })
+            elif kind == ContestChange.PARTICIPATION and object_id in participations:
+                result.append({
+                    'sequence': sequence,
+                    'type': 'participation',
+                    'participation': participations[object_id],
+                })
+
+        return {
+            'changes': result,
+            'next_after': changes[-1][0],
+            'has_more': len(changes) == limit,
+        }
@@ -1,8 +1,10 @@
+from functools import partial
+
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
 from django.db import IntegrityError
-from django.db.models import Count, FilteredRelation, Max, Q
+from django.db.models import Count, FilteredRelation, Q
 from django.db.models.expressions import F, Value
 from django.db.models.functions import Coalesce
 from django.http import (Http404, HttpResponse, HttpResponseBadRequest,
@@ -16,16 +18,16 @@ from django.views.generic.detail import SingleObjectMixin, View
 from reversion import revisions
 
 from judge.comments import CommentedDetailView
-from judge.dblock import LockModel
 from judge.forms import BlogPostForm
-from judge.models import (BlogPost, BlogPostTag, BlogVote, Comment, Contest, Language,
-                          Problem, Profile, Submission, Ticket)
+from judge.models import BlogPost, BlogPostTag, BlogVote, Comment, Contest, Ticket
 from judge.tasks.webhook import on_new_blogpost
+from judge.utils import home
 from judge.utils.cachedict import CacheDict
 from judge.utils.diggpaginator import DiggPaginator
 from judge.utils.opengraph import generate_opengraph
 from judge.utils.tickets import filter_visible_tickets
 from judge.utils.unicode import remove_accents
+from judge.utils.user_reference import collect_user_references
 from judge.utils.views import TitleMixin, generic_message
 
 
@@ -62,25 +64,11 @@ def vote_blog(request, delta):
     if blog.authors.filter(id=request.profile.id).exists():
         return HttpResponseBadRequest(_('You cannot vote your own blog'), content_type='text/plain')
 
-    vote = BlogVote()
-    vote.blog_id = blog_id
-    vote.voter = request.profile
-    vote.score = delta
-
-    while True:
-        try:
-            vote.save()
-        except IntegrityError:
-            with LockModel(write=(BlogVote,)):
-                try:
-                    vote = BlogVote.objects.get(blog_id=blog_id, voter=request.profile)
-                except BlogVote.DoesNotExist:
-                    # We must continue racing in case this is exploited to manipulate votes.
-                    continue
-                return HttpResponseBadRequest(_('You cannot vote twice.'), content_type='text/plain')
-        else:
-            BlogPost.objects.get(id=blog_id).vote(delta)
-        break
+    # The unique constraint on votes settles races between duplicate votes: the losing insert fails.
+    try:
+        blog.vote(request.profile, delta)
+    except IntegrityError:
+        return HttpResponseBadRequest(_('You cannot vote twice.'), content_type='text/plain')
     return HttpResponse('success', content_type='text/plain')
 
 
@@ -135,12 +123,8 @@ class PostListBase(ListView):
         context = super(PostListBase, self).get_context_data(**kwargs)
         context['first_page_href'] = None
         context['title'] = self.title or _('Page %d of Posts') % context['page_obj'].number
-        context['post_comment_counts'] = {
-            int(page[2:]): count for page, count in
-            Comment.objects
-                   .filter(page__in=['b:%d' % post.id for post in context['posts']], hidden=False)
-                   .values_list('page').annotate(count=Count('page')).order_by()
-        }
+        context['post_comment_counts'] = {post.id: post.comment_count for post in context['posts']}
+        collect_user_references(post.summary or post.content for post in context['posts'])
         return context
 
 
@@ -176,22 +160,7 @@ class ModernBlogList(PostListBase):
         if sort_by == 'top':
             queryset = queryset.order_by('-score', '-publish_on')
         elif sort_by == 'discussed':
-            comment_counts = dict(
-                Comment.objects
-                .filter(page__startswith='b:', hidden=False)
-                .values_list('page')
-                .annotate(count=Count('page')),
-            )
-
-            post_comment_map = {}
-            for page, count in comment_counts.items():
-                post_id = int(page[2:])
-                post_comment_map[post_id] = count
-
-            posts = list(queryset)
-            posts.sort(key=lambda p: post_comment_map.get(p.id, 0), reverse=True)
-
-            return posts
+            queryset = queryset.order_by('-comment_count', '-publish_on')
         else:
             queryset = queryset.order_by('-sticky', '-publish_on')
 
@@ -213,17 +182,13 @@ class ModernBlogList(PostListBase):
             context['tags'] = []
 
         # Get vote information for each post
-        post_ids = [post.id for post in context['posts']]
-        post_votes = {}
-        for post_id in post_ids:
-            upvotes = BlogVote.objects.filter(blog_id=post_id, score=1).select_related('voter__user')
-            downvotes = BlogVote.objects.filter(blog_id=post_id, score=-1).select_related('voter__user')
-            post_votes[post_id] = {
-                'upvoters': list(upvotes.values_list('voter__user__username', flat=True)[:10]),
-                'downvoters': list(downvotes.values_list('voter__user__username', flat=True)[:10]),
-                'upvote_count': upvotes.count(),
-                'downvote_count': downvotes.count(),
-            }
+        post_votes = {post.id: {'upvote_count': 0, 'downvote_count': 0} for post in context['posts']}
+        for blog_id, upvote_count, downvote_count in (
+            BlogVote.objects.filter(blog_id__in=list(post_votes)).values('blog_id')
+                    .annotate(upvotes=Count('id', filter=Q(score=1)), downvotes=Count('id', filter=Q(score=-1)))
+                    .values_list('blog_id', 'upvotes', 'downvotes').order_by()
+        ):
+            post_votes[blog_id] = {'upvote_count': upvote_count, 'downvote_count': downvote_count}
         context['post_votes'] = post_votes
 
         return context
@@ -263,26 +228,30 @@ class PostList(PostListBase):
         context['gcse_url'] = settings.GOOGLE_SEARCH_ENGINE_URL
 
         context['page_prefix'] = reverse('blog_post_list')
-        context['comments'] = Comment.most_recent(self.request.user, 10)
-        context['new_problems'] = Problem.get_public_problems() \
-                                         .order_by('-date', 'code')[:settings.DMOJ_BLOG_NEW_PROBLEM_COUNT]
+        context['new_problems'] = home.new_problems()
         context['page_titles'] = CacheDict(lambda page: Comment.get_page_title(page))
 
-        context['user_count'] = Profile.objects.count
-        context['problem_count'] = Problem.get_public_problems().count
-        context['submission_count'] = lambda: Submission.objects.aggregate(max_id=Max('id'))['max_id'] or 0
-        context['language_count'] = Language.objects.count
+        context['user_count'] = partial(home.home_count, 'users')
+        context['problem_count'] = partial(home.home_count, 'problems')
+        context['submission_count'] = partial(home.home_count, 'submissions')
+        context['language_count'] = partial(home.home_count, 'languages')
 
         now = timezone.now()
 
-        visible_contests = Contest.get_visible_contests(self.request.user).filter(is_visible=True) \
-                                  .order_by('start_time')
+        # Only the comment stream and contest visibility depend on who is viewing, and only once logged in.
+        if self.request.user.is_authenticated:
+            context['comments'] = Comment.most_recent(self.request.user, 10)
+            contests = Contest.get_visible_contests(self.request.user).filter(is_visible=True, end_time__gt=now) \
+                              .order_by('start_time')
+        else:
+            context['comments'] = home.recent_comments(10)
+            contests = [contest for contest in home.public_contests() if contest.end_time > now]
 
-        context['current_contests'] = visible_contests.filter(start_time__lte=now, end_time__gt=now)
-        context['future_contests'] = visible_contests.filter(start_time__gt=now)
+        context['current_contests'] = [contest for contest in contests if contest.start_time <= now]
+        context['future_contests'] = [contest for contest in contests if contest.start_time > now]
 
-        context['top_rated_users'] = self.get_top_rated_users()
-        context['top_contrib'] = self.get_top_contributors()
+        context['top_rated_users'] = home.top_rated_users()
+        context['top_contrib'] = home.top_contributors()
 
         if self.request.user.is_authenticated:
             context['own_open_tickets'] = (
@@ -305,21 +274,6 @@ class PostList(PostListBase):
 
         return context
 
-    def get_top_rated_users(self):
-        return (Profile.objects.filter(rating__isnull=False, is_unlisted=False)
-                .order_by('-rating')
-                .only('user', 'rating', 'display_rank', 'display_badge', 'username_display_override')
-                .select_related('user', 'display_badge')
-                [:settings.VNOJ_HOMEPAGE_TOP_USERS_COUNT])
-
-    def get_top_contributors(self):
-        return (Profile.objects.order_by('-contribution_points')
-                .filter(contribution_points__gt=0, is_unlisted=False)
-                .only('user', 'contribution_points', 'display_rank', 'display_badge', 'rating',
-                      'username_display_override')
-                .select_related('user', 'display_badge')
-                [:settings.VNOJ_HOMEPAGE_TOP_USERS_COUNT])
-
 
 class PostView(TitleMixin, CommentedDetailView):
     model = BlogPost
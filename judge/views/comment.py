@@ -15,8 +15,8 @@ from django.views.generic import DetailView, UpdateView
 from reversion import revisions
 from reversion.models import Version
 
-from judge.dblock import LockModel
-from judge.models import Comment, CommentVote
+from judge.models import BlogPost, Comment
+from judge.utils.home import invalidate_home
 from judge.utils.views import TitleMixin
 from judge.widgets import MartorWidget
 
@@ -54,28 +54,14 @@ def vote_comment(request, delta):
     if not comment:
         return HttpResponseNotFound(_('Comment not found.'), content_type='text/plain')
 
-    if comment.author == request.profile:
+    if comment.author_id == request.profile.id:
         return HttpResponseBadRequest(_('You cannot vote on your own comments.'), content_type='text/plain')
 
-    vote = CommentVote()
-    vote.comment_id = comment_id
-    vote.voter = request.profile
-    vote.score = delta
-
-    while True:
-        try:
-            vote.save()
-        except IntegrityError:
-            with LockModel(write=(CommentVote,)):
-                try:
-                    vote = CommentVote.objects.get(comment_id=comment_id, voter=request.profile)
-                except CommentVote.DoesNotExist:
-                    # We must continue racing in case this is exploited to manipulate votes.
-                    continue
-                return HttpResponseBadRequest(_('You cannot vote twice.'), content_type='text/plain')
-        else:
-            Comment.objects.get(id=comment_id).vote(delta)
-        break
+    # The unique constraint on votes settles races between duplicate votes: the losing insert fails.
+    try:
+        comment.vote(request.profile, delta)
+    except IntegrityError:
+        return HttpResponseBadRequest(_('You cannot vote twice.'), content_type='text/plain')
     return HttpResponse('success', content_type='text/plain')
 
 
@@ -193,5 +179,7 @@ def comment_hide(request):
 
     comment = get_object_or_404(Comment, id=comment_id)
     comment.get_descendants(include_self=True).update(hidden=True)
+    BlogPost.update_comment_counts([comment.page])
+    invalidate_home('comments')
     comment.author.calculate_contribution_points()
     return HttpResponse('ok')
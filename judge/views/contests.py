@@ -13,8 +13,7 @@ from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMix
 from django.core.cache import cache
 from django.core.exceptions import ImproperlyConfigured, ObjectDoesNotExist, PermissionDenied
 from django.db import IntegrityError
-from django.db.models import BooleanField, Case, Count, F, FloatField, IntegerField, Max, Min, Q, Sum, Value, When
-from django.db.models.expressions import CombinedExpression
+from django.db.models import BooleanField, Case, Count, F, Max, Min, Q, Sum, When
 from django.db.models.query import Prefetch
 from django.http import Http404, HttpResponse, HttpResponseForbidden, HttpResponseRedirect
 from django.shortcuts import get_object_or_404, redirect, render
@@ -40,7 +39,7 @@ from judge.contest_format import ICPCContestFormat
 from judge.forms import ContestAnnouncementForm, ContestCloneForm, ContestDownloadDataForm, ContestForm, \
     ProposeContestProblemFormSet
 from judge.models import Contest, ContestAnnouncement, ContestMoss, ContestParticipation, ContestProblem, ContestTag, \
-    Language, Organization, Problem, ProblemClarification, Profile, Solution, Submission
+    Language, Organization, Problem, ProblemClarification, Profile, Solution
 from judge.tasks import on_new_contest, prepare_contest_data, rescore_problem, run_moss
 from judge.utils.celery import redirect_to_task_status, task_status_by_id, task_status_url_by_id
 from judge.utils.cms import parse_csv_ranking
@@ -746,51 +745,50 @@ class ContestStats(TitleMixin, ContestMixin, DetailView):
         if not self.object.can_see_full_submission_list(self.request.user):
             raise Http404()
 
-        queryset = Submission.objects.filter(contest_object=self.object, date__gt=self.object.start_time)
+        counts = self.object.result_counts.filter(count__gt=0) \
+            .values_list('problem_id', 'language_id', 'result', 'count')
 
-        ac_count = Count(Case(When(result='AC', then=Value(1)), output_field=IntegerField()))
-        ac_rate = CombinedExpression(ac_count / Count('problem'), '*', Value(100.0), output_field=FloatField())
+        problem_results = defaultdict(lambda: defaultdict(int))
+        language_totals = defaultdict(int)
+        language_ac = defaultdict(int)
+        for problem_id, language_id, result, count in counts:
+            problem_results[problem_id][result] += count
+            language_totals[language_id] += count
+            if result == 'AC':
+                language_ac[language_id] += count
 
-        status_count_queryset = list(
-            queryset.values('problem__code', 'result').annotate(count=Count('result'))
-                    .values_list('problem__code', 'result', 'count'),
-        )
-        labels, codes = [], []
-        contest_problems = self.object.contest_problems.order_by('order').values_list('problem__name', 'problem__code')
+        labels, problem_ids = [], []
+        contest_problems = self.object.contest_problems.order_by('order').values_list('problem__name', 'problem_id')
         if contest_problems:
-            labels, codes = zip(*contest_problems)
+            labels, problem_ids = zip(*contest_problems)
         num_problems = len(labels)
-        status_counts = [[] for i in range(num_problems)]
-        for problem_code, result, count in status_count_queryset:
-            if problem_code in codes:
-                status_counts[codes.index(problem_code)].append((result, count))
 
         result_data = defaultdict(partial(list, [0] * num_problems))
-        for i in range(num_problems):
-            for category in _get_result_data(defaultdict(int, status_counts[i]))['categories']:
+        for i, problem_id in enumerate(problem_ids):
+            for category in _get_result_data(problem_results[problem_id])['categories']:
                 result_data[category['code']][i] = category['count']
 
-        language_id_to_name = {id: name for id, name in Language.objects.values_list('id', 'name')}
+        def ac_rate(ac, total):
+            return ac / total * 100.0
 
-        def id_to_name(data):
-            return (language_id_to_name[data[0]], data[1])
+        language_id_to_name = {id: name for id, name in Language.objects.values_list('id', 'name')}
 
         stats = {
             'problem_status_count': get_stacked_bar_chart(
                 labels, result_data, settings.DMOJ_STATS_SUBMISSION_RESULT_COLORS,
             ),
-            'problem_ac_rate': get_bar_chart(
-                queryset.values('contest__problem__order', 'problem__name').annotate(ac_rate=ac_rate)
-                        .order_by('contest__problem__order').values_list('problem__name', 'ac_rate'),
-            ),
-            'language_count': get_pie_chart(
-                list(map(id_to_name, queryset.values('language_id').annotate(count=Count('language_id'))
-                         .filter(count__gt=0).order_by('-count').values_list('language_id', 'count'))),
-            ),
-            'language_ac_rate': get_bar_chart(
-                list(map(id_to_name, queryset.values('language_id').annotate(ac_rate=ac_rate)
-                         .filter(ac_rate__gt=0).values_list('language_id', 'ac_rate'))),
-            ),
+            'problem_ac_rate': get_bar_chart([
+                (name, ac_rate(problem_results[problem_id]['AC'], sum(problem_results[problem_id].values())))
+                for name, problem_id in zip(labels, problem_ids) if problem_results[problem_id]
+            ]),
+            'language_count': get_pie_chart([
+                (language_id_to_name[language_id], count)
+                for language_id, count in sorted(language_totals.items(), key=itemgetter(1), reverse=True)
+            ]),
+            'language_ac_rate': get_bar_chart([
+                (language_id_to_name[language_id], ac_rate(language_ac[language_id], total))
+                for language_id, total in language_totals.items() if language_ac[language_id]
+            ]),
         }
 
         context['stats'] = mark_safe(json.dumps(stats))
@@ -5,7 +5,7 @@ from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.core.exceptions import ImproperlyConfigured, PermissionDenied
-from django.db.models import Count, FilteredRelation, Q, Sum
+from django.db.models import FilteredRelation, Q, Sum
 from django.db.models.expressions import F, Value
 from django.db.models.functions import Coalesce
 from django.forms import Form, modelformset_factory
@@ -20,7 +20,7 @@ from django.views.generic.detail import SingleObjectMixin, SingleObjectTemplateR
 from reversion import revisions
 
 from judge.forms import OrganizationForm
-from judge.models import BlogPost, Comment, Contest, Language, Organization, OrganizationRequest, \
+from judge.models import BlogPost, Contest, Language, Organization, OrganizationRequest, \
     Problem, ProblemData, Profile
 from judge.models.profile import OrganizationMonthlyUsage
 from judge.tasks import on_new_problem
@@ -509,12 +509,7 @@ class OrganizationHome(TitleMixin, PublicOrganizationMixin, PostListBase):
         context['can_edit'] = self.can_edit_organization()
         context['is_member'] = self.request.profile in self.object
 
-        context['post_comment_counts'] = {
-            int(page[2:]): count for page, count in
-            Comment.objects
-                   .filter(page__in=['b:%d' % post.id for post in context['posts']], hidden=False)
-                   .values_list('page').annotate(count=Count('page')).order_by()
-        }
+        context['post_comment_counts'] = {post.id: post.comment_count for post in context['posts']}
 
         if not self.object.is_open:
             context['num_requests'] = OrganizationRequest.objects.filter(
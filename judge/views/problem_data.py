@@ -8,6 +8,7 @@ from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.forms import BaseModelFormSet, CharField, ChoiceField, HiddenInput, ModelForm, NumberInput, Select, \
     formset_factory
 from django.http import Http404, HttpResponse, HttpResponseRedirect
@@ -246,6 +247,26 @@ class ProblemDataView(TitleMixin, ProblemManagerMixin):
             return False
         return True
 
+    def save_cases(self, problem, cases_formset):
+        cases_formset.save(commit=False)
+        new_cases = cases_formset.new_objects
+        for case in new_cases:
+            case.dataset_id = problem.id
+
+        changed_cases = [case for case, fields in cases_formset.changed_objects]
+        changed_fields = set()
+        for case, fields in cases_formset.changed_objects:
+            changed_fields.update(fields)
+        changed_fields &= set(ProblemCaseForm._meta.fields)
+
+        with transaction.atomic():
+            if cases_formset.deleted_objects:
+                ProblemTestCase.objects.filter(id__in=[case.id for case in cases_formset.deleted_objects]).delete()
+            if changed_cases:
+                ProblemTestCase.objects.bulk_update(changed_cases, sorted(changed_fields), batch_size=1000)
+            if new_cases:
+                ProblemTestCase.objects.bulk_create(new_cases, batch_size=1000)
+
     def post(self, request, *args, **kwargs):
         self.object = problem = self.get_object()
         data_form = self.get_data_form(post=True)
@@ -254,11 +275,7 @@ class ProblemDataView(TitleMixin, ProblemManagerMixin):
         cases_formset = self.get_case_formset(valid_files, post=True)
         if self.check_valid(data_form, cases_formset):
             data = data_form.save()
-            for case in cases_formset.save(commit=False):
-                case.dataset_id = problem.id
-                case.save()
-            for case in cases_formset.deleted_objects:
-                case.delete()
+            self.save_cases(problem, cases_formset)
             ProblemDataCompiler.generate(problem, data, problem.cases.order_by('order'), valid_files)
             return HttpResponseRedirect(request.get_full_path())
         return self.render_to_response(self.get_context_data(data_form=data_form, cases_formset=cases_formset,
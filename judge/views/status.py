@@ -6,16 +6,17 @@ from django.shortcuts import render
 from django.utils.translation import gettext as _
 from packaging import version
 
-from judge.models import Judge, Language, RuntimeVersion
+from judge.models import Judge
+from judge.utils.judge_status import apply_judge_status, online_runtimes, runtime_versions
 
 __all__ = ['status_all', 'status_table']
 
 
 def get_judges(request):
     if request.user.is_superuser or request.user.is_staff:
-        return True, Judge.objects.order_by('-online', 'name')
+        return True, apply_judge_status(Judge.objects.order_by('-online', 'name'))
     else:
-        return False, Judge.objects.filter(online=True)
+        return False, apply_judge_status(Judge.objects.filter(online=True))
 
 
 def status_all(request):
@@ -23,7 +24,7 @@ def status_all(request):
     return render(request, 'status/judge-status.html', {
         'title': _('Status'),
         'judges': judges,
-        'runtime_version_data': Judge.runtime_versions(),
+        'runtime_version_data': runtime_versions(),
         'see_all_judges': see_all,
     })
 
@@ -41,7 +42,7 @@ def status_table(request):
     see_all, judges = get_judges(request)
     return render(request, 'status/judge-status-table.html', {
         'judges': judges,
-        'runtime_version_data': Judge.runtime_versions(),
+        'runtime_version_data': runtime_versions(),
         'see_all_judges': see_all,
     })
 
@@ -69,10 +70,12 @@ def version_matrix(request):
     latest = defaultdict(list)
     groups = defaultdict(list)
 
-    judges = {judge.id: judge.name for judge in Judge.objects.filter(online=True)}
-    languages = Language.objects.filter(judges__online=True).distinct()
+    judges = {}
+    languages = {}
 
-    for runtime in RuntimeVersion.objects.filter(judge__online=True).order_by('priority'):
+    for runtime in online_runtimes():
+        judges[runtime.judge_id] = runtime.judge.name
+        languages[runtime.language_id] = runtime.language
         matrix[runtime.judge_id][runtime.language_id].append(runtime)
 
     for judge, data in matrix.items():
@@ -113,7 +116,7 @@ def version_matrix(request):
         for language, versions in data.items():
             versions.is_latest = versions.versions == latest[language]
 
-    languages = sorted(languages, key=lambda lang: lang.key)
+    languages = sorted(languages.values(), key=lambda lang: lang.key)
     return render(request, 'status/versions.html', {
         'title': _('Version'),
         'judges': sorted(matrix.keys()),
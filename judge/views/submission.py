@@ -24,13 +24,15 @@ from django.views.decorators.http import require_GET, require_POST
 from django.views.generic import DetailView, ListView
 
 from judge.highlight_code import highlight_code
+from judge.jinja2.submission import SubmissionPermissions
 from judge.models import Contest, Language, Organization, Problem, ProblemTranslation, Profile, Submission
 from judge.models.problem import ProblemTestcaseResultAccess, SubmissionSourceAccess
 from judge.utils.infinite_paginator import InfinitePaginationMixin
 from judge.utils.lazy import memo_lazy
 from judge.utils.problem_data import get_problem_testcases_data
-from judge.utils.problems import get_result_data, user_completed_ids, user_editable_ids, user_tester_ids
-from judge.utils.raw_sql import join_sql_subquery, use_straight_join
+from judge.utils.problems import filter_by_visible_problems, get_result_data, user_completed_ids, user_editable_ids, \
+    user_tester_ids
+from judge.utils.raw_sql import use_straight_join
 from judge.utils.views import DiggPaginatorMixin, TitleMixin, add_file_response, generic_message
 
 
@@ -41,7 +43,7 @@ def submission_related(queryset):
               'memory', 'points', 'result', 'status', 'case_points', 'case_total', 'current_testcase', 'contest_object',
               'locked_after', 'problem__submission_source_visibility_mode', 'problem__testcase_result_visibility_mode',
               'user__username_display_override', 'user__display_badge__name', 'user__display_badge__mini') \
-        .prefetch_related('contest_object__authors', 'contest_object__curators')
+        .prefetch_related('contest_object')
 
 
 class SubmissionPermissionDenied(PermissionDenied):
@@ -334,14 +336,7 @@ def abort_submission(request, submission):
 
 
 def filter_submissions_by_visible_problems(queryset, user):
-    join_sql_subquery(
-        queryset,
-        subquery=str(Problem.get_visible_problems(user).only('id').query),
-        params=[],
-        join_fields=[('problem_id', 'id')],
-        alias='visible_problems',
-        related_model=Problem,
-    )
+    return filter_by_visible_problems(queryset, user)
 
 
 class SubmissionsListBase(DiggPaginatorMixin, TitleMixin, ListView):
@@ -429,7 +424,7 @@ class SubmissionsListBase(DiggPaginatorMixin, TitleMixin, ListView):
     def get_queryset(self):
         queryset = self._get_queryset()
         if not self.is_contest_scoped:
-            filter_submissions_by_visible_problems(queryset, self.request.user)
+            queryset = filter_submissions_by_visible_problems(queryset, self.request.user)
 
         return queryset
 
@@ -464,6 +459,8 @@ class SubmissionsListBase(DiggPaginatorMixin, TitleMixin, ListView):
         context['completed_problem_ids'] = memo_lazy(lambda: user_completed_ids(profile), set) if authenticated else []
         context['editable_problem_ids'] = memo_lazy(lambda: user_editable_ids(profile), set) if authenticated else []
         context['tester_problem_ids'] = memo_lazy(lambda: user_tester_ids(profile), set) if authenticated else []
+        context['submission_permissions'] = SubmissionPermissions(context['submissions'],
+                                                                  profile.id if authenticated else None)
 
         context['all_languages'] = Language.objects.all().values_list('key', 'name')
         context['selected_languages'] = self.selected_languages
@@ -721,6 +718,7 @@ def single_submission(request):
         'completed_problem_ids': user_completed_ids(request.profile) if authenticated else [],
         'editable_problem_ids': user_editable_ids(request.profile) if authenticated else [],
         'tester_problem_ids': user_tester_ids(request.profile) if authenticated else [],
+        'submission_permissions': SubmissionPermissions([submission], request.profile.id if authenticated else None),
         'show_problem': show_problem,
         'problem_name': show_problem and submission.problem.translated_name(request.LANGUAGE_CODE),
         'profile_id': request.profile.id if authenticated else 0,
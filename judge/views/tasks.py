@@ -18,7 +18,8 @@ def get_task_status(task_id):
     result = AsyncResult(task_id)
     info = result.result
     if result.state == 'PROGRESS':
-        return {'code': 'PROGRESS', 'done': info['done'], 'total': info['total'], 'stage': info['stage']}
+        return {'code': 'PROGRESS', 'done': info['done'], 'total': info['total'], 'stage': info['stage'],
+                'rate': info.get('rate'), 'eta': info.get('eta')}
     elif result.state == 'SUCCESS':
         return {'code': 'SUCCESS'}
     elif result.state == 'FAILURE':
@@ -0,0 +1,71 @@
+import threading
+from unittest import mock
+
+from django.conf import settings
+from django.db import connection
+from django.test import RequestFactory, TransactionTestCase
+
+from judge.models import Comment, CommentVote, Profile
+from judge.models.tests.util import create_user
+from judge.views.comment import vote_comment
+
+
+@mock.patch('judge.signals.on_new_comment')
+class CommentVoteConcurrencyTestCase(TransactionTestCase):
+    voter_count = 10
+
+    def setUp(self):
+        self.author = create_user(username='vote_author').profile
+        self.voters = [create_user(username='voter_%d' % i, is_staff=True) for i in range(self.voter_count)]
+
+    def vote(self, user, comment, delta, barrier, responses, errors):
+        request = RequestFactory().post('/comments/upvote/', {'id': str(comment.id)})
+        request.user = user
+        request.profile = Profile.objects.get(user=user)
+        barrier.wait()
+        try:
+            responses.append(vote_comment(request, delta).status_code)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            connection.close()
+
+    def hammer(self, votes):
+        barrier = threading.Barrier(len(votes))
+        responses = []
+        errors = []
+        threads = [threading.Thread(target=self.vote, args=(user, comment, delta, barrier, responses, errors))
+                   for user, comment, delta in votes]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # Deadlocks and other database errors must not be hidden in the response counts.
+        self.assertEqual(errors, [])
+        return responses
+
+    def test_concurrent_votes(self, on_new_comment):
+        comment = Comment.objects.create(author=self.author, page='b:1', body='popular')
+        responses = self.hammer([(user, comment, 1) for user in self.voters] +
+                                [(user, comment, -1) for user in self.voters])
+
+        # Every voter gets exactly one of their two votes through.
+        self.assertEqual(responses.count(200), self.voter_count)
+        self.assertEqual(responses.count(400), self.voter_count)
+
+        comment.refresh_from_db()
+        self.author.refresh_from_db()
+        score = sum(CommentVote.objects.filter(comment=comment).values_list('score', flat=True))
+        self.assertEqual(CommentVote.objects.filter(comment=comment).count(), self.voter_count)
+        self.assertEqual(comment.score, score)
+        self.assertEqual(self.author.contribution_points, score * settings.VNOJ_CP_COMMENT)
+
+    def test_voting_on_each_other(self, on_new_comment):
+        # A vote share-locks the voter's profile, while the other vote updates the contribution points of that profile.
+        first, second = self.voters[:2]
+        first_comment = Comment.objects.create(author=first.profile, page='b:1', body='first')
+        second_comment = Comment.objects.create(author=second.profile, page='b:1', body='second')
+        for _ in range(5):
+            responses = self.hammer([(first, second_comment, 1), (second, first_comment, 1)])
+            self.assertEqual(responses, [200, 200])
+            CommentVote.objects.all().delete()
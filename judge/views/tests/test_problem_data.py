@@ -0,0 +1,69 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from judge.models import ProblemTestCase
+from judge.models.tests.util import create_problem
+from judge.views.problem_data import ProblemCaseFormSet, ProblemDataView
+
+
+class ProblemDataSaveCasesTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.problem = create_problem(code='data_cases')
+        cls.cases = [
+            ProblemTestCase.objects.create(dataset=cls.problem, order=order, input_file='%d.in' % order,
+                                           output_file='%d.out' % order, points=10, is_pretest=False)
+            for order in (1, 2, 3)
+        ]
+
+    def case_data(self, index, order, input_file, points, case=None, delete=False):
+        data = {
+            'order': order,
+            'type': 'C',
+            'input_file': input_file,
+            'output_file': input_file.replace('.in', '.out'),
+            'points': points,
+            'checker': '',
+            'checker_args': '',
+            'generator_args': '',
+        }
+        if case is not None:
+            data['id'] = case.id
+        if delete:
+            data['DELETE'] = 'on'
+        return {'cases-%d-%s' % (index, key): value for key, value in data.items()}
+
+    def test_save_cases(self):
+        data = {
+            'cases-TOTAL_FORMS': 4,
+            'cases-INITIAL_FORMS': 3,
+            'cases-MIN_NUM_FORMS': 0,
+            'cases-MAX_NUM_FORMS': 1000,
+        }
+        data.update(self.case_data(0, 3, '1.in', 20, case=self.cases[0]))
+        data.update(self.case_data(1, 2, '2.in', 10, case=self.cases[1], delete=True))
+        data.update(self.case_data(2, 1, '3.in', 10, case=self.cases[2]))
+        data.update(self.case_data(3, 2, '4.in', 30))
+
+        formset = ProblemCaseFormSet(data=data, prefix='cases', valid_files=['%d.in' % i for i in range(1, 5)],
+                                     queryset=ProblemTestCase.objects.filter(dataset=self.problem).order_by('order'))
+        self.assertTrue(formset.is_valid(), formset.errors)
+        manager = ProblemTestCase.objects
+        with mock.patch.object(manager, 'bulk_update', wraps=manager.bulk_update) as bulk_update, \
+                mock.patch.object(manager, 'bulk_create', wraps=manager.bulk_create) as bulk_create:
+            ProblemDataView().save_cases(self.problem, formset)
+
+        # The changed cases are written together, with only the fields that changed.
+        bulk_update.assert_called_once()
+        updated, fields = bulk_update.call_args.args
+        self.assertEqual({case.input_file for case in updated}, {'1.in', '3.in'})
+        self.assertEqual(fields, ['order', 'points'])
+        bulk_create.assert_called_once()
+        self.assertEqual([case.input_file for case in bulk_create.call_args.args[0]], ['4.in'])
+        self.assertFalse(ProblemTestCase.objects.filter(id=self.cases[1].id).exists())
+
+        self.assertEqual(
+            list(self.problem.cases.order_by('order').values_list('order', 'input_file', 'output_file', 'points')),
+            [(1, '3.in', '3.out', 10), (2, '4.in', '4.out', 30), (3, '1.in', '1.out', 20)],
+        )
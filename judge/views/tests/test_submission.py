@@ -4,7 +4,8 @@ from django.http import Http404
 from django.test import RequestFactory, TestCase
 from django.utils import timezone
 
-from judge.models import Contest, Language, Submission
+from judge.jinja2.submission import SubmissionPermissions, submission_layout
+from judge.models import Contest, Language, Submission, SubmissionSourceAccess
 from judge.models.tests.util import (
     CommonDataMixin,
     create_contest,
@@ -1595,3 +1596,77 @@ class SubmissionListOrganizationQuerysetTestCase(CommonDataMixin, TestCase):
             self.assertTrue(
                 submission.problem.organization == self.organizations['open'],
             )
+
+
+class SubmissionPermissionsTestCase(CommonDataMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        now = timezone.now()
+
+        cls.users.update({
+            'contest_author': create_user(username='permissions_author'),
+            'contest_curator': create_user(username='permissions_curator'),
+        })
+        cls.problem = create_problem(
+            code='permissions_problem',
+            is_public=True,
+            submission_source_visibility_mode=SubmissionSourceAccess.ONLY_OWN,
+        )
+        cls.contests = [
+            create_contest(
+                key='permissions_contest_%d' % i,
+                start_time=now - timezone.timedelta(days=1),
+                end_time=now + timezone.timedelta(days=1),
+                authors=('permissions_author',),
+                curators=('permissions_curator',) if i % 2 else (),
+            )
+            for i in range(4)
+        ]
+        cls.submissions = [
+            Submission.objects.create(
+                user=cls.users['normal'].profile,
+                problem=cls.problem,
+                contest_object=contest,
+                language=Language.get_python3(),
+                result='AC',
+                status='D',
+            )
+            for contest in cls.contests for _ in range(3)
+        ]
+        cls.submissions.append(Submission.objects.create(
+            user=cls.users['normal'].profile,
+            problem=cls.problem,
+            language=Language.get_python3(),
+            result='AC',
+            status='D',
+        ))
+
+    def layout(self, user, permissions):
+        return [submission_layout(submission, user.profile.id, user, set(), set(), set(), permissions)
+                for submission in self.submissions]
+
+    def test_one_query_per_page(self):
+        user = self.users['contest_curator']
+        submissions = list(Submission.objects.filter(id__in=[s.id for s in self.submissions])
+                           .select_related('problem').order_by('id'))
+        permissions = SubmissionPermissions(submissions, user.profile.id)
+        user.has_perm('judge.view_all_submission')  # Fill the permission cache.
+        with self.assertNumQueries(1):
+            layout = [submission_layout(submission, user.profile.id, user, set(), set(), set(), permissions)
+                      for submission in submissions]
+        self.assertEqual([can_view for can_view, _ in layout],
+                         [submission.contest_object_id in {self.contests[1].id, self.contests[3].id}
+                          for submission in submissions])
+
+    def test_matches_per_row_check(self):
+        for name in ('contest_author', 'contest_curator', 'normal', 'superuser'):
+            with self.subTest(user=name):
+                user = self.users[name]
+                self.assertEqual(self.layout(user, SubmissionPermissions(self.submissions, user.profile.id)),
+                                 self.layout(user, None))
+
+    def test_anonymous_profile(self):
+        permissions = SubmissionPermissions(self.submissions, None)
+        with self.assertNumQueries(0):
+            self.assertEqual(permissions.edited_contest_ids, set())
@@ -40,6 +40,7 @@ from judge.performance_points import get_pp_breakdown
 from judge.ratings import rating_class, rating_progress
 from judge.tasks import prepare_user_data
 from judge.utils.celery import task_status_by_id, task_status_url_by_id
+from judge.utils.home import invalidate_home
 from judge.utils.infinite_paginator import InfinitePaginationMixin
 from judge.utils.problems import contest_completed_ids, user_completed_ids
 from judge.utils.pwned import PwnedPasswordsValidator
@@ -318,6 +319,8 @@ class UserCommentPage(CustomUserMixin, DiggPaginatorMixin, ListView):
         for comment in Comment.get_newest_visible_comments(viewer=request.user, author=user,
                                                            batch=2 * self.paginate_by):
             comment.get_descendants(include_self=True).update(hidden=True)
+            BlogPost.update_comment_counts([comment.page])
+        invalidate_home('comments')
         return HttpResponseRedirect(reverse('user_comment', args=(user.user.username,)))
 
     def dispatch(self, request, *args, **kwargs):
@@ -5,3 +5,6 @@ class UrlshortenerConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'urlshortener'
     verbose_name = 'URL Shortener'
+
+    def ready(self):
+        from . import signals  # noqa: F401, imported for side effects
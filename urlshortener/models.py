@@ -1,4 +1,8 @@
-from django.db import models
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, models
 from django.db.models import F
 from django.urls import reverse
 from django.utils import timezone
@@ -43,7 +47,6 @@ class URLShortener(models.Model):
         return f'/{self.short_code}'
 
     def get_full_short_url(self):
-        from django.conf import settings
         domain = getattr(settings, 'URLSHORTENER_DOMAIN', None)
         if domain:
             if not domain.startswith(('http://', 'https://')):
@@ -51,7 +54,136 @@ class URLShortener(models.Model):
             return f'{domain.rstrip("/")}/{self.short_code}'
         return self.get_short_url()
 
+    @classmethod
+    def resolve(cls, short_code):
+        """
+        Returns the shortener for short_code with only its id, URL and active flag loaded, or None if there is none.
+
+        Lookups are cached in this process for URLSHORTENER_LOCAL_CACHE_TIMEOUT seconds and in the shared cache until
+        the shortener changes, so that redirects normally do not touch the database. Lookups inside a transaction are
+        not cached, since the transaction may still be rolled back.
+        """
+        now = time.monotonic()
+        entry = _resolved.get(short_code)
+        if entry is not None and entry[0] > now:
+            data = entry[1]
+        else:
+            key = _resolve_key(short_code)
+            data = cache.get(key)
+            cacheable = not connection.in_atomic_block
+            if data is None:
+                data = cls.objects.filter(short_code=short_code).values_list('id', 'original_url', 'is_active').first()
+                # Unknown codes are cached as well, as they are a cheap way to hammer the database.
+                data = data or ()
+                if cacheable:
+                    cache.set(key, data, getattr(settings, 'URLSHORTENER_CACHE_TIMEOUT', 86400))
+            if cacheable:
+                if len(_resolved) >= 10000:
+                    _resolved.clear()
+                _resolved[short_code] = (now + getattr(settings, 'URLSHORTENER_LOCAL_CACHE_TIMEOUT', 10), data)
+
+        if not data:
+            return None
+        id, original_url, is_active = data
+        return cls(id=id, short_code=short_code, original_url=original_url, is_active=is_active)
+
+    @classmethod
+    def forget(cls, short_code):
+        _resolved.pop(short_code, None)
+        cache.delete(_resolve_key(short_code))
+
     def record_access(self):
-        self.access_count = F('access_count') + 1
-        self.last_access_time = timezone.now()
-        self.save(update_fields=['access_count', 'last_access_time'])
+        """
+        Counts an access in the shared cache. Counts are written to the database by flush_access_counts.
+        """
+        key = _hits_key(self.id)
+        cache.add(key, 0, None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Evicted between the add and the increment.
+            cache.set(key, 1, None)
+        cache.set(_last_access_key(self.id), timezone.now(), None)
+
+        # The first access since the last flush appends the id to the log of shorteners with pending counts. The flag
+        # expires, so that an id whose log entry was lost is logged again on a later access.
+        if cache.add(_dirty_key(self.id), True, DIRTY_TIMEOUT):
+            cache.add(DIRTY_TAIL_KEY, 0, None)
+            try:
+                index = cache.incr(DIRTY_TAIL_KEY)
+            except ValueError:
+                index = 1
+                cache.set(DIRTY_TAIL_KEY, index, None)
+            cache.set(_dirty_log_key(index), self.id, None)
+
+    @staticmethod
+    def _take_dirty_ids():
+        head = cache.get(DIRTY_HEAD_KEY, 0)
+        tail = cache.get(DIRTY_TAIL_KEY, 0)
+        if tail < head:
+            # The log position was evicted and started over.
+            head = 0
+        if tail == head:
+            return []
+
+        keys = [_dirty_log_key(index) for index in range(head + 1, tail + 1)]
+        ids = set(cache.get_many(keys).values())
+        cache.set(DIRTY_HEAD_KEY, tail, None)
+        # Flags are cleared before the counts are read, so that any later access logs its id again.
+        cache.delete_many(keys + [_dirty_key(id) for id in ids])
+        return sorted(ids)
+
+    @classmethod
+    def flush_access_counts(cls):
+        """
+        Writes the access counts accumulated by record_access back to the database, returning how many were written.
+        """
+        ids = cls._take_dirty_ids()
+        if not ids:
+            return 0
+        hits = cache.get_many([_hits_key(id) for id in ids])
+        last_access = cache.get_many([_last_access_key(id) for id in ids])
+
+        updates = []
+        total = 0
+        for id in ids:
+            count = hits.get(_hits_key(id))
+            if not count:
+                continue
+            # Claim the counts before writing them, so that concurrent flushes never count an access twice.
+            # Accesses counted in the meantime stay in the cache for the next flush.
+            cache.decr(_hits_key(id), count)
+            updates.append(cls(id=id, access_count=F('access_count') + count,
+                               last_access_time=last_access.get(_last_access_key(id)) or timezone.now()))
+            total += count
+
+        cls.objects.bulk_update(updates, ['access_count', 'last_access_time'])
+        return total
+
+
+_resolved = {}
+
+
+def _resolve_key(short_code):
+    return 'urlshortener:code:%s' % short_code
+
+
+def _hits_key(id):
+    return 'urlshortener:hits:%d' % id
+
+
+def _last_access_key(id):
+    return 'urlshortener:last_access:%d' % id
+
+
+DIRTY_TIMEOUT = 3600
+DIRTY_HEAD_KEY = 'urlshortener:dirty:head'
+DIRTY_TAIL_KEY = 'urlshortener:dirty:tail'
+
+
+def _dirty_key(id):
+    return 'urlshortener:dirty:%d' % id
+
+
+def _dirty_log_key(index):
+    return 'urlshortener:dirty:log:%d' % index
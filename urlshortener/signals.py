@@ -0,0 +1,26 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from urlshortener.models import URLShortener
+
+
+@receiver(pre_save, sender=URLShortener)
+def urlshortener_pre_update(sender, instance, **kwargs):
+    # The short code itself may change, in which case the old one must be forgotten too.
+    instance._old_short_code = URLShortener.objects.filter(pk=instance.pk).values_list('short_code', flat=True) \
+                                                   .first() if instance.pk else None
+
+
+@receiver(post_save, sender=URLShortener)
+@receiver(post_delete, sender=URLShortener)
+def urlshortener_update(sender, instance, **kwargs):
+    codes = {instance.short_code, getattr(instance, '_old_short_code', None)} - {None}
+
+    def forget():
+        for code in codes:
+            URLShortener.forget(code)
+
+    # Forgotten again after commit, in case a redirect cached the old data before the transaction was committed.
+    forget()
+    transaction.on_commit(forget)
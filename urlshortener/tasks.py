@@ -0,0 +1,8 @@
+from celery import shared_task
+
+from urlshortener.models import URLShortener
+
+
+@shared_task
+def flush_access_counts():
+    return URLShortener.flush_access_counts()
@@ -1,5 +1,6 @@
 from django.contrib.auth.models import User
-from django.test import TestCase, override_settings
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
 
 from judge.models import Profile
 from urlshortener.models import URLShortener
@@ -71,6 +72,7 @@ class URLShortenerModelTestCase(TestCase):
         initial_time = self.shortener.last_access_time
 
         self.shortener.record_access()
+        URLShortener.flush_access_counts()
         self.shortener.refresh_from_db()
 
         self.assertEqual(self.shortener.access_count, initial_count + 1)
@@ -82,9 +84,49 @@ class URLShortenerModelTestCase(TestCase):
         for i in range(5):
             self.shortener.record_access()
 
+        URLShortener.flush_access_counts()
         self.shortener.refresh_from_db()
         self.assertEqual(self.shortener.access_count, 5)
 
+    def test_record_access_buffered(self):
+        """Test record_access only reaches the database when flushed, and each access is flushed once."""
+        URLShortener.flush_access_counts()
+        self.shortener.refresh_from_db()
+        initial_count = self.shortener.access_count
+
+        self.shortener.record_access()
+        self.shortener.refresh_from_db()
+        self.assertEqual(self.shortener.access_count, initial_count)
+
+        self.assertEqual(URLShortener.flush_access_counts(), 1)
+        self.assertEqual(URLShortener.flush_access_counts(), 0)
+        self.shortener.refresh_from_db()
+        self.assertEqual(self.shortener.access_count, initial_count + 1)
+
+    def test_flush_only_accessed(self):
+        """Test flush_access_counts only touches shorteners accessed since the last flush."""
+        URLShortener.flush_access_counts()
+        with self.assertNumQueries(0):
+            self.assertEqual(URLShortener.flush_access_counts(), 0)
+
+        other = URLShortener.objects.create(original_url='https://other.com', short_code='other')
+        other.record_access()
+        other.record_access()
+        self.assertEqual(URLShortener.flush_access_counts(), 2)
+        other.refresh_from_db()
+        self.shortener.refresh_from_db()
+        self.assertEqual(other.access_count, 2)
+        self.assertEqual(self.shortener.access_count, 0)
+
+        other.record_access()
+        self.assertEqual(URLShortener.flush_access_counts(), 1)
+
+    def test_resolve_in_transaction(self):
+        """Test resolve inside a transaction reads the database and caches nothing."""
+        with self.assertNumQueries(2):
+            self.assertEqual(URLShortener.resolve('test1234').id, self.shortener.id)
+            self.assertEqual(URLShortener.resolve('test1234').id, self.shortener.id)
+
     def test_short_code_uniqueness_constraint(self):
         """Test that duplicate short_codes raise an error."""
         from django.db import IntegrityError
@@ -111,3 +153,38 @@ class URLShortenerModelTestCase(TestCase):
         self.assertEqual(shortener.access_count, 0)
         self.assertTrue(shortener.is_active)
         self.assertIsNone(shortener.last_access_time)
+
+
+class URLShortenerResolveTestCase(TransactionTestCase):
+    def setUp(self):
+        self.shortener = URLShortener.objects.create(
+            original_url='https://example.com/very/long/url/path',
+            short_code='test1234',
+        )
+        self.addCleanup(URLShortener.forget, 'test1234')
+        self.addCleanup(URLShortener.forget, 'missing')
+
+    def test_resolve_cached(self):
+        """Test resolve only queries the database once, and sees changes to the shortener."""
+        with self.assertNumQueries(1):
+            self.assertEqual(URLShortener.resolve('test1234').id, self.shortener.id)
+            self.assertEqual(URLShortener.resolve('test1234').id, self.shortener.id)
+        with self.assertNumQueries(1):
+            self.assertIsNone(URLShortener.resolve('missing'))
+            self.assertIsNone(URLShortener.resolve('missing'))
+
+        self.shortener.is_active = False
+        self.shortener.save()
+        self.assertFalse(URLShortener.resolve('test1234').is_active)
+
+    def test_resolve_rolled_back(self):
+        """Test resolve never caches changes that are rolled back."""
+        try:
+            with transaction.atomic():
+                self.shortener.is_active = False
+                self.shortener.save()
+                self.assertFalse(URLShortener.resolve('test1234').is_active)
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertTrue(URLShortener.resolve('test1234').is_active)
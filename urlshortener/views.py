@@ -87,10 +87,8 @@ class URLShortenerRedirectView(RedirectView):
     permanent = False
 
     def get_redirect_url(self, *args, **kwargs):
-        short_code = kwargs.get('short_code')
-        try:
-            shortener = URLShortener.objects.get(short_code=short_code)
-        except URLShortener.DoesNotExist:
+        shortener = URLShortener.resolve(kwargs.get('short_code'))
+        if shortener is None:
             raise Http404(_('URL shortener not found.'))
 
         if not shortener.is_active: